@@ -0,0 +1,185 @@
+"""
+Benchmark des principaux endpoints de l'API TaskFlow.
+
+Crée une base de test, y insère le volume demandé d'utilisateurs et de tâches,
+puis exécute chaque scénario via le client de test Django (pile complète :
+middlewares, authentification JWT, sérialisation). Résultats en JSON :
+latences p50/p95/p99, requêtes par seconde, requêtes SQL par requête HTTP.
+
+    python -m benchmarks.api --users 50 --tasks-per-user 200 --iterations 200 --output bench.json
+"""
+import argparse
+import itertools
+
+from .common import Recorder, environment, no_throttling, setup_django, test_database, write_results
+
+BENCH_PASSWORD = 'bench-Pass-123'
+
+
+def seed(users, tasks_per_user, batch_size=1000):
+    """Insère les utilisateurs et leurs tâches par lots ; retourne les utilisateurs"""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from todolist_app.models import TaskList
+
+    # Un seul hachage pour tous les comptes : le seed ne doit pas dominer le temps total
+    password = make_password(BENCH_PASSWORD)
+    User.objects.bulk_create(
+        [User(username=f"bench{i}", email=f"bench{i}@example.com", password=password) for i in range(users)],
+        batch_size=batch_size,
+    )
+    accounts = list(User.objects.filter(username__startswith='bench').order_by('id'))
+    tasks = (
+        TaskList(gestionnaire=user, task=f"Tâche {n} de {user.username}", done=n % 3 == 0)
+        for user in accounts for n in range(tasks_per_user)
+    )
+    while True:
+        batch = list(itertools.islice(tasks, batch_size))
+        if not batch:
+            break
+        TaskList.objects.bulk_create(batch, batch_size=batch_size)
+    return accounts
+
+
+def _client(user=None):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    client = APIClient()
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+def scenario_token_obtain(users):
+    client = _client()
+    for i in itertools.count():
+        user = users[i % len(users)]
+        yield lambda: client.post('/api/token/', {'username': user.username, 'password': BENCH_PASSWORD})
+
+
+def scenario_token_refresh(users):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = _client()
+    for i in itertools.count():
+        refresh = str(RefreshToken.for_user(users[i % len(users)]))
+        yield lambda: client.post('/api/token/refresh/', {'refresh': refresh})
+
+
+def scenario_me(users):
+    clients = [_client(user) for user in users]
+    for i in itertools.count():
+        client = clients[i % len(clients)]
+        yield lambda: client.get('/api/user/me/')
+
+
+def scenario_tasks_list(users):
+    clients = [_client(user) for user in users]
+    for i in itertools.count():
+        client = clients[i % len(clients)]
+        yield lambda: client.get('/api/tasks/')
+
+
+def scenario_tasks_list_cursor(users):
+    clients = [_client(user) for user in users]
+    for i in itertools.count():
+        client = clients[i % len(clients)]
+        yield lambda: client.get('/api/tasks/', {'pagination': 'cursor'})
+
+
+def scenario_tasks_create(users):
+    clients = [_client(user) for user in users]
+    for i in itertools.count():
+        client = clients[i % len(clients)]
+        yield lambda: client.post('/api/tasks/', {'task': f"Nouvelle tâche {i}"})
+
+
+def scenario_mark_complete(users):
+    from todolist_app.models import TaskList
+
+    clients = {user.pk: _client(user) for user in users}
+    tasks = TaskList.objects.filter(done=False).values_list('id', 'gestionnaire_id').iterator()
+    for task_id, owner_id in itertools.cycle(tasks):
+        client = clients[owner_id]
+        yield lambda: client.post(f'/api/tasks/{task_id}/mark_complete/')
+
+
+def scenario_task_toggle(users):
+    """PATCH {done} en alternance, comme la case à cocher du frontend"""
+    from todolist_app.models import TaskList
+
+    clients = {user.pk: _client(user) for user in users}
+    tasks = list(TaskList.objects.values_list('id', 'gestionnaire_id', 'done'))
+    for cycle in itertools.count():
+        for task_id, owner_id, done in tasks:
+            client = clients[owner_id]
+            yield lambda: client.patch(f'/api/tasks/{task_id}/', {'done': (cycle % 2 == 0) != done}, format='json')
+
+
+def scenario_register(users):
+    client = _client()
+    for i in itertools.count():
+        yield lambda: client.post('/api/user/register/', {
+            'username': f"newbench{i}",
+            'first_name': 'Bench',
+            'last_name': 'User',
+            'email': f"newbench{i}@example.com",
+            'password': BENCH_PASSWORD,
+            'consentement_rgpd': True,
+        })
+
+
+SCENARIOS = {
+    'token_obtain': scenario_token_obtain,
+    'token_refresh': scenario_token_refresh,
+    'me': scenario_me,
+    'tasks_list': scenario_tasks_list,
+    'tasks_list_cursor': scenario_tasks_list_cursor,
+    'tasks_create': scenario_tasks_create,
+    'mark_complete': scenario_mark_complete,
+    'task_toggle': scenario_task_toggle,
+    'register': scenario_register,
+}
+
+
+def run_scenario(name, users, iterations, warmup=5):
+    requests = SCENARIOS[name](users)
+    for send in itertools.islice(requests, warmup):
+        send()
+    recorder = Recorder(name)
+    for send in itertools.islice(requests, iterations):
+        with recorder.measure() as sample:
+            sample['status'] = send().status_code
+    return recorder.summary()
+
+
+def run_benchmarks(users=20, tasks_per_user=100, iterations=100, scenarios=None):
+    """Seed puis exécute les scénarios demandés ; la base doit déjà exister"""
+    accounts = seed(users, tasks_per_user)
+    with no_throttling():
+        results = [run_scenario(name, accounts, iterations) for name in (scenarios or SCENARIOS)]
+    return {
+        'environment': environment(),
+        'parameters': {'users': users, 'tasks_per_user': tasks_per_user, 'iterations': iterations},
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--tasks-per-user', type=int, default=100)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), dest='scenarios')
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with test_database():
+        payload = run_benchmarks(args.users, args.tasks_per_user, args.iterations, args.scenarios)
+    write_results(payload, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare le service des tâches en WSGI et en ASGI à différents niveaux de concurrence.
+
+  - wsgi        : TaskViewSet (/api/tasks/) via le handler WSGI, un thread par client
+  - asgi-sync   : TaskViewSet via le handler ASGI (passage par un thread)
+  - asgi-async  : vues async (/api/async/tasks/) via le handler ASGI
+
+Les handlers sont appelés en processus (clients de test Django), sans réseau :
+le résultat isole le coût du modèle d'exécution.
+
+    python -m benchmarks.asgi --tasks 200 --requests 400 --concurrency 1 --concurrency 20 --output asgi.json
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import environment, percentile, setup_django, test_database, write_results
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+PATHS = {
+    'wsgi': '/api/tasks/',
+    'asgi-sync': '/api/tasks/',
+    'asgi-async': '/api/async/tasks/',
+}
+
+
+def _summary(mode, concurrency, durations, statuses, wall_time):
+    ms = [d * 1000 for d in durations]
+    return {
+        'mode': mode,
+        'concurrency': concurrency,
+        'requests': len(ms),
+        'rps': round(len(ms) / wall_time, 2) if wall_time else 0.0,
+        'latency_ms': {
+            'mean': round(statistics.fmean(ms), 3),
+            'p50': round(percentile(ms, 50), 3),
+            'p95': round(percentile(ms, 95), 3),
+            'p99': round(percentile(ms, 99), 3),
+        },
+        'statuses': {str(code): statuses.count(code) for code in sorted(set(statuses))},
+    }
+
+
+def run_wsgi(path, headers, total, concurrency):
+    from django.test import Client
+
+    local = threading.local()
+
+    def send(_):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client()
+        start = time.perf_counter()
+        status = client.get(path, headers=headers).status_code
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(send, range(total)))
+    return samples, time.perf_counter() - start
+
+
+def run_asgi(path, headers, total, concurrency):
+    from django.test import AsyncClient
+
+    async def worker(client, count, samples):
+        for _ in range(count):
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            samples.append((time.perf_counter() - start, response.status_code))
+
+    async def main():
+        samples = []
+        share, extra = divmod(total, concurrency)
+        await asyncio.gather(*(
+            worker(AsyncClient(), share + (1 if i < extra else 0), samples) for i in range(concurrency)
+        ))
+        return samples
+
+    start = time.perf_counter()
+    samples = asyncio.run(main())
+    return samples, time.perf_counter() - start
+
+
+def run_comparison(tasks=100, total=200, concurrency_levels=(1, 10), modes=MODES):
+    """Seed un utilisateur puis mesure chaque mode ; la base doit déjà exister"""
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+    from todolist_app.models import TaskList
+
+    user = User.objects.create_user(username='asgi-bench', password='bench-Pass-123')
+    TaskList.objects.bulk_create([TaskList(gestionnaire=user, task=f"Tâche {n}") for n in range(tasks)])
+    headers = {'Authorization': f"Bearer {AccessToken.for_user(user)}"}
+
+    results = []
+    for concurrency in concurrency_levels:
+        for mode in modes:
+            runner = run_wsgi if mode == 'wsgi' else run_asgi
+            samples, wall_time = runner(PATHS[mode], headers, total, concurrency)
+            durations, statuses = zip(*samples)
+            results.append(_summary(mode, concurrency, durations, list(statuses), wall_time))
+    return {
+        'environment': environment(),
+        'parameters': {'tasks': tasks, 'requests': total, 'concurrency': list(concurrency_levels)},
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tasks', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, action='append')
+    parser.add_argument('--mode', action='append', choices=MODES, dest='modes')
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with test_database():
+        payload = run_comparison(args.tasks, args.requests, args.concurrency or (1, 10), args.modes or MODES)
+    write_results(payload, args.output)
+
+
+if __name__ == '__main__':
+    main()
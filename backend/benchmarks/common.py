@@ -0,0 +1,127 @@
+"""
+Outils partagés par les benchmarks : initialisation de Django, base de test
+jetable, mesures (latence, requêtes SQL) et export JSON.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(settings_module='complice_taches.settings'):
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    # Un seul processus : le cache des réponses reste actif en locmem
+    os.environ.setdefault('TASK_RESPONSE_CACHE_LOCAL', 'True')
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Crée une base de test vide (jamais la base réelle) et la détruit à la fin"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def no_throttling():
+    """Désactive la limitation de débit (les scénarios répètent les connexions)"""
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}):
+        yield
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * pct / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+class Recorder:
+    """Accumule durées, nombres de requêtes SQL et statuts HTTP d'un scénario"""
+
+    def __init__(self, name):
+        self.name = name
+        self.durations = []
+        self.queries = []
+        self.statuses = {}
+        self.elapsed = 0.0
+
+    @contextmanager
+    def measure(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        sample = {}
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            yield sample
+            duration = time.perf_counter() - start
+        self.durations.append(duration)
+        self.elapsed += duration
+        self.queries.append(len(ctx.captured_queries))
+        status = sample.get('status')
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self):
+        ms = [d * 1000 for d in self.durations]
+        return {
+            'name': self.name,
+            'requests': len(ms),
+            'rps': round(len(ms) / self.elapsed, 2) if self.elapsed else 0.0,
+            'latency_ms': {
+                'mean': round(statistics.fmean(ms), 3) if ms else 0.0,
+                'p50': round(percentile(ms, 50), 3),
+                'p95': round(percentile(ms, 95), 3),
+                'p99': round(percentile(ms, 99), 3),
+                'max': round(max(ms), 3) if ms else 0.0,
+            },
+            'queries_per_request': round(statistics.fmean(self.queries), 2) if self.queries else 0.0,
+            'statuses': {str(code): count for code, count in sorted(self.statuses.items())},
+        }
+
+
+def environment():
+    import django
+    from django.db import connection
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'platform': platform.platform(),
+    }
+
+
+def write_results(payload, output=None):
+    text = json.dumps(payload, indent=2, ensure_ascii=False)
+    if output:
+        Path(output).write_text(text + '\n', encoding='utf-8')
+    else:
+        print(text)
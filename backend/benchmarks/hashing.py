@@ -0,0 +1,103 @@
+"""
+Coût du hachage des mots de passe par connexion, selon l'algorithme et ses paramètres.
+
+Pour chaque variante : durée de make_password (inscription), de check_password
+(vérification seule) et d'un POST /api/token/ complet (connexion), avec la
+limitation de débit désactivée.
+
+    python -m benchmarks.hashing --iterations 20 --pbkdf2 600000 --argon2 2,19456,1 --output hashing.json
+
+Sans --pbkdf2 ni --argon2 : PBKDF2 et Argon2 avec les paramètres par défaut de Django.
+"""
+import argparse
+
+from .common import Recorder, environment, no_throttling, setup_django, test_database, write_results
+
+BENCH_PASSWORD = 'bench-Pass-123'
+
+
+def variant_settings(hasher, **params):
+    """Réglages d'une variante : `hasher` en tête de PASSWORD_HASHERS, plus ses paramètres"""
+    from django.conf import settings
+    from django.test.utils import override_settings
+
+    preferred = settings.PASSWORD_HASHER_CLASSES[hasher]
+    hashers = [preferred, *(path for path in settings.PASSWORD_HASHERS if path != preferred)]
+    return override_settings(PASSWORD_HASHERS=hashers, **params)
+
+
+def parse_variants(pbkdf2_iterations, argon2_params):
+    variants = [
+        (f"pbkdf2-{iterations}", 'pbkdf2', {'PASSWORD_PBKDF2_ITERATIONS': iterations})
+        for iterations in pbkdf2_iterations
+    ]
+    for spec in argon2_params:
+        time_cost, memory_cost, parallelism = (int(value) for value in spec.split(','))
+        variants.append((f"argon2-t{time_cost}-m{memory_cost}-p{parallelism}", 'argon2', {
+            'PASSWORD_ARGON2_TIME_COST': time_cost,
+            'PASSWORD_ARGON2_MEMORY_COST': memory_cost,
+            'PASSWORD_ARGON2_PARALLELISM': parallelism,
+        }))
+    if not variants:
+        variants = [('pbkdf2-default', 'pbkdf2', {'PASSWORD_PBKDF2_ITERATIONS': 0}), ('argon2-default', 'argon2', {})]
+    return variants
+
+
+def run_variant(name, hasher, params, iterations):
+    from django.contrib.auth.hashers import check_password, make_password
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIClient
+
+    with variant_settings(hasher, **params):
+        try:
+            encoded = make_password(BENCH_PASSWORD)
+        except ValueError as e:
+            # Bibliothèque absente (ex. argon2-cffi)
+            return {'variant': name, 'skipped': str(e)}
+        user = User.objects.create(username=f"hash-{name}", password=encoded)
+        client = APIClient()
+
+        timings = {}
+        for label, call in (
+            ('make_password', lambda: make_password(BENCH_PASSWORD)),
+            ('check_password', lambda: check_password(BENCH_PASSWORD, encoded)),
+            ('login', lambda: client.post('/api/token/', {'username': user.username, 'password': BENCH_PASSWORD})),
+        ):
+            recorder = Recorder(label)
+            call()
+            for _ in range(iterations):
+                with recorder.measure() as sample:
+                    result = call()
+                    sample['status'] = getattr(result, 'status_code', None)
+            summary = recorder.summary()
+            timings[label] = {'latency_ms': summary['latency_ms'], 'statuses': summary['statuses']}
+
+    return {'variant': name, 'hasher': hasher, 'algorithm': encoded.split('$', 1)[0], 'params': params, **timings}
+
+
+def run_benchmarks(iterations=10, pbkdf2_iterations=(), argon2_params=()):
+    """Exécute chaque variante ; la base doit déjà exister"""
+    with no_throttling():
+        results = [
+            run_variant(name, hasher, params, iterations)
+            for name, hasher, params in parse_variants(pbkdf2_iterations, argon2_params)
+        ]
+    return {'environment': environment(), 'parameters': {'iterations': iterations}, 'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--pbkdf2', type=int, action='append', default=[], help="Itérations PBKDF2 (répétable)")
+    parser.add_argument('--argon2', action='append', default=[], help="time_cost,memory_cost,parallelism (répétable)")
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with test_database():
+        payload = run_benchmarks(args.iterations, args.pbkdf2, args.argon2)
+    write_results(payload, args.output)
+
+
+if __name__ == '__main__':
+    main()
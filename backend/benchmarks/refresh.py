@@ -0,0 +1,108 @@
+"""
+Latence de /api/token/refresh/ (rotation + liste noire) avec une grosse liste noire.
+
+  - filter   : TokenRefreshSerializer de users_app (filtre de Bloom devant la base)
+  - database : sérialiseur d'origine de simplejwt (jointure SQL à chaque refresh)
+
+Chaque refresh utilise un jeton neuf, mis en liste noire par la rotation.
+Le scénario *_rejected rejoue un jeton déjà en liste noire (401 attendu).
+
+    python -m benchmarks.refresh --blacklisted 100000 --iterations 200 --output refresh.json
+"""
+import argparse
+import itertools
+import time
+
+from .common import Recorder, environment, setup_django, test_database, write_results
+
+MODES = {
+    'filter': 'users_app.serializers.TokenRefreshSerializer',
+    'database': 'rest_framework_simplejwt.serializers.TokenRefreshSerializer',
+}
+
+
+def seed_blacklist(count, batch_size=5000):
+    """Insère `count` jetons en liste noire, non expirés"""
+    from datetime import timedelta
+
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    expires_at = timezone.now() + timedelta(days=1)
+    numbers = iter(range(count))
+    while True:
+        batch = list(itertools.islice(numbers, batch_size))
+        if not batch:
+            break
+        tokens = OutstandingToken.objects.bulk_create(
+            [OutstandingToken(jti=f"bench-{n:032x}", token='', expires_at=expires_at) for n in batch]
+        )
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens])
+
+
+def run_mode(mode, user, iterations):
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.views import TokenRefreshView
+
+    from users_app.tokens import RefreshToken
+
+    view = TokenRefreshView.as_view(_serializer_class=MODES[mode])
+    factory = APIRequestFactory()
+
+    def refresh(token):
+        return view(factory.post('/api/token/refresh/', {'refresh': token}, format='json'))
+
+    tokens = [str(RefreshToken.for_user(user)) for _ in range(iterations + 1)]
+    refresh(tokens.pop())
+
+    accepted, rejected = Recorder(mode), Recorder(f"{mode}_rejected")
+    for token in tokens:
+        with accepted.measure() as sample:
+            sample['status'] = refresh(token).status_code
+    for token in tokens:
+        with rejected.measure() as sample:
+            sample['status'] = refresh(token).status_code
+    return [accepted.summary(), rejected.summary()]
+
+
+def run_benchmarks(blacklisted=10000, iterations=100):
+    """Seed puis mesure chaque mode ; la base doit déjà exister"""
+    from django.contrib.auth.models import User
+
+    from users_app.blacklist import blacklist_filter
+
+    seed_blacklist(blacklisted)
+    user = User.objects.create(username='bench-refresh')
+
+    blacklist_filter.reset()
+    start = time.perf_counter()
+    blacklist_filter.rebuild()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        'environment': environment(),
+        'parameters': {'blacklisted': blacklisted, 'iterations': iterations},
+        'filter': {
+            'build_ms': round(build_ms, 3),
+            'capacity': blacklist_filter.bloom.capacity,
+            'size_bytes': len(blacklist_filter.bloom.bits),
+        },
+        'results': [summary for mode in MODES for summary in run_mode(mode, user, iterations)],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blacklisted', type=int, default=10000, help="Jetons en liste noire avant la mesure")
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--output', help="Fichier JSON de sortie (stdout par défaut)")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    with test_database():
+        payload = run_benchmarks(args.blacklisted, args.iterations)
+    write_results(payload, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Mesure le démarrage à froid d'un worker, pour chaque profil de réglages.
+
+Chaque essai tourne dans un nouveau processus Python :
+  - import_ms         : réglages + django.setup() + chargement de l'URLconf
+  - first_response_ms : jusqu'à la fin de la première réponse du handler WSGI
+  - process_ms        : durée du processus vue du parent (interpréteur compris)
+  - modules           : nombre de modules importés après la première réponse
+
+La requête par défaut (GET /api/tasks/ sans jeton, 401) traverse la pile
+DRF et JWT sans toucher à la base.
+
+    python -m benchmarks.startup --runs 10 --settings complice_taches.settings --settings complice_taches.settings_api
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .common import BACKEND_DIR, environment, percentile, setup_django, write_results
+
+DEFAULT_SETTINGS = ('complice_taches.settings', 'complice_taches.settings_api')
+DEFAULT_PATH = '/api/tasks/'
+
+
+def measure_startup(path):
+    """Exécuté dans le processus enfant, avant tout import de Django"""
+    start = time.perf_counter()
+    import django
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.urls import get_resolver
+
+    django.setup(set_prefix=False)
+    get_resolver().url_patterns
+    imported = time.perf_counter()
+
+    statuses = []
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'HTTP_HOST': 'localhost',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.url_scheme': 'http',
+    }
+    body = WSGIHandler()(environ, lambda status, headers: statuses.append(int(status.split()[0])))
+    b''.join(body)
+    done = time.perf_counter()
+    return {
+        'import_ms': (imported - start) * 1000,
+        'first_response_ms': (done - start) * 1000,
+        'modules': len(sys.modules),
+        'status': statuses[0],
+    }
+
+
+def _distribution(values):
+    return {
+        'mean': round(statistics.fmean(values), 3),
+        'p50': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'min': round(min(values), 3),
+    }
+
+
+def run_profile(settings_module, runs, path):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.startup', '--child', '--path', path],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        sample = json.loads(completed.stdout.strip().splitlines()[-1])
+        sample['process_ms'] = (time.perf_counter() - start) * 1000
+        samples.append(sample)
+
+    return {
+        'settings': settings_module,
+        'runs': runs,
+        'path': path,
+        'statuses': sorted({sample['status'] for sample in samples}),
+        'modules': max(sample['modules'] for sample in samples),
+        **{
+            metric: _distribution([sample[metric] for sample in samples])
+            for metric in ('import_ms', 'first_response_ms', 'process_ms')
+        },
+    }
+
+
+def run_benchmarks(settings_modules=DEFAULT_SETTINGS, runs=5, path=DEFAULT_PATH):
+    results = [run_profile(settings_module, runs, path) for settings_module in settings_modules]
+    setup_django()
+    return {'environment': environment(), 'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', action='append', help="Module de réglages (répétable)")
+    parser.add_argument('--runs', type=int, default=5, help="Processus lancés par profil")
+    parser.add_argument('--path', default=DEFAULT_PATH, help="Chemin de la première requête")
+    parser.add_argument('--output', help="Fichier JSON de sortie (défaut : stdout)")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_startup(args.path)))
+        return
+    write_results(run_benchmarks(args.settings or DEFAULT_SETTINGS, args.runs, args.path), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+import pytest
+
+from benchmarks.api import run_benchmarks
+
+
+@pytest.mark.django_db
+def test_api_benchmark_smoke():
+    payload = run_benchmarks(users=2, tasks_per_user=5, iterations=3, scenarios=["me", "tasks_list", "mark_complete"])
+
+    results = {r["name"]: r for r in payload["results"]}
+    assert set(results) == {"me", "tasks_list", "mark_complete"}
+    for result in results.values():
+        assert result["requests"] == 3
+        assert set(result["statuses"]) == {"200"}
+        assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+
+
+def test_startup_benchmark_smoke():
+    from benchmarks.startup import run_benchmarks as run_startup
+
+    payload = run_startup(runs=1)
+
+    full, api = payload["results"]
+    assert full["statuses"] == api["statuses"] == [401]
+    assert api["modules"] < full["modules"]
+    assert 0 < api["import_ms"]["p50"] <= api["first_response_ms"]["p50"] < api["process_ms"]["p50"]
+
+
+@pytest.mark.django_db
+def test_hashing_benchmark_smoke():
+    from benchmarks.hashing import run_benchmarks as run_hashing
+
+    payload = run_hashing(iterations=2, pbkdf2_iterations=[1000], argon2_params=["1,1024,1"])
+
+    pbkdf2, argon2 = payload["results"]
+    assert (pbkdf2["algorithm"], argon2["algorithm"]) == ("pbkdf2_sha256", "argon2")
+    assert pbkdf2["login"]["statuses"] == argon2["login"]["statuses"] == {"200": 2}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_refresh_benchmark_smoke():
+    from benchmarks.refresh import run_benchmarks as run_refresh
+
+    payload = run_refresh(blacklisted=50, iterations=3)
+
+    results = {r["name"]: r for r in payload["results"]}
+    for mode in ("filter", "database"):
+        assert results[mode]["statuses"] == {"200": 3}
+        assert results[f"{mode}_rejected"]["statuses"] == {"401": 3}
+    assert results["filter_rejected"]["queries_per_request"] < results["database_rejected"]["queries_per_request"]
@@ -3,6 +3,13 @@ ASGI config for complice_taches project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The web process (see Procfile) runs it under uvicorn, so the async task
+endpoints (/api/async/tasks/) are served without a thread hop and the
+server-sent events stream is available. uvicorn reads the number of worker
+processes from $WEB_CONCURRENCY (1 by default):
+
+    uvicorn complice_taches.asgi:application --host 0.0.0.0 --port $PORT
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +21,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'complice_taches.settings')
 
 application = get_asgi_application()
+
+# Each worker process checks that task events reach the other workers
+from todolist_app.events import check_worker_broker  # noqa: E402
+
+check_worker_broker()
@@ -0,0 +1,117 @@
+"""
+Routage des lectures vers la réplique (DATABASE_REPLICA_URL).
+
+Seules les vues qui l'acceptent explicitement (ReplicaReadMixin) lisent sur
+la réplique ; tout le reste, et toutes les écritures, va sur la base
+principale. Après une écriture, quelle que soit la vue (API, vues async,
+admin), PrimaryPinMiddleware « épingle » l'utilisateur à la base principale
+pendant DATABASE_REPLICA_STICKY_SECONDS pour qu'il lise ses propres
+modifications malgré le retard de réplication.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = 'replica'
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def reading_from_replica():
+    """Les lectures de la requête en cours vont-elles sur la réplique ?"""
+    return _use_replica.get() and replica_configured()
+
+
+def _pin_key(user_id):
+    return f"db:primary-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    cache.set(_pin_key(user_id), True, settings.DATABASE_REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(_pin_key(user_id), False)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if reading_from_replica():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Même données des deux côtés
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    Vues DRF dont les lectures (GET/HEAD/OPTIONS) peuvent aller sur la réplique.
+    `replica_read_actions` restreint aux actions listées (ViewSet) ;
+    None autorise toutes les lectures de la vue.
+    """
+    replica_read_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        use_replica = (
+            replica_configured()
+            and request.method in SAFE_METHODS
+            and (self.replica_read_actions is None or getattr(self, 'action', None) in self.replica_read_actions)
+        )
+        self._replica_token = _use_replica.set(use_replica)
+        super().initial(request, *args, **kwargs)
+        if use_replica and request.user.is_authenticated and is_pinned_to_primary(request.user.pk):
+            _use_replica.set(False)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _use_replica.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class PrimaryPinMiddleware:
+    """
+    Épingle à la base principale l'utilisateur authentifié après toute requête
+    non sûre réussie. L'utilisateur JWT, fixé par DRF ou par async_jwt_required
+    pendant la vue, est lu sur la requête une fois la réponse produite.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.pin(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.pin(request, response)
+        return response
+
+    @staticmethod
+    def pin(request, response):
+        if not replica_configured() or request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
@@ -0,0 +1,107 @@
+"""
+Métriques par route, agrégées en mémoire (par processus) et exposées au
+format texte Prometheus sur /metrics/.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    HISTOGRAMS = {
+        'taskflow_request_duration_seconds': ("Durée totale de la requête", DURATION_BUCKETS),
+        'taskflow_request_db_queries': ("Requêtes SQL par requête HTTP", QUERY_BUCKETS),
+        'taskflow_request_db_duration_seconds': ("Temps passé en base par requête HTTP", DURATION_BUCKETS),
+        'taskflow_response_size_bytes': ("Taille du corps de la réponse", SIZE_BUCKETS),
+    }
+    COUNTERS = {
+        'taskflow_response_cache_total': "Réponses servies depuis le cache (hit) ou recalculées (miss)",
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name: {} for name in self.HISTOGRAMS}
+            self._requests = defaultdict(int)
+            self._counters = {name: defaultdict(int) for name in self.COUNTERS}
+
+    def _observe(self, name, labels, value):
+        series = self._histograms[name]
+        if labels not in series:
+            series[labels] = Histogram(self.HISTOGRAMS[name][1])
+        series[labels].observe(value)
+
+    def record(self, route, method, status, duration, queries, db_time, size=None):
+        labels = (('route', route), ('method', method))
+        with self._lock:
+            self._requests[labels + (('status', str(status)),)] += 1
+            self._observe('taskflow_request_duration_seconds', labels, duration)
+            self._observe('taskflow_request_db_queries', labels, queries)
+            self._observe('taskflow_request_db_duration_seconds', labels, db_time)
+            if size is not None:
+                self._observe('taskflow_response_size_bytes', labels, size)
+
+    def increment(self, name, **labels):
+        with self._lock:
+            self._counters[name][tuple(labels.items())] += 1
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            return self._counters[name].get(tuple(labels.items()), 0)
+
+    def render(self):
+        """Export au format texte Prometheus 0.0.4"""
+        lines = [
+            '# HELP taskflow_requests_total Nombre de requêtes HTTP traitées',
+            '# TYPE taskflow_requests_total counter',
+        ]
+        with self._lock:
+            for labels, value in sorted(self._requests.items()):
+                lines.append(f"taskflow_requests_total{_labels(labels)} {value}")
+            for name, help_text in self.COUNTERS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_labels(labels)} {value}")
+            for name, (help_text, buckets) in self.HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(pairs):
+    escaped = (
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+registry = MetricsRegistry()
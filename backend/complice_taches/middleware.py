@@ -0,0 +1,148 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from .metrics import registry
+
+slow_logger = logging.getLogger('complice_taches.slow_requests')
+
+# Nombre maximal de requêtes SQL gardées pour le journal des requêtes lentes
+MAX_CAPTURED_QUERIES = 200
+
+
+class QueryRecorder:
+    """execute_wrapper qui compte et chronomètre les requêtes SQL, sans DEBUG"""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.time += duration
+            if len(self.statements) < MAX_CAPTURED_QUERIES:
+                self.statements.append((sql, duration))
+
+
+# Recorder de la requête HTTP en cours ; le contexte suit la requête jusque dans
+# le thread où sync_to_async exécute les vues sync (et leur SQL) sous ASGI
+_current_recorder = ContextVar('query_recorder', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection, **kwargs):
+    """Ajoute record_query aux execute_wrappers de la connexion (une seule fois)"""
+    if record_query not in connection.execute_wrappers:
+        # En tête : execute_wrapper() retire le dernier élément à sa sortie
+        connection.execute_wrappers.insert(0, record_query)
+
+
+# Connexions ouvertes dans n'importe quel thread, y compris ceux de sync_to_async
+connection_created.connect(install_query_recorder)
+
+
+@contextmanager
+def recording(recorder):
+    # Connexions du thread courant déjà ouvertes avant le chargement de ce module
+    for alias in connections:
+        install_query_recorder(connections[alias])
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """
+    Mesure pour chaque route (nom d'URL, ex. tasks-list) la durée, le nombre
+    de requêtes SQL et leur durée cumulée, et la taille de la réponse.
+    Au-delà de SLOW_REQUEST_THRESHOLD_MS, le SQL exécuté est journalisé.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with recording(QueryRecorder()) as recorder:
+            response = self.get_response(request)
+        return self.finish(request, response, time.perf_counter() - start, recorder)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with recording(QueryRecorder()) as recorder:
+            response = await self.get_response(request)
+        return self.finish(request, response, time.perf_counter() - start, recorder)
+
+    def finish(self, request, response, duration, recorder):
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        registry.record(route, request.method, response.status_code, duration, recorder.count, recorder.time, size)
+
+        if duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            self.log_slow_request(request, route, duration, recorder)
+        return response
+
+    def log_slow_request(self, request, route, duration, recorder):
+        statements = '\n'.join(f"  [{sql_time * 1000:.1f} ms] {sql}" for sql, sql_time in recorder.statements)
+        slow_logger.warning(
+            "Requête lente %s %s (%s) : %.1f ms, %d requête(s) SQL en %.1f ms\n%s",
+            request.method, request.get_full_path(), route, duration * 1000,
+            recorder.count, recorder.time * 1000, statements,
+        )
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise utilisable en sync comme en async : sans cela, ce middleware
+    sync-only imposerait un passage par un thread à chaque requête ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
@@ -2,8 +2,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 
-import dj_database_url
-from django.core.wsgi import get_wsgi_application
+from django.core.exceptions import ImproperlyConfigured
 
 # -------------------------------
 # Paths
@@ -45,6 +44,7 @@ INSTALLED_APPS = [
 
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
 
     'complice_taches',
@@ -53,8 +53,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'complice_taches.middleware.RequestMetricsMiddleware',
+    'complice_taches.db_routing.PrimaryPinMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'complice_taches.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -110,16 +112,45 @@ WSGI_APPLICATION = 'complice_taches.wsgi.application'
 # Database
 # -------------------------------
 DATABASE_URL = os.environ.get('DATABASE_URL')
+# Réplique en lecture optionnelle (voir complice_taches.db_routing)
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+
+# Connexions persistantes, vérifiées avant réutilisation
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '600'))
+DB_CONN_HEALTH_CHECKS = os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True'
+# DB_POOL_MAX_SIZE > 0 : pool de connexions natif de Django (PostgreSQL, psycopg 3 avec l'extra "pool")
+DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', '1'))
+DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', '0'))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '10'))
+
+
+def database_config(url):
+    # Import tardif : inutile en développement (SQLite)
+    import dj_database_url
+
+    config = dj_database_url.parse(
+        url,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=DB_CONN_HEALTH_CHECKS,
+        ssl_require=url.startswith(('postgres://', 'postgresql://')),
+    )
+    if DB_POOL_MAX_SIZE and config['ENGINE'] == 'django.db.backends.postgresql':
+        # Le pool gère lui-même la durée de vie des connexions. La vérification avant
+        # prêt (ConnectionPool.check_connection) est passée au pool par Django quand
+        # CONN_HEALTH_CHECKS est actif : pas d'option 'check' ici
+        config['CONN_MAX_AGE'] = 0
+        config.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': DB_POOL_MIN_SIZE,
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': DB_POOL_TIMEOUT,
+        }
+    return config
+
 
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.config(
-            default=DATABASE_URL,
-            conn_max_age=600,
-            ssl_require=True
-        )
+        'default': database_config(DATABASE_URL)
     }
-    print("✅ Using PostgreSQL database from DATABASE_URL")
 else:
     DATABASES = {
         'default': {
@@ -127,7 +158,46 @@ else:
             'NAME': BASE_DIR / 'db.sqlite3',
         }
     }
-    print("✅ Using SQLite database for local development")
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = database_config(DATABASE_REPLICA_URL)
+    # En test, la réplique pointe sur la base de test principale
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['complice_taches.db_routing.ReadReplicaRouter']
+# Après une écriture, les lectures de l'utilisateur restent sur la base principale
+# pendant ce délai (retard de réplication)
+DATABASE_REPLICA_STICKY_SECONDS = int(os.environ.get('DATABASE_REPLICA_STICKY_SECONDS', '5'))
+
+# -------------------------------
+# Cache
+# -------------------------------
+# locmem:// (défaut, par processus), file:///chemin, redis://hôte:6379/0, memcached://hôte:11211
+CACHE_URL = os.environ.get('CACHE_URL', 'locmem://')
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'rediss': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_config(url):
+    scheme, _, location = url.partition('://')
+    if scheme not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(f"CACHE_URL : schéma de cache inconnu « {scheme} »")
+    if scheme in ('redis', 'rediss'):
+        # Le client Redis attend l'URL complète
+        location = url
+    return {'BACKEND': CACHE_BACKENDS[scheme], 'LOCATION': location}
+
+
+CACHES = {
+    'default': cache_config(CACHE_URL)
+}
 
 # -------------------------------
 # Password validation
@@ -139,6 +209,31 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',},
 ]
 
+# -------------------------------
+# Password hashing
+# -------------------------------
+# Hachage préféré : pbkdf2 ou argon2 (argon2-cffi). Les hachages existants restent
+# vérifiables et sont recalculés à la connexion quand l'algorithme ou le coût change.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+# 0 : nombre d'itérations par défaut de Django
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', '0'))
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', '2'))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get('PASSWORD_ARGON2_MEMORY_COST', '102400'))  # Kio
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get('PASSWORD_ARGON2_PARALLELISM', '8'))
+
+PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'users_app.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'users_app.hashers.TunedArgon2PasswordHasher',
+}
+if PASSWORD_HASHER not in PASSWORD_HASHER_CLASSES:
+    raise ImproperlyConfigured(f"PASSWORD_HASHER : hachage inconnu « {PASSWORD_HASHER} »")
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # -------------------------------
 # Internationalization
 # -------------------------------
@@ -164,13 +259,23 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # -------------------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users_app.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # Limites de /api/token/ (login_*) et /api/user/register/ (register_*), voir users_app.throttling
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('THROTTLE_LOGIN_IP', '30/min'),
+        'login_user': os.environ.get('THROTTLE_LOGIN_USER', '5/min'),
+        'register_ip': os.environ.get('THROTTLE_REGISTER_IP', '10/hour'),
+        'register_user': os.environ.get('THROTTLE_REGISTER_USER', '5/hour'),
+    },
+    # Nombre de proxys devant l'application (X-Forwarded-For), à fixer au déploiement (ex. 1 sur Render).
+    # 0 : l'IP est REMOTE_ADDR, un X-Forwarded-For envoyé par le client est ignoré
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '0')),
 }
 
 SIMPLE_JWT = {
@@ -181,7 +286,50 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Liste noire vérifiée par un filtre en mémoire avant la base (users_app.blacklist)
+    'TOKEN_REFRESH_SERIALIZER': 'users_app.serializers.TokenRefreshSerializer',
+}
+
+# -------------------------------
+# Metrics
+# -------------------------------
+# Jeton (Bearer) pour /metrics/ ; sans jeton, seuls les admins connectés y ont accès
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Au-delà de ce seuil, le SQL de la requête est journalisé
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', '500'))
+
+# Durée (secondes) de mise en cache de l'utilisateur authentifié par JWT
+AUTH_USER_CACHE_TTL = int(os.environ.get('AUTH_USER_CACHE_TTL', '60'))
+
+# -------------------------------
+# Flux d'événements des tâches (SSE, /api/async/tasks/events/)
+# -------------------------------
+# LocalBroker : un seul processus ; CacheBroker : plusieurs workers via le cache partagé
+TASK_EVENTS_BACKEND = {
+    'BACKEND': os.environ.get('TASK_EVENTS_BACKEND', 'todolist_app.events.LocalBroker'),
 }
+# Nombre de processus web (lu aussi par uvicorn, voir Procfile)
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+if WEB_CONCURRENCY > 1:
+    # Les événements d'un worker n'atteindraient pas les connexions des autres
+    if TASK_EVENTS_BACKEND['BACKEND'] == 'todolist_app.events.LocalBroker':
+        raise ImproperlyConfigured(
+            "TASK_EVENTS_BACKEND : LocalBroker ne sert qu'un processus, utilisez "
+            "todolist_app.events.CacheBroker avec WEB_CONCURRENCY > 1"
+        )
+    if CACHE_URL.partition('://')[0] in ('locmem', 'dummy'):
+        raise ImproperlyConfigured("CACHE_URL : cache partagé (redis://, memcached://) requis avec WEB_CONCURRENCY > 1")
+# Intervalle (secondes) des commentaires de maintien de connexion
+TASK_EVENTS_HEARTBEAT = float(os.environ.get('TASK_EVENTS_HEARTBEAT', '15'))
+TASK_EVENTS_RETRY_MS = int(os.environ.get('TASK_EVENTS_RETRY_MS', '3000'))
+
+# Durée (secondes) de conservation des réponses GET /api/tasks/ en cache ;
+# toute écriture change la version de l'utilisateur et les rend obsolètes
+TASK_RESPONSE_CACHE_TTL = int(os.environ.get('TASK_RESPONSE_CACHE_TTL', '300'))
+# Avec un cache propre à chaque processus (locmem://, dummy://), les workers ne verraient pas
+# les écritures des autres : le cache des réponses est alors contourné, sauf avec
+# TASK_RESPONSE_CACHE_LOCAL=True (un seul processus). Utiliser redis:// ou memcached:// en production.
+TASK_RESPONSE_CACHE_LOCAL = os.environ.get('TASK_RESPONSE_CACHE_LOCAL', 'False') == 'True'
 
 # -------------------------------
 # Email
@@ -195,7 +343,4 @@ else:
     EMAIL_USE_TLS = True
     EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
     EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
-    DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
-
-# Create staticfiles folder if it doesn't exist
-os.makedirs(STATIC_ROOT, exist_ok=True)
\ No newline at end of file
+    DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Profil « API seule » : les réglages de complice_taches.settings, réduits à
+ce dont ont besoin les endpoints JSON authentifiés par JWT.
+
+Pas d'admin, de sessions, de messages, de fichiers statiques ni d'API
+navigable DRF : chaque worker importe moins de modules au démarrage.
+L'admin reste servi par un processus lancé avec complice_taches.settings.
+
+    DJANGO_SETTINGS_MODULE=complice_taches.settings_api gunicorn complice_taches.wsgi:application
+
+Voir benchmarks/startup.py pour la mesure du démarrage.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import REST_FRAMEWORK
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+
+    'rest_framework',
+    'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
+    'corsheaders',
+
+    'complice_taches',
+    'users_app',
+    'todolist_app',
+]
+
+# Authentification par en-tête JWT uniquement : ni session, ni CSRF, ni messages
+MIDDLEWARE = [
+    'complice_taches.middleware.RequestMetricsMiddleware',
+    'complice_taches.db_routing.PrimaryPinMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'complice_taches.urls_api'
+
+# Aucun gabarit servi (pages d'erreur Django en texte brut)
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+}
@@ -0,0 +1,203 @@
+import logging
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from complice_taches.metrics import registry
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    registry.reset()
+
+
+@pytest.mark.django_db
+def test_metrics_record_route_queries_and_size(settings):
+    settings.METRICS_TOKEN = "secret"
+    user = User.objects.create_user(username="paul", password="pwd123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.get(reverse("tasks-list"))
+
+    response = APIClient().get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+
+    assert response.status_code == 200
+    body = response.content.decode()
+    assert 'taskflow_requests_total{route="tasks-list",method="GET",status="200"} 1' in body
+    assert 'taskflow_request_db_queries_count{route="tasks-list",method="GET"} 1' in body
+    assert 'taskflow_response_size_bytes_bucket{route="tasks-list",method="GET",le="+Inf"} 1' in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_protected(settings):
+    settings.METRICS_TOKEN = "secret"
+
+    assert APIClient().get(reverse("metrics")).status_code == 403
+    assert APIClient().get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong").status_code == 403
+
+
+@pytest.mark.django_db
+def test_slow_requests_log_their_sql(settings, caplog):
+    settings.SLOW_REQUEST_THRESHOLD_MS = 0
+    user = User.objects.create_user(username="rita", password="pwd123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with caplog.at_level(logging.WARNING, logger="complice_taches.slow_requests"):
+        client.get(reverse("tasks-list"))
+
+    assert "tasks-list" in caplog.text
+    assert "todolist_app_tasklist" in caplog.text
+
+
+@pytest.fixture
+def replica(db, tmp_path, monkeypatch):
+    """Seconde base SQLite (fichier) déclarée comme réplique le temps du test"""
+    from django.core.management import call_command
+    from django.db import connections
+    from django.db.utils import load_backend
+    from complice_taches import db_routing
+
+    config = connections.configure_settings({
+        "default": connections.settings["default"],
+        "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / "replica.sqlite3")},
+    })["replica"]
+    # Connexion ouverte avant d'être déclarée : le garde-fou des tests Django ne la bloque pas
+    connection = load_backend(config["ENGINE"]).DatabaseWrapper(config, "replica")
+    connection.ensure_connection()
+    connections.settings["replica"] = config
+    connections["replica"] = connection
+    monkeypatch.setattr(db_routing, "replica_configured", lambda: True)
+    try:
+        call_command("migrate", database="replica", verbosity=0)
+        yield connection
+    finally:
+        connection.close()
+        del connections["replica"]
+        del connections.settings["replica"]
+
+
+@pytest.mark.django_db
+def test_reads_go_to_replica_until_user_writes(replica):
+    from todolist_app.models import TaskList
+
+    user = User.objects.create_user(username="ugo", password="pwd123")
+    TaskList.objects.create(gestionnaire=user, task="Primary")
+    # Même utilisateur sur la réplique, avec un contenu différent
+    User.objects.using("replica").create(id=user.id, username="ugo", password=user.password)
+    TaskList.objects.using("replica").create(gestionnaire_id=user.id, task="Replica")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    listing = client.get(reverse("tasks-list"))
+    assert [t["task"] for t in listing.data["results"]] == ["Replica"]
+
+    assert client.post(reverse("tasks-list"), {"task": "Written"}).status_code == 201
+    listing = client.get(reverse("tasks-list"))
+    assert [t["task"] for t in listing.data["results"]] == ["Written", "Primary"]
+    assert not TaskList.objects.using("replica").filter(task="Written").exists()
+
+
+@pytest.mark.django_db
+def test_writes_outside_replica_views_pin_to_primary(replica):
+    staff = User.objects.create_user(username="sara", password="pwd123", is_staff=True)
+    target = User.objects.create_user(username="theo", first_name="Primary")
+    User.objects.using("replica").create(id=staff.id, username="sara", password=staff.password, is_staff=True)
+    User.objects.using("replica").create(id=target.id, username="theo", first_name="Replica")
+    client = APIClient()
+    client.force_authenticate(user=staff)
+
+    def first_name():
+        users = client.get(reverse("user-list")).data["results"]
+        return next(u["first_name"] for u in users if u["id"] == target.id)
+
+    assert first_name() == "Replica"
+    # UserDetailView n'utilise pas ReplicaReadMixin : l'épinglage vient du middleware
+    assert client.patch(reverse("user-detail", args=[target.id]), {"first_name": "Edited"}).status_code == 200
+    assert first_name() == "Edited"
+
+
+@pytest.mark.django_db
+def test_non_replica_views_read_primary(replica):
+    from todolist_app.models import TaskList
+
+    user = User.objects.create_user(username="vera", password="pwd123")
+    TaskList.objects.create(gestionnaire=user, task="Primary")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert client.get(reverse("tasks-stats")).data["total"] == 1
+
+
+def test_cache_config_from_url():
+    from django.core.exceptions import ImproperlyConfigured
+    from complice_taches.settings import cache_config
+
+    assert cache_config('locmem://')['BACKEND'].endswith('LocMemCache')
+    assert cache_config('file:///var/tmp/cache') == {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/var/tmp/cache',
+    }
+    assert cache_config('redis://cache:6379/1')['LOCATION'] == 'redis://cache:6379/1'
+    with pytest.raises(ImproperlyConfigured):
+        cache_config('mongo://db')
+
+
+def test_pool_config_builds_a_checked_pool(monkeypatch):
+    pytest.importorskip("psycopg_pool")
+    from django.db.utils import ConnectionHandler
+    from psycopg_pool import ConnectionPool
+    from complice_taches import settings as project_settings
+
+    monkeypatch.setattr(project_settings, "DB_POOL_MAX_SIZE", 4)
+    config = project_settings.database_config("postgres://app:secret@db:5432/taches")
+    assert config["CONN_MAX_AGE"] == 0
+    assert config["OPTIONS"]["pool"] == {"min_size": 1, "max_size": 4, "timeout": 10.0}
+
+    # Pool créé comme le fait Django (fermé : aucune connexion ouverte)
+    connection = ConnectionHandler({"default": config})["default"]
+    try:
+        assert connection.pool.max_size == 4
+        assert connection.pool._check == ConnectionPool.check_connection
+    finally:
+        connection.close_pool()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_metrics_record_sync_view_queries_under_asgi(settings, caplog):
+    import asyncio
+    from django.test import AsyncClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    settings.SLOW_REQUEST_THRESHOLD_MS = 0
+    user = User.objects.create_user(username="ugo", password="pwd123")
+    auth = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    with caplog.at_level(logging.WARNING, logger="complice_taches.slow_requests"):
+        response = asyncio.run(AsyncClient().get(reverse("tasks-list"), headers=auth))
+
+    assert response.status_code == 200
+    # Vue DRF sync : son SQL s'exécute dans le thread de sync_to_async
+    assert "todolist_app_tasklist" in caplog.text
+    assert " 0 requête(s) SQL" not in caplog.text
+
+
+# Fichiers livrés en CRLF : une réécriture LF rend leurs diffs illisibles
+CRLF_FILES = [
+    "Procfile",
+    "runtime.txt",
+    "create_admin.py",
+    "complice_taches/settings.py",
+    "complice_taches/urls.py",
+    "users_app/serializers.py",
+    "users_app/views.py",
+]
+
+
+@pytest.mark.parametrize("name", CRLF_FILES)
+def test_crlf_files_keep_their_line_endings(name):
+    from django.conf import settings
+
+    content = (settings.BASE_DIR / name).read_bytes()
+    assert content.count(b"\n") == content.count(b"\r\n")
@@ -0,0 +1,27 @@
+"""
+URLconf de l'API JSON, sans admin ni API navigable DRF : c'est celle du
+profil complice_taches.settings_api. complice_taches.urls y ajoute l'admin.
+"""
+from django.urls import path, include
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from users_app.views import LoginView
+
+from .views import api_root, health_check, metrics
+
+urlpatterns = [
+    # API Documentation
+    path('', api_root, name='api-root'),
+
+    # Health check
+    path('health/', health_check, name='health'),
+    path('metrics/', metrics, name='metrics'),
+
+    # API Endpoints
+    path('api/', include('todolist_app.urls')),
+    path('api/user/', include('users_app.urls')),
+
+    # Authentication
+    path('api/token/', LoginView.as_view(), name='token_obtain_pair'),
+    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+]
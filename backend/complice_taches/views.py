@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
+
+from .metrics import registry
+
+
+@csrf_exempt
+def health_check(request):
+    return JsonResponse({
+        'status': 'ok',
+        'service': 'TaskFlow Backend API',
+        'endpoints': {
+            'api_root': '/api/',
+            'register': '/api/user/register/',
+            'login': '/api/token/',
+            'tasks': '/api/tasks/',
+            'admin': '/admin/',
+            'health': '/health/',
+            'metrics': '/metrics/'
+        },
+        'frontend': 'Will be deployed separately as Static Site'
+    })
+
+
+def metrics(request):
+    """Métriques au format Prometheus (jeton METRICS_TOKEN ou admin connecté)"""
+    auth = request.headers.get('Authorization', '')
+    token_ok = bool(settings.METRICS_TOKEN) and constant_time_compare(auth, f"Bearer {settings.METRICS_TOKEN}")
+    # Profil API seule : pas d'AuthenticationMiddleware, donc pas de request.user
+    user = getattr(request, 'user', None)
+    if not token_ok and not (user and user.is_staff):
+        return JsonResponse({'error': 'Accès refusé'}, status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@csrf_exempt
+def api_root(request):
+    return JsonResponse({
+        'message': 'TaskFlow API',
+        'version': '1.0',
+        'endpoints': {
+            'auth': {
+                'register': '/api/user/register/',
+                'login': '/api/token/',
+                'refresh': '/api/token/refresh/',
+                'me': '/api/user/me/'
+            },
+            'tasks': {
+                'list': '/api/tasks/',
+                'create': '/api/tasks/',
+                'detail': '/api/tasks/{id}/'
+            },
+            'admin': '/admin/'
+        }
+    })
@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Le cache locmem survit entre les tests : on repart d'un cache vide"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def local_response_cache(settings):
+    """Les tests tournent dans un seul processus : le cache des réponses peut rester en locmem"""
+    settings.TASK_RESPONSE_CACHE_LOCAL = True
@@ -1,23 +1,125 @@
+from django import forms
 from django.contrib import admin
-from .models import TaskList
+from django.contrib.admin.widgets import AutocompleteSelect
+from .models import ArchivedTask, TaskList, EmailOutbox
+from .pagination import EstimatedCountPaginator
+from .search import search_tasks
+from .stats import UPDATE_BATCH_SIZE, update_done_in_batches
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Filtre sur une clé étrangère avec un champ d'autocomplétion (vue
+    autocomplete de l'admin) au lieu d'un lien par objet lié : la page ne
+    charge plus toute la table liée. L'admin du modèle lié doit définir
+    search_fields.
+    """
+    template = 'admin/todolist_app/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.model_admin = model_admin
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        return []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            'selected': not self.lookup_val,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg, self.lookup_kwarg_isnull]),
+            'display': 'Tous',
+        }
+
+    @property
+    def widget_id(self):
+        return f"{self.field_path}-autocomplete-filter"
+
+    @property
+    def widget(self):
+        # Seul l'objet sélectionné est chargé pour afficher son libellé
+        field = forms.ModelChoiceField(
+            queryset=self.field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(self.field, self.model_admin.admin_site),
+            required=False,
+        )
+        value = self.lookup_val[-1] if self.lookup_val else None
+        return field.widget.render(self.lookup_kwarg, value, attrs={'id': self.widget_id})
+
 
 @admin.register(TaskList)
 class TaskListAdmin(admin.ModelAdmin):
-    list_display = ('id', 'task', 'gestionnaire', 'done')
+    list_display = ('id', 'task', 'gestionnaire', 'done', 'priority', 'due_at')
     list_display_links = ('task',)
-    list_filter = ('done', 'gestionnaire')
+    list_filter = ('done', 'priority', 'due_at', ('gestionnaire', AutocompleteFilter))
+    list_select_related = ('gestionnaire',)
     search_fields = ('task', 'gestionnaire__username')
     ordering = ('id',)
     actions = ['marquer_terminee', 'marquer_en_attente']
+    # Pas de second COUNT(*) sur toute la table ni de comptage par filtre
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    # Taille des lots des actions sur une sélection (même « tout sélectionner »)
+    action_batch_size = UPDATE_BATCH_SIZE
+
+    @property
+    def media(self):
+        # select2 et autocomplete.js pour le filtre par gestionnaire
+        field = TaskList._meta.get_field('gestionnaire')
+        return super().media + AutocompleteSelect(field, self.admin_site).media
+
+    def get_search_results(self, request, queryset, search_term):
+        """Recherche via l'index plein texte (libellé) ou le nom exact du gestionnaire"""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        matches = search_tasks(queryset, search_term, ranked=False)
+        return matches | queryset.filter(gestionnaire__username=search_term), False
 
     def marquer_terminee(self, request, queryset):
         """Marquer les tâches sélectionnées comme terminées"""
-        updated = queryset.update(done=True)
+        updated = update_done_in_batches(queryset, True, self.action_batch_size)
         self.message_user(request, f"{updated} tâche(s) marquée(s) comme terminée(s).")
     marquer_terminee.short_description = "Marquer comme terminée"
 
     def marquer_en_attente(self, request, queryset):
         """Marquer les tâches sélectionnées comme en attente"""
-        updated = queryset.update(done=False)
+        updated = update_done_in_batches(queryset, False, self.action_batch_size)
         self.message_user(request, f"{updated} tâche(s) marquée(s) comme en attente.")
     marquer_en_attente.short_description = "Marquer comme en attente"
+
+
+@admin.register(ArchivedTask)
+class ArchivedTaskAdmin(admin.ModelAdmin):
+    """Tâches archivées, en lecture seule (voir archive.py)"""
+    list_display = ('id', 'task', 'gestionnaire', 'priority', 'created_at', 'archived_at')
+    list_display_links = ('task',)
+    list_filter = ('priority', 'archived_at', ('gestionnaire', AutocompleteFilter))
+    list_select_related = ('gestionnaire',)
+    search_fields = ('task', 'gestionnaire__username')
+    ordering = ('id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        field = ArchivedTask._meta.get_field('gestionnaire')
+        return super().media + AutocompleteSelect(field, self.admin_site).media
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    ordering = ('-id',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
@@ -0,0 +1,41 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+# Fenêtre par défaut (et maximale) des tâches « à venir », en jours après aujourd'hui
+AGENDA_DAYS = 7
+AGENDA_MAX_DAYS = 31
+# Tâches renvoyées par catégorie ; has_more signale les suivantes
+AGENDA_LIMIT = 50
+
+
+def agenda_bounds(now=None, days=AGENDA_DAYS):
+    """(maintenant, début de demain, fin de la fenêtre), en heure locale"""
+    now = now or timezone.now()
+    tomorrow = datetime.combine(timezone.localdate(now) + timedelta(days=1), time.min)
+    tomorrow = timezone.make_aware(tomorrow)
+    return now, tomorrow, tomorrow + timedelta(days=days)
+
+
+def agenda_buckets(queryset, now=None, days=AGENDA_DAYS, limit=AGENDA_LIMIT):
+    """
+    Tâches en attente d'un gestionnaire, par échéance : en retard, aujourd'hui,
+    à venir. Chaque catégorie est une plage de l'index (gestionnaire, done,
+    due_at) lue dans l'ordre de l'index avec LIMIT : le coût ne dépend ni des
+    tâches terminées ni des tâches sans échéance.
+    Retourne {catégorie: (tâches, has_more)}.
+    """
+    now, tomorrow, end = agenda_bounds(now, days)
+    # done=False s'écrit « NOT done », que SQLite n'utilise pas comme égalité
+    # sur l'index ; « done IN (false) » donne une plage d'index sans tri
+    pending = queryset.filter(done__in=[False]).order_by('due_at', 'id')
+    ranges = {
+        'overdue': pending.filter(due_at__lt=now),
+        'today': pending.filter(due_at__gte=now, due_at__lt=tomorrow),
+        'upcoming': pending.filter(due_at__gte=tomorrow, due_at__lt=end),
+    }
+    buckets = {}
+    for name, tasks in ranges.items():
+        tasks = list(tasks[:limit + 1])
+        buckets[name] = (tasks[:limit], len(tasks) > limit)
+    return buckets
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TodolistAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todolist_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,92 @@
+"""
+Archivage des tâches terminées dans ArchivedTask (table froide).
+
+`manage.py archive_tasks --older-than 90d` déplace par lots les tâches
+terminées dont la dernière modification est plus ancienne que le seuil :
+TaskList et ses index ne gardent que le travail récent ou en attente.
+Chaque lot est copié puis supprimé dans une même transaction, les lignes
+étant relues verrouillées (une tâche rouverte entre-temps reste en place).
+
+Les compteurs (stats) comptent les deux tables : l'archivage ne les change
+pas. Les listes par défaut, elles, n'affichent plus les tâches archivées :
+les versions du cache des réponses changent et le flux d'événements les
+signale comme retirées.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import BooleanField, Q, Value
+from django.utils import timezone
+
+from .events import publish_delete
+from .models import ArchivedTask, TaskList
+from .response_cache import bump_versions
+from .search import search_terms
+
+ARCHIVE_BATCH_SIZE = 1000
+ARCHIVE_FIELDS = ('id', 'gestionnaire_id', 'task', 'done', 'priority', 'due_at', 'created_at', 'updated_at')
+
+
+def archive_tasks(older_than, batch_size=ARCHIVE_BATCH_SIZE):
+    """Archive les tâches terminées non modifiées depuis `older_than` ; retourne le nombre archivé"""
+    cutoff = timezone.now() - older_than
+    # Index (updated_at, id) ; les lignes archivées quittent la table, pas besoin de curseur
+    candidates = TaskList.objects.filter(done=True, updated_at__lt=cutoff).order_by('updated_at', 'id')
+    archived = 0
+    while True:
+        ids = list(candidates.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return archived
+        with transaction.atomic():
+            rows = list(
+                TaskList.objects.select_for_update()
+                .filter(id__in=ids, done=True, updated_at__lt=cutoff).values(*ARCHIVE_FIELDS)
+            )
+            ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in rows])
+            moved = TaskList.objects.filter(id__in=[row['id'] for row in rows])
+            # Pas de delete() : ni chargement des tâches ni tombstone, elles existent toujours
+            moved._raw_delete(moved.db)
+
+            by_owner = defaultdict(list)
+            for row in rows:
+                by_owner[row['gestionnaire_id']].append(row['id'])
+            bump_versions(*by_owner)
+            for owner_id, owned in by_owner.items():
+                publish_delete(owner_id, owned)
+        archived += len(rows)
+
+
+def search_archived(queryset, query):
+    """Recherche sur les tâches archivées : pas d'index plein texte, filtre icontains par terme"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    condition = Q()
+    for term in terms:
+        condition &= Q(task__icontains=term)
+    return queryset.filter(condition)
+
+
+def with_archive(tasks, archived):
+    """
+    UNION ALL des deux tables, limitée à (id, created_at, archived) et triée
+    comme les listes : la page est découpée sur ces seules colonnes, puis
+    load_page charge les lignes de la page.
+    """
+    columns = ('id', 'created_at', 'archived')
+    hot = tasks.order_by().annotate(archived=Value(False, output_field=BooleanField())).values_list(*columns)
+    cold = archived.order_by().annotate(archived=Value(True, output_field=BooleanField())).values_list(*columns)
+    return hot.union(cold, all=True).order_by('-created_at', '-id')
+
+
+def load_page(rows):
+    """Instances (TaskList ou ArchivedTask) d'une page de with_archive, dans l'ordre de la page"""
+    ids = defaultdict(list)
+    for task_id, _, archived in rows:
+        ids[archived].append(task_id)
+    loaded = {}
+    for archived, model in ((False, TaskList), (True, ArchivedTask)):
+        if ids[archived]:
+            for task in model.objects.filter(id__in=ids[archived]).select_related('gestionnaire'):
+                loaded[archived, task.id] = task
+    return [loaded[archived, task_id] for task_id, _, archived in rows if (archived, task_id) in loaded]
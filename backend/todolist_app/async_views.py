@@ -0,0 +1,178 @@
+"""
+Variantes asynchrones des endpoints de tâches les plus sollicités.
+
+Vues Django natives (async def) : servies depuis complice_taches.asgi sans
+passage par un thread, avec l'ORM asynchrone (acount, aget, acreate, asave,
+itération async) et l'authentification JWT asynchrone. Mêmes règles d'accès
+et même format de réponse que TaskViewSet ; mark_complete et mark_pending
+passent par updates.update_task, comme la vue synchrone.
+"""
+import json
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from users_app.authentication import CachedJWTAuthentication, QueryTokenJWTAuthentication
+
+from .events import get_broker, subscription_channels
+from .models import TaskList
+from .serializers import TaskSerializer
+from .sync import if_match_versions, set_validators, task_etag
+from .updates import STALE_TASK_MESSAGE, PreconditionFailed, update_task
+
+
+def async_jwt_required(view=None, authentication_class=CachedJWTAuthentication):
+    """Authentifie la requête par JWT (async) ; 401 sinon"""
+    if view is None:
+        return partial(async_jwt_required, authentication_class=authentication_class)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            user_auth = await authentication_class().aauthenticate(request)
+        except AuthenticationFailed as e:
+            detail = e.detail if isinstance(e.detail, dict) else {'detail': e.detail}
+            return JsonResponse(detail, status=401)
+        if user_auth is None:
+            return JsonResponse({'detail': "Informations d'authentification non fournies."}, status=401)
+        request.user, request.auth = user_auth
+        return await view(request, *args, **kwargs)
+    return csrf_exempt(wrapper)
+
+
+def _tasks_for(user):
+    return TaskList.objects.visible_to(user).select_related('gestionnaire').order_by('-created_at', '-id')
+
+
+def _page_url(request, page, last_page):
+    if page < 1 or page > last_page:
+        return None
+    url = request.build_absolute_uri()
+    return remove_query_param(url, 'page') if page == 1 else replace_query_param(url, 'page', page)
+
+
+@async_jwt_required
+@require_http_methods(['GET', 'POST'])
+async def task_list(request):
+    if request.method == 'POST':
+        return await _task_create(request)
+
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        page = 0
+    queryset = _tasks_for(request.user)
+    count = await queryset.acount()
+    last_page = max(1, -(-count // page_size))
+    if not 1 <= page <= last_page:
+        return JsonResponse({'detail': 'Page non valide.'}, status=404)
+
+    offset = (page - 1) * page_size
+    tasks = [task async for task in queryset[offset:offset + page_size]]
+    return JsonResponse({
+        'count': count,
+        'next': _page_url(request, page + 1, last_page),
+        'previous': _page_url(request, page - 1, last_page),
+        'results': TaskSerializer(tasks, many=True).data,
+    })
+
+
+async def _task_create(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'detail': 'JSON invalide.'}, status=400)
+    serializer = TaskSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    task = await TaskList.objects.acreate(gestionnaire=request.user, **serializer.validated_data)
+    return JsonResponse(TaskSerializer(task).data, status=201)
+
+
+async def _get_task(request, pk):
+    try:
+        return await _tasks_for(request.user).aget(pk=pk)
+    except TaskList.DoesNotExist:
+        return None
+
+
+@async_jwt_required
+@require_http_methods(['GET'])
+async def task_detail(request, pk):
+    task = await _get_task(request, pk)
+    if task is None:
+        return JsonResponse({'detail': 'Pas trouvé.'}, status=404)
+    return JsonResponse(TaskSerializer(task).data)
+
+
+async def _set_done(request, pk, done, message):
+    # update_task : un seul UPDATE conditionnel, compteurs, cache et événements à jour
+    try:
+        changed, updated_at = await sync_to_async(update_task)(
+            request.user, pk, {'done': done}, if_match_versions(request, pk)
+        )
+    except TaskList.DoesNotExist:
+        return JsonResponse({'detail': 'Pas trouvé.'}, status=404)
+    except PreconditionFailed as e:
+        response = JsonResponse({'error': STALE_TASK_MESSAGE}, status=412)
+        return set_validators(response, task_etag(pk, e.updated_at), e.updated_at)
+    response = JsonResponse({'status': message, 'changed': changed})
+    return set_validators(response, task_etag(pk, updated_at), updated_at)
+
+
+@async_jwt_required
+@require_http_methods(['POST'])
+async def task_mark_complete(request, pk):
+    """Marquer une tâche comme terminée"""
+    return await _set_done(request, pk, True, 'Tâche terminée')
+
+
+@async_jwt_required
+@require_http_methods(['POST'])
+async def task_mark_pending(request, pk):
+    """Marquer une tâche comme en attente"""
+    return await _set_done(request, pk, False, 'Tâche en attente')
+
+
+def _format_event(event):
+    return f"data: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def _event_stream(subscription):
+    try:
+        # Délai de reconnexion d'EventSource ; à la reconnexion, le client recharge
+        # sa page ou rattrape son retard via /api/tasks/changes/
+        yield f"retry: {settings.TASK_EVENTS_RETRY_MS}\n\n"
+        yield _format_event({'type': 'ready'})
+        while True:
+            event = await subscription.get(timeout=settings.TASK_EVENTS_HEARTBEAT)
+            # Commentaire SSE : garde la connexion ouverte à travers les proxys
+            yield ': ping\n\n' if event is None else _format_event(event)
+    finally:
+        subscription.close()
+
+
+@async_jwt_required(authentication_class=QueryTokenJWTAuthentication)
+@require_http_methods(['GET'])
+async def task_events(request):
+    """
+    Flux server-sent events des changements de tâches de l'utilisateur
+    (de toutes les tâches pour un admin). Voir todolist_app.events.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Sous WSGI, le flux sans fin bloquerait un worker : SSE réservé à l'ASGI
+        return JsonResponse({'detail': "Flux d'événements disponible uniquement sous ASGI."}, status=503)
+    subscription = get_broker().subscribe(subscription_channels(request.user))
+    response = StreamingHttpResponse(_event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
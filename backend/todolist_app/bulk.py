@@ -0,0 +1,83 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import TaskList
+from .events import publish_upsert
+from .response_cache import bump_versions
+from .stats import invalidate_stats
+
+# Nombre maximal d'opérations acceptées par lot
+BULK_MAX_OPERATIONS = 500
+
+
+def apply_bulk_operations(queryset, user, operations):
+    """
+    Exécute un lot d'opérations validées dans une seule transaction.
+
+    `queryset` porte les règles de visibilité de TaskViewSet.get_queryset :
+    un id hors de ce périmètre est signalé 'not_found' et n'est pas modifié.
+    Les créations passent par bulk_create, les modifications et suppressions
+    par des UPDATE/DELETE ensemblistes. Retourne un résultat par opération,
+    dans l'ordre reçu.
+    """
+    results = [None] * len(operations)
+    now = timezone.now()
+    target_ids = [op['id'] for op in operations if op['op'] != 'create']
+
+    with transaction.atomic():
+        owners = dict(queryset.filter(id__in=target_ids).values_list('id', 'gestionnaire_id'))
+
+        creates = [(index, op) for index, op in enumerate(operations) if op['op'] == 'create']
+        created = []
+        if creates:
+            created = TaskList.objects.bulk_create([
+                TaskList(gestionnaire=user, task=op['task'], done=op.get('done', False))
+                for _, op in creates
+            ])
+            for (index, op), task in zip(creates, created):
+                results[index] = {'index': index, 'op': 'create', 'id': task.id, 'status': 'created'}
+
+        # Les mises à jour sont regroupées par ensemble de champs modifiés
+        updates = defaultdict(list)
+        toggles, deletes = [], []
+        for index, op in enumerate(operations):
+            if op['op'] == 'create':
+                continue
+            result = {'index': index, 'op': op['op'], 'id': op['id']}
+            results[index] = result
+            if op['id'] not in owners:
+                result['status'] = 'not_found'
+                continue
+            if op['op'] == 'update':
+                fields = tuple(field for field in ('task', 'done') if field in op)
+                updates[fields].append(
+                    TaskList(id=op['id'], updated_at=now, **{field: op[field] for field in fields})
+                )
+                result['status'] = 'updated'
+            elif op['op'] == 'toggle':
+                toggles.append(op['id'])
+                result['status'] = 'toggled'
+            else:
+                deletes.append(op['id'])
+                result['status'] = 'deleted'
+
+        for fields, tasks in updates.items():
+            TaskList.objects.bulk_update(tasks, [*fields, 'updated_at'])
+        if toggles:
+            TaskList.objects.filter(id__in=toggles).update(done=~F('done'), updated_at=now)
+        if deletes:
+            # delete() émet post_delete : tombstones, compteurs, événements et cache y sont tenus à jour
+            TaskList.objects.filter(id__in=deletes).delete()
+
+        # bulk_create / bulk_update / update() n'émettent pas de signal
+        changed = [task.id for tasks in updates.values() for task in tasks] + toggles
+        touched = {owners[task_id] for task_id in changed} | ({user.pk} if created else set())
+        if touched:
+            invalidate_stats(*touched)
+            bump_versions(*touched)
+        publish_upsert([*created, *TaskList.objects.filter(id__in=changed).select_related('gestionnaire')])
+
+    return results
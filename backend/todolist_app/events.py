@@ -0,0 +1,232 @@
+"""
+Flux des changements de tâches, poussé aux clients en server-sent events
+(voir async_views.task_events).
+
+Les écritures publient des diffs compacts, une fois la transaction validée :
+
+    {"type": "upsert", "tasks": [<TaskSerializer>, ...]}
+    {"type": "update", "ids": [...], "changes": {"done": true, ...}}
+    {"type": "delete", "ids": [...]}
+    {"type": "refresh"}   # trop de changements : recharger la liste
+
+Chaque événement part sur le canal du gestionnaire de la tâche et sur le
+canal ALL_USERS (écouté par les admins, qui voient toutes les tâches).
+
+Le broker est choisi par TASK_EVENTS_BACKEND : LocalBroker diffuse en
+mémoire aux connexions du processus, CacheBroker passe par le cache
+partagé (Redis, Memcached...) pour servir plusieurs workers.
+"""
+import asyncio
+import multiprocessing
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .stats import ALL_USERS
+
+# Événements en attente par connexion ; au-delà, le client doit recharger
+SUBSCRIPTION_QUEUE_SIZE = 100
+REFRESH = {'type': 'refresh'}
+
+
+class LocalSubscription:
+    def __init__(self, broker, channels):
+        self.broker = broker
+        self.channels = channels
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(SUBSCRIPTION_QUEUE_SIZE)
+        self.overflow = False
+
+    def push(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflow = True
+
+    async def get(self, timeout):
+        """Prochain événement, ou None si rien n'arrive avant `timeout` secondes"""
+        if self.overflow:
+            self.overflow = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return REFRESH
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """Diffusion en mémoire, limitée aux connexions du processus courant"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, channels):
+        """À appeler depuis la boucle asyncio qui lira les événements"""
+        subscription = LocalSubscription(self, channels)
+        with self.lock:
+            for channel in channels:
+                self.subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions[channel].discard(subscription)
+                if not self.subscriptions[channel]:
+                    del self.subscriptions[channel]
+
+    def publish(self, channel, event):
+        # Appelé depuis n'importe quel thread : on repasse par la boucle de l'abonné
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+            except RuntimeError:
+                # Boucle déjà fermée : la connexion est partie
+                self.unsubscribe(subscription)
+
+
+class CacheSubscription:
+    def __init__(self, broker, channels):
+        self.broker = broker
+        self.channels = channels
+        self.positions = None
+        self.pending = []
+
+    async def get(self, timeout):
+        cache = self.broker.cache
+        if self.positions is None:
+            self.positions = {
+                channel: await cache.aget(self.broker.sequence_key(channel), 0) for channel in self.channels
+            }
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.pending:
+            for channel, position in self.positions.items():
+                latest = await cache.aget(self.broker.sequence_key(channel), 0)
+                if latest <= position:
+                    continue
+                if latest - position > SUBSCRIPTION_QUEUE_SIZE:
+                    self.pending.append(REFRESH)
+                else:
+                    keys = [self.broker.event_key(channel, seq) for seq in range(position + 1, latest + 1)]
+                    events = await cache.aget_many(keys)
+                    # Un événement expiré ou perdu : le client doit recharger
+                    self.pending.extend(events[key] if key in events else REFRESH for key in keys)
+                self.positions[channel] = latest
+            if self.pending:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(self.broker.poll_interval, remaining))
+        return self.pending.pop(0)
+
+    def close(self):
+        self.pending.clear()
+
+
+class CacheBroker:
+    """
+    Diffusion via le cache partagé, pour plusieurs workers : chaque canal a un
+    compteur de séquence, les événements sont gardés `ttl` secondes et chaque
+    connexion interroge le compteur toutes les `poll_interval` secondes.
+    """
+
+    def __init__(self, alias='default', ttl=60, poll_interval=0.5):
+        self.cache = caches[alias]
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+
+    @staticmethod
+    def sequence_key(channel):
+        return f"events:tasks:{channel}:seq"
+
+    @staticmethod
+    def event_key(channel, seq):
+        return f"events:tasks:{channel}:{seq}"
+
+    def subscribe(self, channels):
+        return CacheSubscription(self, channels)
+
+    def publish(self, channel, event):
+        key = self.sequence_key(channel)
+        self.cache.add(key, 0, None)
+        seq = self.cache.incr(key)
+        self.cache.set(self.event_key(channel, seq), event, self.ttl)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    backend = settings.TASK_EVENTS_BACKEND
+    return import_string(backend['BACKEND'])(**backend.get('OPTIONS', {}))
+
+
+def check_worker_broker():
+    """
+    Appelé au démarrage de chaque worker ASGI. `uvicorn --workers N` lance des
+    processus fils sans passer par WEB_CONCURRENCY (vérifié dans les
+    réglages) : le broker doit alors être partagé. Ignoré en DEBUG, où
+    `--reload` lance lui aussi le serveur dans un processus fils.
+    """
+    if settings.DEBUG or multiprocessing.parent_process() is None:
+        return
+    broker = get_broker()
+    if isinstance(broker, LocalBroker):
+        raise ImproperlyConfigured(
+            "TASK_EVENTS_BACKEND : LocalBroker ne sert qu'un processus, utilisez "
+            "todolist_app.events.CacheBroker avec plusieurs workers"
+        )
+    if isinstance(broker, CacheBroker) and isinstance(broker.cache, (LocMemCache, DummyCache)):
+        raise ImproperlyConfigured("CacheBroker : cache partagé (redis://, memcached://) requis avec plusieurs workers")
+
+
+def subscription_channels(user):
+    return [ALL_USERS] if user.is_staff else [user.pk]
+
+
+def publish(owner_id, event):
+    """Publie `event` pour le gestionnaire `owner_id` une fois la transaction validée"""
+    def send():
+        broker = get_broker()
+        for channel in (owner_id, ALL_USERS):
+            broker.publish(channel, event)
+    transaction.on_commit(send)
+
+
+def publish_upsert(tasks):
+    """Tâches créées ou modifiées, regroupées par gestionnaire"""
+    from .serializers import TaskSerializer
+
+    by_owner = defaultdict(list)
+    for task in tasks:
+        by_owner[task.gestionnaire_id].append(task)
+    for owner_id, owned in by_owner.items():
+        publish(owner_id, {'type': 'upsert', 'tasks': TaskSerializer(owned, many=True).data})
+
+
+def publish_update(owner_id, ids, **changes):
+    publish(owner_id, {'type': 'update', 'ids': list(ids), 'changes': changes})
+
+
+def publish_delete(owner_id, ids):
+    publish(owner_id, {'type': 'delete', 'ids': list(ids)})
+
+
+def publish_refresh(owner_id):
+    publish(owner_id, REFRESH)
@@ -0,0 +1,95 @@
+import csv
+import json
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+EXPORT_FIELDS = ('id', 'task', 'done', 'priority', 'due_at', 'gestionnaire', 'created_at', 'updated_at')
+EXPORT_COLUMNS = ('id', 'task', 'done', 'priority', 'due_at', 'gestionnaire__username', 'created_at', 'updated_at')
+# Lignes lues par aller-retour avec le curseur côté serveur
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Sert à la négociation (?format=csv|ndjson) ; les données sont envoyées en
+    streaming par la vue. Seules les réponses d'erreur passent par render().
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class ExportFilterError(ValueError):
+    pass
+
+
+def _parse_bound(value, end_of_day=False):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ExportFilterError(value)
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_export(queryset, params):
+    """Filtres optionnels : done=true|false, created_after, created_before (date ou date-heure ISO)"""
+    done = params.get('done')
+    if done is not None:
+        if done.lower() not in ('true', 'false', '1', '0'):
+            raise ExportFilterError(done)
+        queryset = queryset.filter(done=done.lower() in ('true', '1'))
+    if params.get('created_after'):
+        queryset = queryset.filter(created_at__gte=_parse_bound(params['created_after']))
+    if params.get('created_before'):
+        queryset = queryset.filter(created_at__lte=_parse_bound(params['created_before'], end_of_day=True))
+    return queryset
+
+
+def export_rows(queryset):
+    """Tuples bruts (pas d'instances de modèle), lus par blocs via un curseur côté serveur"""
+    return queryset.values_list(*EXPORT_COLUMNS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for task_id, task, done, priority, due_at, username, created_at, updated_at in rows:
+        yield writer.writerow((
+            task_id, task, done, priority, due_at.isoformat() if due_at else '', username,
+            created_at.isoformat(), updated_at.isoformat(),
+        ))
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
@@ -0,0 +1,173 @@
+import csv
+import itertools
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .events import publish_refresh
+from .models import TaskImport, TaskList
+from .response_cache import bump_versions
+from .stats import invalidate_stats
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_BATCH_SIZE = 5000
+# Au-delà, les erreurs sont comptées mais plus détaillées
+MAX_REPORTED_ERRORS = 1000
+
+TASK_MAX_LENGTH = TaskList._meta.get_field('task').max_length
+TRUE_VALUES = {'true', '1', 'yes', 'oui'}
+FALSE_VALUES = {'false', '0', 'no', 'non', ''}
+PRIORITIES = {value for value, _ in TaskList.PRIORITY_CHOICES}
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _decoded(lines):
+    for line in lines:
+        yield line.decode('utf-8') if isinstance(line, bytes) else line
+
+
+def parse_csv(lines):
+    """
+    (numéro de ligne, ligne, erreurs) ; l'en-tête est lu immédiatement
+    et doit contenir une colonne task.
+    """
+    reader = csv.DictReader(_decoded(lines))
+    try:
+        fields = reader.fieldnames
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(str(e))
+    if not fields or 'task' not in fields:
+        raise ImportFormatError("L'en-tête CSV doit contenir une colonne « task ».")
+    return _csv_rows(reader)
+
+
+def _csv_rows(reader):
+    number = 0
+    while True:
+        number += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except (UnicodeDecodeError, csv.Error) as e:
+            yield number, None, {'__all__': [str(e)]}
+            continue
+        yield number, row, None
+
+
+def parse_ndjson(lines):
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except (UnicodeDecodeError, ValueError) as e:
+            yield number, None, {'__all__': [f"JSON invalide : {e}"]}
+            continue
+        if not isinstance(row, dict):
+            yield number, None, {'__all__': ["Un objet JSON est attendu."]}
+            continue
+        yield number, row, None
+
+
+PARSERS = {
+    'csv': parse_csv,
+    'ndjson': parse_ndjson,
+}
+
+
+def clean_row(row):
+    """Validation légère (sans TaskSerializer) : renvoie (valeurs, None) ou (None, erreurs)"""
+    errors = {}
+    task = row.get('task')
+    if not isinstance(task, str) or not task.strip():
+        errors['task'] = ["Ce champ est obligatoire."]
+    elif len(task) > TASK_MAX_LENGTH:
+        errors['task'] = [f"Au plus {TASK_MAX_LENGTH} caractères."]
+
+    done = row.get('done', False)
+    if isinstance(done, str):
+        value = done.strip().lower()
+        if value in TRUE_VALUES:
+            done = True
+        elif value in FALSE_VALUES:
+            done = False
+    if not isinstance(done, bool):
+        errors['done'] = ["Valeur booléenne attendue."]
+
+    # Colonnes optionnelles : vides ou absentes, valeurs par défaut du modèle
+    priority = row.get('priority')
+    if priority in (None, ''):
+        priority = TaskList.PRIORITY_NORMAL
+    elif isinstance(priority, str) and priority.strip().isdigit():
+        priority = int(priority)
+    if isinstance(priority, bool) or priority not in PRIORITIES:
+        errors['priority'] = ["Priorité invalide (1, 2 ou 3)."]
+
+    due_at = row.get('due_at') or None
+    if due_at is not None:
+        parsed = parse_datetime(due_at) if isinstance(due_at, str) else None
+        if parsed is None:
+            errors['due_at'] = ["Date-heure ISO 8601 attendue."]
+        else:
+            due_at = timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    if errors:
+        return None, errors
+    return {'task': task.strip(), 'done': done, 'priority': priority, 'due_at': due_at}, None
+
+
+def import_tasks(lines, import_format, user, batch_size=IMPORT_BATCH_SIZE, job=None):
+    """
+    Importe des tâches depuis un flux de lignes (CSV ou NDJSON) pour `user`.
+
+    Les lignes sont validées et insérées par lots (bulk_create). Chaque lot est
+    validé dans sa propre transaction, avec la progression du TaskImport : si
+    l'import est interrompu, le relancer avec le même `job` reprend après la
+    dernière ligne validée.
+    """
+    if import_format not in PARSERS:
+        raise ImportFormatError(f"Format inconnu : {import_format}")
+    rows = PARSERS[import_format](lines)
+    if job is None:
+        job = TaskImport.objects.create(gestionnaire=user, format=import_format)
+
+    # Reprise : les lignes déjà traitées sont relues mais pas réinsérées
+    rows = itertools.islice(rows, job.rows_processed, None)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        tasks, failures = [], []
+        for number, row, errors in batch:
+            values, errors = (None, errors) if errors else clean_row(row)
+            if errors:
+                failures.append({'row': number, 'errors': errors})
+            else:
+                tasks.append(TaskList(gestionnaire=user, **values))
+
+        with transaction.atomic():
+            TaskList.objects.bulk_create(tasks)
+            job.rows_processed += len(batch)
+            job.rows_imported += len(tasks)
+            job.rows_failed += len(failures)
+            job.errors.extend(failures[:max(0, MAX_REPORTED_ERRORS - len(job.errors))])
+            job.save(update_fields=['rows_processed', 'rows_imported', 'rows_failed', 'errors', 'updated_at'])
+            # bulk_create n'émet pas de signal
+            invalidate_stats(user.pk)
+            bump_versions(user.pk)
+
+    job.status = TaskImport.STATUS_COMPLETED
+    job.save(update_fields=['status', 'updated_at'])
+    if job.rows_imported:
+        # Une ligne d'événement par tâche importée serait plus lourde qu'un rechargement
+        publish_refresh(user.pk)
+    return job
@@ -0,0 +1,30 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todolist_app.archive import ARCHIVE_BATCH_SIZE, archive_tasks
+
+UNITS = {'d': 'days', 'h': 'hours', 'm': 'minutes'}
+
+
+def parse_age(value):
+    """« 90d », « 12h », « 30m » ; un nombre seul compte en jours"""
+    match = re.fullmatch(r'(\d+)([dhm]?)', value.strip())
+    if match is None:
+        raise CommandError(f"Durée invalide : {value} (ex. 90d, 12h, 30m)")
+    return timedelta(**{UNITS[match.group(2) or 'd']: int(match.group(1))})
+
+
+class Command(BaseCommand):
+    help = "Déplace les tâches terminées, non modifiées depuis --older-than, dans la table d'archive"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', default='90d', help="Âge minimal depuis la dernière modification (défaut : 90d)")
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size doit être positif.")
+        archived = archive_tasks(parse_age(options['older_than']), options['batch_size'])
+        self.stdout.write(f"{archived} tâche(s) archivée(s).")
@@ -0,0 +1,50 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from todolist_app.importer import IMPORT_BATCH_SIZE, IMPORT_FORMATS, ImportFormatError, import_tasks
+from todolist_app.models import TaskImport
+
+
+class Command(BaseCommand):
+    help = "Importe des tâches depuis un fichier CSV ou NDJSON (« - » pour l'entrée standard)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help="Nom de l'utilisateur propriétaire des tâches")
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="Déduit de l'extension par défaut")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--resume', type=int, metavar='IMPORT_ID', help="Reprendre un import interrompu")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"Utilisateur inconnu : {options['user']}")
+
+        import_format = options['format'] or options['path'].rsplit('.', 1)[-1].lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError("Format inconnu, utilisez --format csv|ndjson.")
+
+        job = None
+        if options['resume']:
+            job = TaskImport.objects.filter(pk=options['resume'], gestionnaire=user).first()
+            if job is None:
+                raise CommandError(f"Import introuvable : {options['resume']}")
+
+        stream = sys.stdin.buffer if options['path'] == '-' else open(options['path'], 'rb')
+        try:
+            job = import_tasks(stream, import_format, user, options['batch_size'], job)
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        self.stdout.write(
+            f"Import {job.id} : {job.rows_imported} tâche(s) importée(s), "
+            f"{job.rows_failed} ligne(s) en erreur sur {job.rows_processed}."
+        )
+        for failure in job.errors[:20]:
+            self.stdout.write(f"  ligne {failure['row']} : {failure['errors']}")
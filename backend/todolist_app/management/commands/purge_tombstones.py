@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from todolist_app.models import TaskTombstone
+from todolist_app.sync import TOMBSTONE_RETENTION
+
+
+class Command(BaseCommand):
+    help = "Supprime les tombstones plus anciennes que la durée de rétention de la synchronisation"
+
+    def handle(self, *args, **options):
+        deleted, _ = TaskTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+        self.stdout.write(f"{deleted} tombstone(s) supprimée(s).")
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from todolist_app.outbox import deliver_outbox, OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails en attente dans l'outbox (formulaire de contact)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument('--max-attempts', type=int, default=OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true', help="Tourner en continu (worker)")
+        parser.add_argument('--interval', type=float, default=5.0, help="Pause en secondes quand l'outbox est vide")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_outbox(options['batch_size'], options['max_attempts'])
+            if sent or failed:
+                self.stdout.write(f"{sent} email(s) envoyé(s), {failed} échec(s).")
+            if not options['loop']:
+                break
+            # On enchaîne les lots tant que l'outbox n'est pas vide
+            if sent + failed < options['batch_size']:
+                time.sleep(options['interval'])
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todolist_app', '0004_rename_manage_tasklist_gestionnaire'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['gestionnaire', '-created_at', '-id'], name='task_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['-created_at', '-id'], name='task_created_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+FTS_TABLE = 'todolist_app_tasklist_fts'
+TABLE = 'todolist_app_tasklist'
+
+# Sous SQLite, l'ajout d'une colonne NOT NULL reconstruit la table et supprime
+# ses triggers : ceux de l'index plein texte (0008) sont recréés
+SQLITE_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, task) VALUES (new.id, new.task); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, task) VALUES ('delete', old.id, old.task); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF task ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, task) VALUES ('delete', old.id, old.task); "
+    f"INSERT INTO {FTS_TABLE}(rowid, task) VALUES (new.id, new.task); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def restore_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todolist_app', '0009_taskimport'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # En retour arrière, la suppression des colonnes reconstruit aussi la table
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.AddField(
+            model_name='tasklist',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tasklist',
+            name='priority',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Basse'), (2, 'Normale'), (3, 'Haute')], default=2),
+        ),
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['gestionnaire', 'done', 'due_at'], name='task_owner_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['gestionnaire', 'priority'], name='task_owner_priority_idx'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 20:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todolist_app', '0010_tasklist_priority_due_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('task', models.CharField(max_length=200)),
+                ('done', models.BooleanField(default=True)),
+                ('priority', models.PositiveSmallIntegerField(choices=[(1, 'Basse'), (2, 'Normale'), (3, 'Haute')], default=2)),
+                ('due_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('gestionnaire', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['gestionnaire', '-created_at', '-id'], name='archived_owner_created_idx'), models.Index(fields=['-created_at', '-id'], name='archived_created_idx')],
+            },
+        ),
+    ]
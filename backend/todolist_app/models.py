@@ -1,18 +1,154 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+class TaskListQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Les admins voient toutes les tâches, les utilisateurs seulement les leurs"""
+        return self if user.is_staff else self.filter(gestionnaire=user)
+
 
 class TaskList(models.Model):
+    PRIORITY_LOW = 1
+    PRIORITY_NORMAL = 2
+    PRIORITY_HIGH = 3
+    PRIORITY_CHOICES = [
+        (PRIORITY_LOW, 'Basse'),
+        (PRIORITY_NORMAL, 'Normale'),
+        (PRIORITY_HIGH, 'Haute'),
+    ]
+
     id = models.AutoField(primary_key=True)
     gestionnaire = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tasks")
     task = models.CharField(max_length=200)
     done = models.BooleanField(default=False)
+    priority = models.PositiveSmallIntegerField(choices=PRIORITY_CHOICES, default=PRIORITY_NORMAL)
+    due_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskListQuerySet.as_manager()
+
     class Meta:
         ordering = ['id']
+        indexes = [
+            # Pagination par curseur : listes par utilisateur et liste globale (admin)
+            models.Index(fields=['gestionnaire', '-created_at', '-id'], name='task_owner_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='task_created_idx'),
+            # Synchronisation incrémentale (/api/tasks/changes/)
+            models.Index(fields=['gestionnaire', 'updated_at', 'id'], name='task_owner_updated_idx'),
+            models.Index(fields=['updated_at', 'id'], name='task_updated_idx'),
+            # Agenda : plages d'échéance parmi les tâches en attente, sans parcourir les terminées
+            models.Index(fields=['gestionnaire', 'done', 'due_at'], name='task_owner_due_idx'),
+            models.Index(fields=['gestionnaire', 'priority'], name='task_owner_priority_idx'),
+        ]
 
     def __str__(self):
         status = "Terminée" if self.done else "En attente"
         return f"{self.task} - {status}"
 
+
+
+class ArchivedTask(models.Model):
+    """
+    Tâche terminée déplacée hors de TaskList par `manage.py archive_tasks`.
+    Même id que la tâche d'origine ; lecture seule (?include_archived=1, admin).
+    """
+    id = models.IntegerField(primary_key=True)
+    gestionnaire = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_tasks")
+    task = models.CharField(max_length=200)
+    done = models.BooleanField(default=True)
+    priority = models.PositiveSmallIntegerField(choices=TaskList.PRIORITY_CHOICES, default=TaskList.PRIORITY_NORMAL)
+    due_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    objects = TaskListQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Même ordre que les listes de tâches, pour ?include_archived=1
+            models.Index(fields=['gestionnaire', '-created_at', '-id'], name='archived_owner_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='archived_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task} - Archivée"
+
+
+class TaskTombstone(models.Model):
+    """Trace d'une tâche supprimée, pour que la synchronisation incrémentale la signale"""
+    task_id = models.IntegerField()
+    gestionnaire = models.ForeignKey(User, on_delete=models.CASCADE, related_name="task_tombstones")
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['gestionnaire', 'deleted_at'], name='tombstone_owner_deleted_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"Tâche {self.task_id} supprimée"
+
+
+class TaskImport(models.Model):
+    """Suivi d'un import de tâches ; rows_processed permet de reprendre un import interrompu"""
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'En cours'),
+        (STATUS_COMPLETED, 'Terminé'),
+    ]
+
+    gestionnaire = models.ForeignKey(User, on_delete=models.CASCADE, related_name="task_imports")
+    format = models.CharField(max_length=10)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_imported = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Import {self.id} - {self.get_status_display()}"
+
+
+class EmailOutbox(models.Model):
+    """File d'attente des emails (formulaire de contact), vidée par `manage.py send_outbox`"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_SENT, 'Envoyé'),
+        (STATUS_FAILED, 'Échec'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    reply_to = models.CharField(max_length=254, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} - {self.get_status_display()}"
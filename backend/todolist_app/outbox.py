@@ -0,0 +1,104 @@
+import logging
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 5
+# Délai avant la première relance, doublé à chaque échec
+OUTBOX_RETRY_BASE = timedelta(seconds=30)
+
+
+def enqueue_email(subject, body, from_email, to, reply_to=''):
+    """Enregistre un email dans l'outbox ; il sera envoyé par le worker"""
+    return EmailOutbox.objects.create(
+        subject=subject, body=body, from_email=from_email, to=list(to), reply_to=reply_to
+    )
+
+
+def retry_delay(attempts):
+    return OUTBOX_RETRY_BASE * (2 ** (attempts - 1))
+
+
+def claim_batch(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Réserve un lot d'emails à envoyer.
+    SKIP LOCKED (PostgreSQL) permet de faire tourner plusieurs workers en parallèle ;
+    la réservation repousse next_attempt_at pour qu'un worker arrêté en cours de lot
+    ne bloque pas ses messages indéfiniment.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        EmailOutbox.objects.filter(id__in=ids).update(next_attempt_at=now + OUTBOX_RETRY_BASE)
+    return list(EmailOutbox.objects.filter(id__in=ids).order_by('id'))
+
+
+def deliver_outbox(batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS, connection=None):
+    """
+    Envoie un lot d'emails en attente sur une seule connexion SMTP réutilisée.
+    Un échec incrémente `attempts` et replanifie l'envoi (backoff exponentiel) ;
+    au-delà de `max_attempts` le message passe en échec définitif.
+    Retourne (envoyés, échecs).
+    """
+    messages = claim_batch(batch_size)
+    if not messages:
+        return 0, 0
+
+    sent = failed = 0
+    connection = connection or get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # Serveur SMTP injoignable : tout le lot est replanifié
+        for message in messages:
+            _record_failure(message, e, max_attempts)
+        return 0, len(messages)
+
+    try:
+        for message in messages:
+            email = EmailMessage(
+                message.subject,
+                message.body,
+                message.from_email,
+                message.to,
+                reply_to=[message.reply_to] if message.reply_to else None,
+                connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as e:
+                _record_failure(message, e, max_attempts)
+                failed += 1
+            else:
+                message.attempts += 1
+                message.status = EmailOutbox.STATUS_SENT
+                message.sent_at = timezone.now()
+                message.last_error = ''
+                message.save(update_fields=['attempts', 'last_error', 'status', 'sent_at'])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _record_failure(message, error, max_attempts):
+    logger.warning("Échec d'envoi de l'email %s : %s", message.id, error)
+    message.attempts += 1
+    message.last_error = str(error)
+    if message.attempts >= max_attempts:
+        message.status = EmailOutbox.STATUS_FAILED
+    else:
+        message.next_attempt_at = timezone.now() + retry_delay(message.attempts)
+    message.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
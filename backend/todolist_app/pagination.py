@@ -0,0 +1,58 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+# Au-delà de ce nombre de lignes (estimé), l'admin n'effectue plus de COUNT(*) exact
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class TaskCursorPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) pour les tâches.
+    Pas de COUNT(*) ni d'OFFSET : chaque page cherche directement
+    dans l'index (gestionnaire, created_at, id).
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+# Valeur du paramètre ?pagination= qui active le mode curseur
+PAGINATION_QUERY_PARAM = 'pagination'
+
+
+def get_pagination_class(request, default=PageNumberPagination, cursor_class=TaskCursorPagination):
+    """Choisit la classe de pagination selon ?pagination=page|cursor"""
+    mode = request.query_params.get(PAGINATION_QUERY_PARAM) if request else None
+    return {'page': PageNumberPagination, 'cursor': cursor_class}.get(mode, default)
+
+
+def estimated_count(model, using='default'):
+    """
+    Nombre de lignes estimé par les statistiques de PostgreSQL (pg_class.reltuples),
+    sans parcourir la table. None sur un autre moteur ou si la table n'a jamais
+    été analysée.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator de l'admin : sur une liste non filtrée d'une grande table, le
+    total affiché est l'estimation de PostgreSQL au lieu d'un COUNT(*) complet.
+    """
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model, using=queryset.db)
+            if estimate is not None and estimate > ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
@@ -0,0 +1,104 @@
+"""
+Cache des réponses GET /api/tasks/ (liste et détail), par utilisateur.
+
+Chaque gestionnaire a un numéro de version ; les admins, qui voient toutes
+les tâches, suivent la version ALL_USERS. Les écritures (signaux,
+update_done, bulk, import) changent la version du gestionnaire et celle
+d'ALL_USERS, immédiatement puis à la validation de la transaction : les
+anciennes entrées ne sont plus lues et expirent d'elles-mêmes
+(TASK_RESPONSE_CACHE_TTL).
+
+Les versions doivent être partagées par tous les workers : avec un cache
+par processus (locmem, dummy), le cache des réponses est contourné, sauf
+TASK_RESPONSE_CACHE_LOCAL (un seul processus, tests). Une réponse lue sur
+la réplique n'est pas mise en cache : une réplique en retard y remettrait
+l'état d'avant l'écriture, sous la nouvelle version.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from complice_taches.db_routing import reading_from_replica
+from complice_taches.metrics import registry
+
+from .stats import ALL_USERS
+
+CACHE_COUNTER = 'taskflow_response_cache_total'
+# Backends propres à chaque processus
+LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+
+def _version_key(owner):
+    return f"tasks:responses:{owner}:version"
+
+
+def _initial_version():
+    # Si le compteur a été évincé, on repart d'une valeur jamais utilisée
+    return time.time_ns() // 1000
+
+
+def get_version(owner):
+    key = _version_key(owner)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(owners):
+    for owner in owners:
+        try:
+            cache.incr(_version_key(owner))
+        except ValueError:
+            cache.set(_version_key(owner), _initial_version(), None)
+
+
+def bump_versions(*owners):
+    """Rend obsolètes les réponses en cache des gestionnaires `owners` (et des admins)"""
+    owners = {*owners, ALL_USERS}
+    _bump(owners)
+    if transaction.get_connection().in_atomic_block:
+        # Une lecture concurrente a pu remettre en cache l'état d'avant la validation
+        transaction.on_commit(lambda: _bump(owners))
+
+
+def enabled():
+    return settings.TASK_RESPONSE_CACHE_LOCAL or not isinstance(caches['default'], LOCAL_CACHE_BACKENDS)
+
+
+def response_key(request, view):
+    """
+    Clé de la réponse : utilisateur, version, route et paramètres. La version
+    est lue avant le calcul de la réponse, pour qu'une écriture concurrente
+    ne puisse pas laisser une réponse périmée sous la nouvelle version.
+    None si le cache des réponses est contourné.
+    """
+    if not enabled():
+        return None
+    user = request.user
+    version = get_version(ALL_USERS if user.is_staff else user.pk)
+    params = sorted(request.query_params.lists())
+    # L'hôte fait partie de la clé : les liens next/previous sont absolus
+    raw = f"{request.get_host()}{request.path}?{params}"
+    return f"tasks:responses:{user.pk}:{version}:{view}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def get_response(key, view):
+    """(données, ETag, Last-Modified) en cache, ou None"""
+    if key is None:
+        return None
+    cached = cache.get(key)
+    registry.increment(CACHE_COUNTER, view=view, result='miss' if cached is None else 'hit')
+    return cached
+
+
+def set_response(key, data, etag, last_modified):
+    if key is None or reading_from_replica():
+        return
+    cache.set(key, (data, etag, last_modified), settings.TASK_RESPONSE_CACHE_TTL)
@@ -0,0 +1,69 @@
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import TaskList
+
+# Table FTS5 (SQLite) tenue à jour par des triggers, voir la migration 0008
+FTS_TABLE = 'todolist_app_tasklist_fts'
+SEARCH_CONFIG = 'simple'
+MAX_SEARCH_TERMS = 10
+TERM_RE = re.compile(r'\w+')
+
+
+def search_terms(query):
+    return TERM_RE.findall(query)[:MAX_SEARCH_TERMS]
+
+
+def search_tasks(queryset, query, ranked=True):
+    """
+    Recherche plein texte sur le libellé des tâches, via l'index de la base :
+    tsvector + GIN sous PostgreSQL, table FTS5 sous SQLite.
+    Tous les termes doivent correspondre (en préfixe). Avec `ranked`, les
+    résultats sont annotés `rank` (plus grand = plus pertinent) et triés.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return _search_postgresql(queryset, terms, ranked)
+    if vendor == 'sqlite':
+        return _search_sqlite(queryset, terms, ranked)
+
+    # Autres bases : pas d'index plein texte, simple filtre icontains
+    condition = Q()
+    for term in terms:
+        condition &= Q(task__icontains=term)
+    return queryset.filter(condition)
+
+
+def _search_postgresql(queryset, terms, ranked):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    # Même expression que l'index GIN task_search_idx, pour qu'il soit utilisé
+    vector = SearchVector('task', config=SEARCH_CONFIG)
+    tsquery = SearchQuery(' & '.join(f"{term}:*" for term in terms), search_type='raw', config=SEARCH_CONFIG)
+    queryset = queryset.annotate(search=vector).filter(search=tsquery)
+    if ranked:
+        queryset = queryset.annotate(rank=SearchRank(vector, tsquery)).order_by('-rank', '-id')
+    return queryset
+
+
+def _search_sqlite(queryset, terms, ranked):
+    match = ' '.join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+    queryset = queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+    )
+    if ranked:
+        # rank FTS5 (bm25) : plus petit = plus pertinent, on l'inverse
+        table = TaskList._meta.db_table
+        rank = RawSQL(
+            f'SELECT -rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = "{table}"."id"',
+            (match,),
+        )
+        queryset = queryset.annotate(rank=rank).order_by('-rank', '-id')
+    return queryset
@@ -1,13 +1,50 @@
 from rest_framework import serializers
-from .models import TaskList
+from .models import ArchivedTask, TaskList, TaskImport
 
 class TaskSerializer(serializers.ModelSerializer):
     gestionnaire = serializers.CharField(source='gestionnaire.username', read_only=True)
 
     class Meta:
         model = TaskList
-        fields = ['id', 'task', 'done', 'gestionnaire']
-        read_only_fields = ['gestionnaire']
+        fields = ['id', 'task', 'done', 'priority', 'due_at', 'gestionnaire', 'created_at', 'updated_at']
+        read_only_fields = ['gestionnaire', 'created_at', 'updated_at']
+
+
+class ArchivedTaskSerializer(TaskSerializer):
+    """Tâche archivée (?include_archived=1) : mêmes champs, plus archived_at"""
+    class Meta(TaskSerializer.Meta):
+        model = ArchivedTask
+        fields = TaskSerializer.Meta.fields + ['archived_at']
+        read_only_fields = fields
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    """Une opération du lot /api/tasks/bulk/"""
+    OPERATIONS = ('create', 'update', 'delete', 'toggle')
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.IntegerField(required=False)
+    task = serializers.CharField(max_length=200, required=False)
+    done = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        op = attrs['op']
+        if op == 'create':
+            if 'task' not in attrs:
+                raise serializers.ValidationError({'task': "Ce champ est obligatoire."})
+            attrs.pop('id', None)
+        elif 'id' not in attrs:
+            raise serializers.ValidationError({'id': "Ce champ est obligatoire."})
+        if op == 'update' and 'task' not in attrs and 'done' not in attrs:
+            raise serializers.ValidationError("Aucun champ à modifier.")
+        return attrs
+
+
+class TaskImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskImport
+        fields = ['id', 'format', 'status', 'rows_processed', 'rows_imported', 'rows_failed', 'errors']
+        read_only_fields = fields
 
 
 class ContactSerializer(serializers.Serializer):
@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .events import publish_delete, publish_upsert
+from .models import TaskList, TaskTombstone
+from .response_cache import bump_versions
+from .stats import adjust_stats, invalidate_stats, task_deltas
+
+
+@receiver(post_init, sender=TaskList)
+def remember_initial_state(sender, instance, **kwargs):
+    """Mémorise l'état chargé pour calculer les deltas des statistiques au save"""
+    if 'done' in instance.__dict__ and 'gestionnaire_id' in instance.__dict__:
+        instance._stats_state = (instance.gestionnaire_id, instance.done)
+
+
+@receiver(post_save, sender=TaskList)
+def update_stats_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_stats_state', None)
+    instance._stats_state = (instance.gestionnaire_id, instance.done)
+    bump_versions(instance.gestionnaire_id, *(previous[:1] if previous else ()))
+    if created:
+        adjust_stats(instance.gestionnaire_id, **task_deltas(instance))
+    elif previous is None or previous[0] != instance.gestionnaire_id:
+        invalidate_stats(instance.gestionnaire_id, *(previous[:1] if previous else ()))
+    elif previous[1] != instance.done:
+        delta = 1 if instance.done else -1
+        adjust_stats(instance.gestionnaire_id, done=delta, pending=-delta)
+
+
+@receiver(post_save, sender=TaskList)
+def publish_saved_task(sender, instance, **kwargs):
+    publish_upsert([instance])
+
+
+@receiver(post_delete, sender=TaskList)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    """Garde la trace des suppressions pour /api/tasks/changes/"""
+    if isinstance(origin, User):
+        # Suppression en cascade d'un utilisateur : ses tombstones partiraient avec lui
+        return
+    TaskTombstone.objects.create(task_id=instance.id, gestionnaire_id=instance.gestionnaire_id)
+    adjust_stats(instance.gestionnaire_id, **task_deltas(instance, sign=-1))
+    publish_delete(instance.gestionnaire_id, [instance.id])
+    bump_versions(instance.gestionnaire_id)
+
+
+@receiver(post_delete, sender=User)
+def drop_user_stats(sender, instance, **kwargs):
+    invalidate_stats(instance.pk)
+    bump_versions(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def refresh_cached_task_owner(sender, instance, created, update_fields=None, **kwargs):
+    """Le nom du gestionnaire figure dans les réponses de tâches en cache"""
+    if not created and (update_fields is None or 'username' in update_fields):
+        bump_versions(instance.pk)
@@ -0,0 +1,133 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import ArchivedTask, TaskList
+
+STATS_FIELDS = ('total', 'done', 'pending', 'created_this_week')
+# Les compteurs sont maintenus incrémentalement ; le TTL borne une éventuelle dérive
+STATS_TTL = 60 * 60
+ALL_USERS = 'all'
+UPDATE_BATCH_SIZE = 1000
+
+
+def week_start(now=None):
+    now = timezone.localtime(now or timezone.now())
+    monday = now - timedelta(days=now.weekday())
+    return monday.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _keys(owner, week):
+    # La semaine fait partie de la clé : un nouveau lundi repart d'un calcul complet
+    return {field: f"stats:tasks:{owner}:{week:%Y%m%d}:{field}" for field in STATS_FIELDS}
+
+
+def compute_stats(owner=ALL_USERS, week=None):
+    """Recalcule les compteurs par GROUP BY done, tâches archivées comprises"""
+    week = week or week_start()
+    stats = dict.fromkeys(STATS_FIELDS, 0)
+    for model in (TaskList, ArchivedTask):
+        queryset = model.objects.all() if owner == ALL_USERS else model.objects.filter(gestionnaire_id=owner)
+        rows = queryset.order_by().values('done').annotate(
+            count=Count('id'),
+            recent=Count('id', filter=Q(created_at__gte=week)),
+        )
+        for row in rows:
+            stats['total'] += row['count']
+            stats['done' if row['done'] else 'pending'] += row['count']
+            stats['created_this_week'] += row['recent']
+    return stats
+
+
+def get_stats(owner=ALL_USERS):
+    """Compteurs d'un utilisateur (ou de tous), depuis le cache si possible"""
+    week = week_start()
+    keys = _keys(owner, week)
+    cached = cache.get_many(keys.values())
+    if len(cached) == len(keys):
+        return {field: cached[key] for field, key in keys.items()}
+    stats = compute_stats(owner, week)
+    cache.set_many({keys[field]: stats[field] for field in STATS_FIELDS}, STATS_TTL)
+    return stats
+
+
+def _adjust(owner, deltas):
+    week = week_start()
+    for scope in (owner, ALL_USERS):
+        keys = _keys(scope, week)
+        try:
+            for field, delta in deltas.items():
+                if delta:
+                    cache.incr(keys[field], delta)
+        except ValueError:
+            # Entrée absente ou partiellement expirée : on la laisse se recalculer
+            cache.delete_many(list(keys.values()))
+
+
+def adjust_stats(owner, **deltas):
+    """Applique des deltas aux compteurs une fois la transaction validée"""
+    transaction.on_commit(lambda: _adjust(owner, deltas))
+
+
+def invalidate_stats(*owners):
+    def invalidate():
+        week = week_start()
+        for scope in (*owners, ALL_USERS):
+            cache.delete_many(list(_keys(scope, week).values()))
+    transaction.on_commit(invalidate)
+
+
+def task_deltas(task, sign=1):
+    """Contribution d'une tâche aux compteurs (sign=-1 pour la retirer)"""
+    return {
+        'total': sign,
+        'done': sign if task.done else 0,
+        'pending': 0 if task.done else sign,
+        'created_this_week': sign if task.created_at >= week_start() else 0,
+    }
+
+
+def update_done(queryset, done):
+    """
+    queryset.update(done=...) en tenant à jour les compteurs, le flux
+    d'événements et le cache des réponses, update() n'émettant pas de
+    signal post_save.
+    """
+    from .events import publish_update
+    from .response_cache import bump_versions
+
+    rows = list(queryset.order_by().values_list('id', 'gestionnaire_id', 'done'))
+    changes = defaultdict(list)
+    for task_id, owner_id, task_done in rows:
+        if task_done != done:
+            changes[owner_id].append(task_id)
+    now = timezone.now()
+    updated = queryset.update(done=done, updated_at=now)
+    for owner_id, ids in changes.items():
+        count = len(ids) if done else -len(ids)
+        adjust_stats(owner_id, done=count, pending=-count)
+        publish_update(owner_id, ids, done=done, updated_at=now)
+    # updated_at change aussi pour les tâches déjà dans l'état demandé
+    bump_versions(*{owner_id for _, owner_id, _ in rows})
+    return updated
+
+
+def update_done_in_batches(queryset, done, batch_size=UPDATE_BATCH_SIZE):
+    """
+    update_done par lots d'ids croissants, une transaction par lot : une
+    sélection de plusieurs millions de tâches n'est jamais chargée en mémoire
+    ni verrouillée d'un bloc. Les tâches déjà dans l'état demandé sont ignorées.
+    """
+    pending = queryset.filter(done=not done).order_by('pk')
+    last_id, updated = 0, 0
+    while True:
+        ids = list(pending.filter(pk__gt=last_id).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return updated
+        with transaction.atomic():
+            updated += update_done(TaskList.objects.filter(pk__in=ids, done=not done), done)
+        last_id = ids[-1]
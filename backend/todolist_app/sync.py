@@ -0,0 +1,125 @@
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, quote_etag
+
+from .models import TaskTombstone
+
+# Nombre maximal de tâches modifiées renvoyées par appel à /changes/
+SYNC_MAX_CHANGES = 500
+# Au-delà, les tombstones peuvent avoir été purgées : resynchronisation complète
+TOMBSTONE_RETENTION = timedelta(days=30)
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_sync_token(moment, last_id=0):
+    """Jeton opaque : horodatage en microsecondes, plus l'id de la dernière tâche renvoyée"""
+    micros = int(moment.timestamp() * 1_000_000)
+    return f"{micros}-{last_id}" if last_id else str(micros)
+
+
+def decode_sync_token(token):
+    try:
+        micros, _, last_id = token.partition('-')
+        moment = datetime.fromtimestamp(int(micros) / 1_000_000, tz=dt_timezone.utc)
+        return moment, int(last_id or 0)
+    except (ValueError, OverflowError, OSError):
+        raise InvalidSyncToken(token)
+
+
+def tombstones_for(user):
+    tombstones = TaskTombstone.objects.all()
+    if not user.is_staff:
+        tombstones = tombstones.filter(gestionnaire=user)
+    return tombstones
+
+
+def collect_changes(queryset, user, since, last_id=0, limit=SYNC_MAX_CHANGES):
+    """
+    Tâches créées ou modifiées et ids supprimés depuis (since, last_id).
+    Renvoie (tâches, ids supprimés, jeton suivant, has_more).
+    """
+    now = timezone.now()
+    changed = list(
+        queryset.filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=last_id))
+        .order_by('updated_at', 'id')[:limit + 1]
+    )
+    has_more = len(changed) > limit
+    if has_more:
+        changed = changed[:limit]
+        token = encode_sync_token(changed[-1].updated_at, changed[-1].id)
+    else:
+        token = encode_sync_token(now)
+
+    deleted = list(
+        tombstones_for(user).filter(deleted_at__gte=since)
+        .order_by('deleted_at').values_list('task_id', flat=True)
+    )
+    return changed, deleted, token, has_more
+
+
+def list_validators(tasks, request, total=None):
+    """
+    ETag d'une liste, calculé sur la page renvoyée : (id, updated_at) de ses
+    lignes, le total (pagination par page) et la dernière suppression, lue
+    dans l'index des tombstones. Aucun agrégat sur toutes les tâches. Pas de
+    Last-Modified : une page peut changer de lignes sans qu'aucune ne soit
+    plus récente.
+    """
+    last_deleted = tombstones_for(request.user).aggregate(last=Max('deleted_at'))['last']
+    rows = [(task._meta.model_name, task.pk, task.updated_at) for task in tasks]
+    raw = f"{request.user.pk}:{request.get_full_path()}:{total}:{last_deleted}:{rows}"
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def task_etag(pk, updated_at):
+    # Calcul entier : If-Match retrouve updated_at à la microseconde près
+    return quote_etag(f"{pk}-{(updated_at - EPOCH) // timedelta(microseconds=1)}")
+
+
+def detail_validators(task):
+    return task_etag(task.pk, task.updated_at), task.updated_at
+
+
+def if_match_versions(request, pk):
+    """
+    Valeurs de updated_at acceptées par If-Match (ETags de détail), None sans
+    en-tête ou avec « * ». Un ETag illisible ou d'une autre tâche n'apporte
+    aucune valeur : la condition échoue.
+    """
+    header = request.headers.get('If-Match')
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if etags == ['*']:
+        return None
+    versions = []
+    for etag in etags:
+        # Un ETag affaibli en route (compression) désigne la même version
+        task_id, _, micros = etag.removeprefix('W/').strip('"').partition('-')
+        if task_id == str(pk) and micros.isdigit():
+            versions.append(EPOCH + timedelta(microseconds=int(micros)))
+    return versions
+
+
+def not_modified_response(request, etag, last_modified):
+    """Réponse 304 si If-None-Match / If-Modified-Since correspondent, sinon None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
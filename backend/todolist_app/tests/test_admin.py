@@ -0,0 +1,89 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todolist_app import pagination, stats
+from todolist_app.admin import TaskListAdmin
+from todolist_app.models import TaskList
+from todolist_app.stats import compute_stats, get_stats
+
+CHANGELIST = reverse("admin:todolist_app_tasklist_changelist")
+
+
+@pytest.fixture
+def boss(client):
+    user = User.objects.create_superuser(username="boss", password="pwd123")
+    client.force_login(user)
+    return user
+
+
+def changelist_queries(client, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(CHANGELIST, params or {})
+    assert response.status_code == 200
+    return response, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_changelist_queries_do_not_grow_with_users(client, boss):
+    owners = [User.objects.create_user(username=f"owner-{i}") for i in range(3)]
+    for owner in owners:
+        TaskList.objects.create(gestionnaire=owner, task="Tâche")
+    _, baseline = changelist_queries(client)
+
+    owners += [User.objects.create_user(username=f"owner-{i}") for i in range(3, 30)]
+    TaskList.objects.bulk_create([TaskList(gestionnaire=owner, task="Tâche") for owner in owners[3:]])
+    response, queries = changelist_queries(client)
+
+    assert queries == baseline
+    assert b"admin-autocomplete" in response.content
+    assert response.content.count(b"owner-") == 30
+
+
+@pytest.mark.django_db
+def test_owner_filter_shows_only_selected_owner(client, boss):
+    lea, max_ = User.objects.create_user(username="lea"), User.objects.create_user(username="max")
+    TaskList.objects.create(gestionnaire=lea, task="A")
+    TaskList.objects.create(gestionnaire=max_, task="B")
+
+    response, _ = changelist_queries(client, {"gestionnaire__id__exact": lea.pk})
+
+    assert [task.task for task in response.context["cl"].result_list] == ["A"]
+    assert f'<option value="{lea.pk}" selected>lea</option>' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_unfiltered_changelist_uses_estimated_count(client, boss, monkeypatch):
+    TaskList.objects.create(gestionnaire=boss, task="A")
+    monkeypatch.setattr(pagination, "estimated_count", lambda model, using: 2_000_000)
+
+    response, _ = changelist_queries(client)
+    assert response.context["cl"].result_count == 2_000_000
+
+    # Une liste filtrée garde un comptage exact
+    response, _ = changelist_queries(client, {"done__exact": "0"})
+    assert response.context["cl"].result_count == 1
+
+
+@pytest.mark.django_db
+def test_select_all_action_runs_in_batches(client, boss, monkeypatch, django_capture_on_commit_callbacks):
+    TaskList.objects.bulk_create([TaskList(gestionnaire=boss, task=f"Task {i}", done=i < 2) for i in range(7)])
+    monkeypatch.setattr(TaskListAdmin, "action_batch_size", 2)
+    batches = []
+    update_done = stats.update_done
+    monkeypatch.setattr(stats, "update_done", lambda queryset, done: batches.append(1) or update_done(queryset, done))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(CHANGELIST, {
+            "action": "marquer_terminee",
+            "select_across": "1",
+            "index": "0",
+            "_selected_action": [TaskList.objects.first().pk],
+        }, follow=True)
+
+    assert "5 tâche(s) marquée(s) comme terminée(s)." in response.content.decode()
+    assert len(batches) == 3
+    assert not TaskList.objects.filter(done=False).exists()
+    assert get_stats() == compute_stats()
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from todolist_app.agenda import agenda_bounds
+from todolist_app.models import TaskList
+from todolist_app.views import TaskViewSet
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def lea():
+    return User.objects.create_user(username="lea", password="pwd123")
+
+
+@pytest.mark.django_db
+def test_agenda_buckets_pending_tasks_by_due_date(lea, django_assert_num_queries):
+    now, tomorrow, _ = agenda_bounds()
+    due = {
+        "late": now - timedelta(days=3),
+        "today": now + (tomorrow - now) / 2,
+        "soon": tomorrow + timedelta(hours=1),
+        "later": tomorrow + timedelta(days=8),
+    }
+    for name, due_at in due.items():
+        TaskList.objects.create(gestionnaire=lea, task=name, due_at=due_at)
+    TaskList.objects.create(gestionnaire=lea, task="no date")
+    TaskList.objects.create(gestionnaire=lea, task="finished", due_at=due["today"], done=True)
+    TaskList.objects.create(gestionnaire=User.objects.create_user(username="max"), task="other", due_at=due["today"])
+
+    with django_assert_num_queries(3):
+        data = client_for(lea).get(reverse("tasks-agenda")).data
+
+    assert {name: [task["task"] for task in bucket["results"]] for name, bucket in data.items()} == {
+        "overdue": ["late"], "today": ["today"], "upcoming": ["soon"],
+    }
+    assert data["today"]["results"][0]["priority"] == TaskList.PRIORITY_NORMAL
+    later = client_for(lea).get(reverse("tasks-agenda"), {"days": 10}).data["upcoming"]["results"]
+    assert [task["task"] for task in later] == ["soon", "later"]
+
+
+@pytest.mark.django_db
+def test_agenda_is_limited_per_bucket(lea, monkeypatch):
+    monkeypatch.setattr(TaskViewSet, "agenda_limit", 2)
+    now, _, _ = agenda_bounds()
+    TaskList.objects.bulk_create(
+        [TaskList(gestionnaire=lea, task=f"late {i}", due_at=now - timedelta(days=i + 1)) for i in range(3)]
+    )
+
+    overdue = client_for(lea).get(reverse("tasks-agenda")).data["overdue"]
+    assert [task["task"] for task in overdue["results"]] == ["late 2", "late 1"]
+    assert overdue["has_more"] is True
+
+
+@pytest.mark.django_db
+def test_agenda_rejects_invalid_window(lea):
+    response = client_for(lea).get(reverse("tasks-agenda"), {"days": "90"})
+    assert response.status_code == 400
+    assert response.data == {"error": "days doit être compris entre 1 et 31."}
+
+
+@pytest.mark.django_db
+def test_tasks_accept_priority_and_due_date(lea):
+    client = client_for(lea)
+    due_at = "2030-01-15T09:00:00Z"
+    created = client.post(reverse("tasks-list"), {"task": "Rapport", "priority": 3, "due_at": due_at}).data
+    client.post(reverse("tasks-list"), {"task": "Courses"})
+
+    assert (created["priority"], created["due_at"]) == (3, due_at)
+    urgent = client.get(reverse("tasks-list"), {"priority": 3}).data["results"]
+    assert [task["task"] for task in urgent] == ["Rapport"]
+    assert client.get(reverse("tasks-list"), {"priority": "urgent"}).status_code == 400
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from todolist_app.archive import archive_tasks
+from todolist_app.models import ArchivedTask, TaskList
+from todolist_app.stats import compute_stats
+
+OLD = timedelta(days=90)
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def make_old(*tasks):
+    TaskList.objects.filter(id__in=[task.id for task in tasks]).update(updated_at=timezone.now() - OLD * 2)
+
+
+@pytest.fixture
+def lea():
+    return User.objects.create_user(username="lea", password="pwd123")
+
+
+@pytest.mark.django_db
+def test_archive_moves_old_done_tasks_in_batches(lea, django_capture_on_commit_callbacks):
+    done = [TaskList.objects.create(gestionnaire=lea, task=f"done {i}", done=True) for i in range(5)]
+    pending = TaskList.objects.create(gestionnaire=lea, task="pending")
+    recent = TaskList.objects.create(gestionnaire=lea, task="recent", done=True)
+    make_old(*done, pending)
+    before = compute_stats(lea.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert archive_tasks(OLD, batch_size=2) == 5
+
+    assert set(TaskList.objects.values_list("task", flat=True)) == {"pending", "recent"}
+    archived = ArchivedTask.objects.get(pk=done[0].pk)
+    assert (archived.task, archived.done, archived.gestionnaire_id) == ("done 0", True, lea.pk)
+    assert archived.updated_at < timezone.now() - OLD
+    assert compute_stats(lea.pk) == before
+    assert archive_tasks(OLD) == 0
+    assert recent.pk not in ArchivedTask.objects.values_list("id", flat=True)
+
+
+@pytest.mark.django_db
+def test_archive_skips_tasks_reopened_after_selection(lea, monkeypatch):
+    tasks = [TaskList.objects.create(gestionnaire=lea, task=f"done {i}", done=True) for i in range(2)]
+    make_old(*tasks)
+    select_for_update = TaskList.objects.select_for_update
+
+    def reopen_then_lock():
+        # Une requête concurrente rouvre la tâche entre la sélection du lot et le verrou
+        TaskList.objects.filter(pk=tasks[0].pk).update(done=False, updated_at=timezone.now())
+        return select_for_update()
+
+    monkeypatch.setattr(TaskList.objects, "select_for_update", reopen_then_lock)
+    assert archive_tasks(OLD) == 1
+    assert TaskList.objects.get(pk=tasks[0].pk).done is False
+    assert list(ArchivedTask.objects.values_list("id", flat=True)) == [tasks[1].pk]
+
+
+@pytest.mark.django_db
+def test_archive_command(lea):
+    make_old(TaskList.objects.create(gestionnaire=lea, task="old", done=True))
+    out = StringIO()
+    call_command("archive_tasks", "--older-than", "30d", "--batch-size", "10", stdout=out)
+    assert out.getvalue().strip() == "1 tâche(s) archivée(s)."
+
+
+@pytest.mark.django_db
+def test_list_includes_archived_tasks_on_request(lea, monkeypatch):
+    first = TaskList.objects.create(gestionnaire=lea, task="Rapport annuel", done=True)
+    TaskList.objects.create(gestionnaire=lea, task="Rapport mensuel")
+    TaskList.objects.create(gestionnaire=User.objects.create_user(username="max"), task="Rapport", done=True)
+    make_old(*TaskList.objects.filter(done=True))
+    archive_tasks(OLD)
+    client = client_for(lea)
+
+    assert [task["task"] for task in client.get(reverse("tasks-list")).data["results"]] == ["Rapport mensuel"]
+    data = client.get(reverse("tasks-list"), {"include_archived": 1}).data
+    assert data["count"] == 2
+    assert [task["task"] for task in data["results"]] == ["Rapport mensuel", "Rapport annuel"]
+    assert "archived_at" in data["results"][1] and "archived_at" not in data["results"][0]
+
+    search = client.get(reverse("tasks-list"), {"include_archived": 1, "q": "annuel"}).data
+    assert [task["id"] for task in search["results"]] == [first.pk]
+    monkeypatch.setattr(PageNumberPagination, "page_size", 1)
+    page = client.get(reverse("tasks-list"), {"include_archived": 1, "page": 2}).data
+    assert page["count"] == 2
+    assert [task["task"] for task in page["results"]] == ["Rapport annuel"]
+    cursor = client.get(reverse("tasks-list"), {"include_archived": 1, "pagination": "cursor"})
+    assert cursor.status_code == 400 and "error" in cursor.data
+
+
+@pytest.mark.django_db
+def test_retrieve_archived_task(lea):
+    task = TaskList.objects.create(gestionnaire=lea, task="old", done=True)
+    make_old(task)
+    archive_tasks(OLD)
+    url = reverse("tasks-detail", args=[task.pk])
+
+    assert client_for(lea).get(url).status_code == 404
+    response = client_for(lea).get(url, {"include_archived": 1})
+    assert response.status_code == 200
+    assert response.data["task"] == "old" and response.data["archived_at"] is not None
+    other = User.objects.create_user(username="max")
+    assert client_for(other).get(url, {"include_archived": 1}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_archived_changelist_is_read_only(client, lea):
+    boss = User.objects.create_superuser(username="boss", password="pwd123")
+    client.force_login(boss)
+    task = TaskList.objects.create(gestionnaire=lea, task="old", done=True)
+    make_old(task)
+    archive_tasks(OLD)
+
+    response = client.get(reverse("admin:todolist_app_archivedtask_changelist"), {"gestionnaire__id__exact": lea.pk})
+    assert response.status_code == 200
+    assert b"old" in response.content
+    assert client.get(reverse("admin:todolist_app_archivedtask_add")).status_code == 403
+
+
+@pytest.mark.django_db
+def test_user_deletion_removes_archived_tasks(lea):
+    from users_app.deletion import process_user_deletions, schedule_user_deletion
+
+    tasks = [TaskList.objects.create(gestionnaire=lea, task=f"old {i}", done=True) for i in range(3)]
+    make_old(*tasks)
+    archive_tasks(OLD)
+    TaskList.objects.create(gestionnaire=lea, task="current")
+    job = schedule_user_deletion(lea)
+
+    assert process_user_deletions(batch_size=2) == 1
+    job.refresh_from_db()
+    assert job.tasks_deleted == 4
+    assert not ArchivedTask.objects.exists()
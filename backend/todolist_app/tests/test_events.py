@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from todolist_app import events
+from todolist_app.models import TaskList
+from todolist_app.stats import ALL_USERS, update_done
+
+
+def collect(broker, channels, action, count):
+    """Exécute `action` (sync) et renvoie les `count` premiers événements reçus"""
+    async def scenario():
+        subscription = broker.subscribe(channels)
+        try:
+            await subscription.get(timeout=0)
+            await sync_to_async(action)()
+            return [await subscription.get(timeout=2) for _ in range(count)]
+        finally:
+            subscription.close()
+    return asyncio.run(scenario())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_signals_and_admin_actions_publish_diffs():
+    user = User.objects.create_user(username="eve", password="pwd123")
+    broker = events.get_broker()
+
+    def write():
+        task = TaskList.objects.create(gestionnaire=user, task="Pain")
+        update_done(TaskList.objects.filter(id=task.id), True)
+        task.delete()
+
+    upsert, update, delete = collect(broker, [user.pk], write, 3)
+
+    assert upsert["type"] == "upsert"
+    assert upsert["tasks"][0]["task"] == "Pain"
+    assert update["type"] == "update"
+    assert update["ids"] == [upsert["tasks"][0]["id"]]
+    assert update["changes"]["done"] is True
+    assert delete == {"type": "delete", "ids": update["ids"]}
+    assert broker.subscriptions == {}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cache_broker_fans_out_and_asks_for_refresh_when_behind():
+    broker = events.CacheBroker(poll_interval=0.01)
+
+    def publish(count):
+        def action():
+            for i in range(count):
+                broker.publish(ALL_USERS, {"type": "delete", "ids": [i]})
+        return action
+
+    assert collect(broker, [ALL_USERS], publish(2), 2) == [
+        {"type": "delete", "ids": [0]},
+        {"type": "delete", "ids": [1]},
+    ]
+    assert collect(broker, [ALL_USERS], publish(events.SUBSCRIPTION_QUEUE_SIZE + 1), 1) == [events.REFRESH]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_event_stream_endpoint():
+    user = User.objects.create_user(username="sam", password="pwd123")
+    other = User.objects.create_user(username="tom", password="pwd123")
+    url = reverse("async-tasks-events")
+
+    async def scenario():
+        client = AsyncClient()
+        assert (await client.get(url)).status_code == 401
+
+        response = await client.get(url, {"access_token": str(AccessToken.for_user(user))})
+        assert response["Content-Type"] == "text/event-stream"
+        stream = response.streaming_content
+        assert (await anext(stream)).startswith(b"retry:")
+        assert b'"ready"' in await anext(stream)
+
+        await TaskList.objects.acreate(gestionnaire=other, task="Pas pour moi")
+        await TaskList.objects.acreate(gestionnaire=user, task="Pour moi")
+        chunk = await asyncio.wait_for(anext(stream), 2)
+        await stream.aclose()
+        return json.loads(chunk.decode().removeprefix("data: "))
+
+    event = asyncio.run(scenario())
+    assert [task["task"] for task in event["tasks"]] == ["Pour moi"]
+
+
+def test_worker_processes_require_a_shared_broker(settings, monkeypatch, tmp_path):
+    settings.DEBUG = False
+    monkeypatch.setattr(events.multiprocessing, "parent_process", lambda: object())
+    events.get_broker.cache_clear()
+    try:
+        settings.TASK_EVENTS_BACKEND = {"BACKEND": "todolist_app.events.LocalBroker"}
+        with pytest.raises(ImproperlyConfigured):
+            events.check_worker_broker()
+
+        # CacheBroker sur un cache propre au processus (locmem en test) : même problème
+        settings.TASK_EVENTS_BACKEND = {"BACKEND": "todolist_app.events.CacheBroker"}
+        events.get_broker.cache_clear()
+        with pytest.raises(ImproperlyConfigured):
+            events.check_worker_broker()
+
+        settings.CACHES = {**settings.CACHES, "events": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": str(tmp_path),
+        }}
+        settings.TASK_EVENTS_BACKEND = {"BACKEND": "todolist_app.events.CacheBroker", "OPTIONS": {"alias": "events"}}
+        events.get_broker.cache_clear()
+        events.check_worker_broker()
+    finally:
+        events.get_broker.cache_clear()
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todolist_app.models import TaskList
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="wendy", password="pwd123")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+def test_export_csv_is_scoped_and_filtered(user, client):
+    other = User.objects.create_user(username="xavier", password="pwd123")
+    TaskList.objects.create(
+        gestionnaire=user, task="Done, with comma", done=True,
+        priority=TaskList.PRIORITY_HIGH, due_at=datetime(2026, 3, 1, 9, 30, tzinfo=dt_timezone.utc),
+    )
+    TaskList.objects.create(gestionnaire=user, task="Pending")
+    TaskList.objects.create(gestionnaire=other, task="Foreign", done=True)
+
+    response = client.get(reverse("tasks-export"), {"format": "csv", "done": "true"})
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(_body(response))))
+    assert rows[0] == ["id", "task", "done", "priority", "due_at", "gestionnaire", "created_at", "updated_at"]
+    assert [row[1:6] for row in rows[1:]] == [["Done, with comma", "True", "3", "2026-03-01T09:30:00+00:00", "wendy"]]
+
+
+@pytest.mark.django_db
+def test_export_ndjson_and_invalid_filter(user, client):
+    TaskList.objects.create(gestionnaire=user, task="Line")
+
+    response = client.get(reverse("tasks-export"), {"format": "ndjson", "created_after": "2000-01-01"})
+    lines = [json.loads(line) for line in _body(response).splitlines()]
+    assert lines[0]["task"] == "Line" and lines[0]["gestionnaire"] == "wendy"
+    assert lines[0]["priority"] == TaskList.PRIORITY_NORMAL and lines[0]["due_at"] is None
+
+    bad = client.get(reverse("tasks-export"), {"format": "ndjson", "created_before": "yesterday"})
+    assert bad.status_code == 400
+
+
+@pytest.mark.django_db
+def test_export_memory_stays_flat(user, client):
+    TaskList.objects.bulk_create([TaskList(gestionnaire=user, task=f"Task {i}") for i in range(20000)])
+
+    response = client.get(reverse("tasks-export"), {"format": "ndjson"})
+    tracemalloc.start()
+    count = sum(chunk.count(b"\n") for chunk in response.streaming_content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == 20000
+    assert peak < 5 * 1024 * 1024
@@ -0,0 +1,116 @@
+import io
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todolist_app.importer import import_tasks
+from todolist_app.models import TaskImport, TaskList
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="yann", password="pwd123")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+def test_import_csv_reports_row_errors(user, client):
+    body = "task,done\nBuy milk,true\n,false\nCall mom,maybe\n\"Multi, line\",0\n"
+
+    response = client.post(reverse("tasks-import"), body, content_type="text/csv")
+
+    assert response.status_code == 200
+    assert response.data["rows_imported"] == 2
+    assert [e["row"] for e in response.data["errors"]] == [2, 3]
+    assert set(TaskList.objects.filter(gestionnaire=user).values_list("task", "done")) == {
+        ("Buy milk", True), ("Multi, line", False),
+    }
+
+
+@pytest.mark.django_db
+def test_import_ndjson_and_bad_header(client):
+    body = '{"task": "One"}\nnot json\n{"task": "Two", "done": true}\n'
+    response = client.post(reverse("tasks-import"), body, content_type="application/x-ndjson")
+    assert response.data["rows_imported"] == 2 and response.data["rows_failed"] == 1
+
+    bad = client.post(reverse("tasks-import"), "title\nx\n", content_type="text/csv")
+    assert bad.status_code == 400
+    assert client.post(reverse("tasks-import"), "{}", content_type="application/json").status_code == 415
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("export_format", ["csv", "ndjson"])
+def test_export_import_round_trip_keeps_priority_and_due_date(user, client, export_format):
+    due_at = datetime(2026, 5, 4, 8, 0, tzinfo=dt_timezone.utc)
+    TaskList.objects.create(gestionnaire=user, task="Urgent", priority=TaskList.PRIORITY_HIGH, due_at=due_at)
+    TaskList.objects.create(gestionnaire=user, task="Someday", priority=TaskList.PRIORITY_LOW)
+    response = client.get(reverse("tasks-export"), {"format": export_format})
+    exported = b"".join(response.streaming_content).decode()
+
+    other = User.objects.create_user(username="zed")
+    job = import_tasks(io.StringIO(exported), export_format, other)
+
+    assert job.rows_imported == 2
+    assert sorted(TaskList.objects.filter(gestionnaire=other).values_list("task", "priority", "due_at")) == [
+        ("Someday", TaskList.PRIORITY_LOW, None), ("Urgent", TaskList.PRIORITY_HIGH, due_at),
+    ]
+
+
+@pytest.mark.django_db
+def test_import_rejects_invalid_priority_and_due_date(user):
+    job = import_tasks(io.StringIO("task,priority,due_at\nA,7,\nB,2,demain\n"), "csv", user)
+
+    assert job.rows_imported == 0
+    assert [set(error["errors"]) for error in job.errors] == [{"priority"}, {"due_at"}]
+
+
+@pytest.mark.django_db
+def test_import_resumes_after_last_committed_batch(user):
+    lines = [b"task\n"] + [f"Task {i}\n".encode() for i in range(10)]
+
+    def interrupted():
+        yield from lines[:6]
+        raise ConnectionError("client gone")
+
+    with pytest.raises(ConnectionError):
+        import_tasks(interrupted(), "csv", user, batch_size=2)
+    job = TaskImport.objects.get()
+    assert job.rows_processed == 4
+
+    import_tasks(iter(lines), "csv", user, batch_size=2, job=job)
+
+    assert job.status == TaskImport.STATUS_COMPLETED
+    assert TaskList.objects.count() == 10
+
+
+@pytest.mark.django_db
+def test_import_command(user, tmp_path):
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"task": "From file"}\n', encoding="utf-8")
+    out = io.StringIO()
+
+    call_command("import_tasks", str(path), user="yann", stdout=out)
+
+    assert "1 tâche(s) importée(s)" in out.getvalue()
+    assert TaskList.objects.filter(task="From file").exists()
+
+
+@pytest.mark.django_db
+def test_import_throughput(user, client, django_assert_max_num_queries):
+    rows = 20000
+    body = "task,done\n" + "".join(f"Task {i},{i % 2}\n" for i in range(rows))
+
+    # INSERT multi-lignes (découpés selon la limite de paramètres de la base), pas une requête par ligne
+    with django_assert_max_num_queries(rows // 100):
+        response = client.post(reverse("tasks-import") + "?batch_size=2000", body, content_type="text/csv")
+
+    assert response.data["rows_imported"] == rows
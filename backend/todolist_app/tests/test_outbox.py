@@ -0,0 +1,57 @@
+import pytest
+from smtplib import SMTPException
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todolist_app.models import EmailOutbox
+from todolist_app.outbox import deliver_outbox
+
+
+@pytest.fixture(autouse=True)
+def admin_email(settings):
+    settings.DEFAULT_FROM_EMAIL = "admin@taskflow.com"
+
+
+def _post_contact(client):
+    return client.post(reverse("contact"), {
+        "name": "Ana",
+        "email": "ana@example.com",
+        "subject": "Bonjour",
+        "message": "Un message",
+    })
+
+
+@pytest.mark.django_db
+def test_contact_is_queued_then_delivered():
+    response = _post_contact(APIClient())
+
+    assert response.status_code == 202
+    assert len(mail.outbox) == 0
+    assert EmailOutbox.objects.get().status == EmailOutbox.STATUS_PENDING
+
+    assert deliver_outbox() == (1, 0)
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].reply_to == ["ana@example.com"]
+    assert EmailOutbox.objects.get().status == EmailOutbox.STATUS_SENT
+
+
+@pytest.mark.django_db
+def test_failed_delivery_is_retried_later(monkeypatch):
+    def fail(self, messages):
+        raise SMTPException("boom")
+
+    monkeypatch.setattr(EmailBackend, "send_messages", fail)
+    _post_contact(APIClient())
+
+    assert deliver_outbox(max_attempts=2) == (0, 1)
+    queued = EmailOutbox.objects.get()
+    assert queued.status == EmailOutbox.STATUS_PENDING
+    assert queued.attempts == 1
+    assert "boom" in queued.last_error
+    # Replanifié : pas renvoyé immédiatement
+    assert deliver_outbox() == (0, 0)
+
+    EmailOutbox.objects.update(next_attempt_at=queued.created_at)
+    assert deliver_outbox(max_attempts=2) == (0, 1)
+    assert EmailOutbox.objects.get().status == EmailOutbox.STATUS_FAILED
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from todolist_app.models import TaskList
+
+
+def _count_list_queries(client, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("tasks-list"), params or {})
+    assert response.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_staff_task_list_query_count_is_constant():
+    admin = User.objects.create_user(username="admin", password="pwd123", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    owner = User.objects.create_user(username="owner0", password="pwd123")
+    TaskList.objects.create(gestionnaire=owner, task="First")
+    baseline = _count_list_queries(client)
+
+    for i in range(1, 10):
+        owner = User.objects.create_user(username=f"owner{i}", password="pwd123")
+        TaskList.objects.create(gestionnaire=owner, task=f"Task {i}")
+
+    assert _count_list_queries(client) == baseline
+    assert _count_list_queries(client, {"pagination": "cursor"}) <= baseline
+
+
+@pytest.mark.django_db
+def test_task_detail_uses_single_query():
+    user = User.objects.create_user(username="eve", password="pwd123")
+    task = TaskList.objects.create(gestionnaire=user, task="Detail")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("tasks-detail", args=[task.id]))
+
+    assert response.data["gestionnaire"] == "eve"
+    assert len(ctx.captured_queries) == 1
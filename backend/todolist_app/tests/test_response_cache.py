@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from complice_taches.metrics import registry
+from todolist_app import response_cache
+from todolist_app.models import TaskList
+from todolist_app.response_cache import CACHE_COUNTER
+from todolist_app.stats import update_done
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+def test_list_is_served_from_cache_until_a_write(django_assert_num_queries):
+    user = User.objects.create_user(username="lea", password="pwd123")
+    task = TaskList.objects.create(gestionnaire=user, task="Courses")
+    client = client_for(user)
+
+    first = client.get(reverse("tasks-list"))
+    with django_assert_num_queries(0):
+        second = client.get(reverse("tasks-list"))
+    assert second.data == first.data
+    assert second["ETag"] == first["ETag"]
+    assert client.get(reverse("tasks-list"), HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+    assert registry.counter_value(CACHE_COUNTER, view='list', result='hit') == 2
+
+    client.post(reverse("tasks-mark-complete", args=[task.id]))
+    assert client.get(reverse("tasks-list")).data["results"][0]["done"] is True
+    assert registry.counter_value(CACHE_COUNTER, view='list', result='miss') == 2
+
+
+@pytest.mark.django_db
+def test_cache_is_per_user_and_admin_actions_invalidate_it():
+    user = User.objects.create_user(username="max", password="pwd123")
+    admin = User.objects.create_user(username="root", password="pwd123", is_staff=True)
+    task = TaskList.objects.create(gestionnaire=user, task="Rapport")
+    client, admin_client = client_for(user), client_for(admin)
+
+    assert client.get(reverse("tasks-detail", args=[task.id])).data["done"] is False
+    assert admin_client.get(reverse("tasks-list")).data["count"] == 1
+    assert client_for(User.objects.create_user(username="zoe")).get(reverse("tasks-list")).data["count"] == 0
+
+    update_done(TaskList.objects.filter(id=task.id), True)
+
+    assert client.get(reverse("tasks-detail", args=[task.id])).data["done"] is True
+    assert admin_client.get(reverse("tasks-list")).data["results"][0]["done"] is True
+
+
+@pytest.mark.django_db
+def test_cache_is_bypassed_with_a_per_process_backend(settings):
+    settings.TASK_RESPONSE_CACHE_LOCAL = False
+    client = client_for(User.objects.create_user(username="ines"))
+
+    client.get(reverse("tasks-list"))
+    client.get(reverse("tasks-list"))
+    assert registry.counter_value(CACHE_COUNTER, view='list', result='hit') == 0
+    assert registry.counter_value(CACHE_COUNTER, view='list', result='miss') == 0
+
+
+@pytest.mark.django_db
+def test_responses_read_from_replica_are_not_cached(monkeypatch):
+    monkeypatch.setattr(response_cache, "reading_from_replica", lambda: True)
+    client = client_for(User.objects.create_user(username="ines"))
+
+    client.get(reverse("tasks-list"))
+    client.get(reverse("tasks-list"))
+    assert registry.counter_value(CACHE_COUNTER, view='list', result='miss') == 2
@@ -0,0 +1,59 @@
+import pytest
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from todolist_app.models import TaskList
+from todolist_app.stats import compute_stats, get_stats
+
+
+@pytest.mark.django_db
+def test_stats_are_maintained_by_signals(django_capture_on_commit_callbacks):
+    user = User.objects.create_user(username="lea", password="pwd123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    assert client.get(reverse("tasks-stats")).data["total"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = TaskList.objects.create(gestionnaire=user, task="One")
+        TaskList.objects.create(gestionnaire=user, task="Two")
+        first.done = True
+        first.save()
+
+    with CaptureQueriesContext(connection) as ctx:
+        stats = get_stats(user.pk)
+    assert len(ctx.captured_queries) == 0
+    assert stats == {"total": 2, "done": 1, "pending": 1, "created_this_week": 2}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert get_stats(user.pk) == compute_stats(user.pk)
+
+
+@pytest.mark.django_db
+def test_admin_actions_keep_global_stats_in_sync(rf, django_capture_on_commit_callbacks):
+    admin_user = User.objects.create_user(username="boss", password="pwd123", is_staff=True)
+    for i in range(3):
+        TaskList.objects.create(gestionnaire=admin_user, task=f"Task {i}")
+    assert get_stats()["pending"] == 3
+
+    model_admin = site._registry[TaskList]
+    request = rf.post("/")
+    request.user = admin_user
+    model_admin.message_user = lambda *args, **kwargs: None
+    with django_capture_on_commit_callbacks(execute=True):
+        model_admin.marquer_terminee(request, TaskList.objects.all())
+
+    assert get_stats() == compute_stats()
+    assert get_stats()["done"] == 3
+
+
+@pytest.mark.django_db
+def test_global_stats_require_staff():
+    user = User.objects.create_user(username="max", password="pwd123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    assert client.get(reverse("tasks-stats"), {"scope": "all"}).status_code == 403
@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from todolist_app.models import TaskList, TaskTombstone
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="kim", password="pwd123")
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+def test_changes_returns_updates_and_deletions(user, client):
+    kept = TaskList.objects.create(gestionnaire=user, task="Keep")
+    removed = TaskList.objects.create(gestionnaire=user, task="Remove")
+    token = client.get(reverse("tasks-changes")).data["token"]
+
+    client.patch(reverse("tasks-detail", args=[kept.id]), {"done": True})
+    client.delete(reverse("tasks-detail", args=[removed.id]))
+    created = client.post(reverse("tasks-list"), {"task": "New"}).data
+
+    response = client.get(reverse("tasks-changes"), {"since": token})
+
+    assert response.status_code == 200
+    assert {t["id"] for t in response.data["changed"]} == {kept.id, created["id"]}
+    assert response.data["deleted"] == [removed.id]
+    assert response.data["has_more"] is False
+
+    again = client.get(reverse("tasks-changes"), {"since": response.data["token"]})
+    assert again.data["changed"] == [] and again.data["deleted"] == []
+
+
+@pytest.mark.django_db
+def test_changes_rejects_invalid_token(client):
+    assert client.get(reverse("tasks-changes"), {"since": "abc"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_conditional_get_returns_304(user, client):
+    task = TaskList.objects.create(gestionnaire=user, task="Cached")
+
+    listing = client.get(reverse("tasks-list"))
+    assert client.get(reverse("tasks-list"), HTTP_IF_NONE_MATCH=listing["ETag"]).status_code == 304
+
+    detail = client.get(reverse("tasks-detail", args=[task.id]))
+    assert detail["Last-Modified"]
+    assert client.get(reverse("tasks-detail", args=[task.id]), HTTP_IF_NONE_MATCH=detail["ETag"]).status_code == 304
+
+    client.delete(reverse("tasks-detail", args=[task.id]))
+    assert client.get(reverse("tasks-list"), HTTP_IF_NONE_MATCH=listing["ETag"]).status_code == 200
+
+
+@pytest.mark.django_db
+def test_deleting_user_does_not_leave_tombstones(user):
+    TaskList.objects.create(gestionnaire=user, task="Gone with owner")
+    user_id = user.pk
+
+    user.delete()
+
+    assert not TaskList.objects.exists()
+    assert not TaskTombstone.objects.filter(gestionnaire_id=user_id).exists()
+
+
+@pytest.mark.django_db
+def test_cursor_list_etag_follows_page_and_deletions(user, client):
+    older = TaskList.objects.create(gestionnaire=user, task="Older")
+    newer = TaskList.objects.create(gestionnaire=user, task="Newer")
+    params = {"pagination": "cursor", "page_size": 1}
+
+    with CaptureQueriesContext(connection) as ctx:
+        listing = client.get(reverse("tasks-list"), params)
+    assert [task["id"] for task in listing.data["results"]] == [newer.id]
+    assert not any("COUNT(" in query["sql"] for query in ctx.captured_queries)
+    assert client.get(reverse("tasks-list"), params, HTTP_IF_NONE_MATCH=listing["ETag"]).status_code == 304
+
+    # Suppression hors de la page : la dernière tombstone fait partie de l'ETag
+    client.delete(reverse("tasks-detail", args=[older.id]))
+    after_delete = client.get(reverse("tasks-list"), params, HTTP_IF_NONE_MATCH=listing["ETag"])
+    assert after_delete.status_code == 200
+
+    client.patch(reverse("tasks-detail", args=[newer.id]), {"task": "Renamed"})
+    assert client.get(reverse("tasks-list"), params, HTTP_IF_NONE_MATCH=after_delete["ETag"]).status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_304_does_not_serialize(user, client, settings, monkeypatch):
+    from todolist_app.serializers import TaskSerializer
+
+    # Sans cache des réponses (locmem hors tests) : la page est relue à chaque requête
+    settings.TASK_RESPONSE_CACHE_LOCAL = False
+    TaskList.objects.create(gestionnaire=user, task="Stable")
+    etag = client.get(reverse("tasks-list"))["ETag"]
+
+    serialized = []
+    to_representation = TaskSerializer.to_representation
+    monkeypatch.setattr(TaskSerializer, "to_representation", lambda self, task: serialized.append(task) or to_representation(self, task))
+    assert client.get(reverse("tasks-list"), HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert serialized == []
@@ -0,0 +1,101 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from todolist_app import updates
+from todolist_app.models import TaskList
+from todolist_app.stats import compute_stats, get_stats
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def lea():
+    return User.objects.create_user(username="lea", password="pwd123")
+
+
+@pytest.mark.django_db
+def test_mark_complete_is_a_single_conditional_update(lea):
+    task = TaskList.objects.create(gestionnaire=lea, task="Courses")
+    client = client_for(lea)
+
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(reverse("tasks-mark-complete", args=[task.id]))
+    assert response.data == {"status": "Tâche terminée", "changed": True}
+    assert [query["sql"].split()[0] for query in ctx.captured_queries] == ["UPDATE"]
+
+    task.refresh_from_db()
+    assert task.done
+    assert response["ETag"] == client.get(reverse("tasks-detail", args=[task.id]))["ETag"]
+
+    # Déjà terminée : une lecture, aucune écriture
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.post(reverse("tasks-mark-complete", args=[task.id]))
+    assert response.data["changed"] is False
+    assert [query["sql"].split()[0] for query in ctx.captured_queries] == ["UPDATE", "SELECT"]
+    assert TaskList.objects.get(pk=task.pk).updated_at == task.updated_at
+
+
+@pytest.mark.django_db
+def test_conditional_writes_keep_stats_cache_and_events_consistent(lea, monkeypatch, django_capture_on_commit_callbacks):
+    published = []
+    monkeypatch.setattr(updates, "publish_update", lambda owner_id, ids, **changes: published.append((owner_id, ids, changes)))
+    task = TaskList.objects.create(gestionnaire=lea, task="Courses")
+    client = client_for(lea)
+    assert get_stats(lea.pk)["done"] == 0
+    assert client.get(reverse("tasks-detail", args=[task.id])).data["done"] is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(reverse("tasks-mark-complete", args=[task.id]))
+        client.patch(reverse("tasks-detail", args=[task.id]), {"task": "Marché"})
+        client.post(reverse("tasks-mark-pending", args=[task.id]))
+        client.post(reverse("tasks-mark-pending", args=[task.id]))
+
+    assert get_stats(lea.pk) == compute_stats(lea.pk)
+    assert get_stats() == compute_stats()
+    data = client.get(reverse("tasks-detail", args=[task.id])).data
+    assert (data["task"], data["done"]) == ("Marché", False)
+    assert [changes.keys() - {"updated_at"} for _, _, changes in published] == [{"done"}, {"task"}, {"done"}]
+    assert {(owner_id, tuple(ids)) for owner_id, ids, _ in published} == {(lea.pk, (task.id,))}
+
+
+@pytest.mark.django_db
+def test_if_match_rejects_stale_versions(lea):
+    task = TaskList.objects.create(gestionnaire=lea, task="Courses")
+    client = client_for(lea)
+    etag = client.get(reverse("tasks-detail", args=[task.id]))["ETag"]
+
+    response = client.patch(reverse("tasks-detail", args=[task.id]), {"done": True}, HTTP_IF_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+    stale = client.post(reverse("tasks-mark-pending", args=[task.id]), HTTP_IF_MATCH=etag)
+    assert stale.status_code == 412
+    assert stale.data == {"error": "La tâche a été modifiée entre-temps."}
+    assert stale["ETag"] == response["ETag"]
+    assert TaskList.objects.get(pk=task.pk).done
+
+    assert client.post(reverse("tasks-mark-pending", args=[task.id]), HTTP_IF_MATCH=stale["ETag"]).data["changed"]
+    assert client.post(reverse("tasks-mark-complete", args=[task.id]), HTTP_IF_MATCH="*").status_code == 200
+
+
+@pytest.mark.django_db
+def test_conditional_writes_respect_visibility(lea, django_capture_on_commit_callbacks):
+    task = TaskList.objects.create(gestionnaire=lea, task="Courses")
+    intruder = client_for(User.objects.create_user(username="max", password="pwd123"))
+    boss = client_for(User.objects.create_user(username="boss", password="pwd123", is_staff=True))
+
+    assert intruder.post(reverse("tasks-mark-complete", args=[task.id])).status_code == 404
+    assert intruder.patch(reverse("tasks-detail", args=[task.id]), {"done": True}).status_code == 404
+    assert not TaskList.objects.get(pk=task.pk).done
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert boss.post(reverse("tasks-mark-complete", args=[task.id])).data["changed"]
+    assert get_stats(lea.pk) == compute_stats(lea.pk)
@@ -2,6 +2,7 @@ import pytest
 from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
+from todolist_app.models import TaskList
 
 
 @pytest.mark.django_db
@@ -15,3 +16,165 @@ def test_create_task_authenticated():
 
     assert response.status_code == 201
     assert response.data["task"] == "Read a book"
+
+
+@pytest.mark.django_db
+def test_list_tasks_cursor_pagination():
+    user = User.objects.create_user(username="carl", password="pwd123")
+    for i in range(15):
+        TaskList.objects.create(gestionnaire=user, task=f"Task {i}")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("tasks-list"), {"pagination": "cursor"})
+
+    assert response.status_code == 200
+    assert "count" not in response.data
+    assert len(response.data["results"]) == 10
+    assert response.data["results"][0]["task"] == "Task 14"
+
+    second = client.get(response.data["next"])
+    assert [t["task"] for t in second.data["results"]] == [f"Task {i}" for i in range(4, -1, -1)]
+
+
+@pytest.mark.django_db
+def test_list_tasks_page_number_is_default():
+    user = User.objects.create_user(username="dina", password="pwd123")
+    TaskList.objects.create(gestionnaire=user, task="Only one")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("tasks-list"))
+
+    assert response.data["count"] == 1
+
+
+@pytest.mark.django_db
+def test_bulk_operations_respect_ownership():
+    user = User.objects.create_user(username="fred", password="pwd123")
+    other = User.objects.create_user(username="gina", password="pwd123")
+    to_update = TaskList.objects.create(gestionnaire=user, task="Old")
+    to_toggle = TaskList.objects.create(gestionnaire=user, task="Toggle", done=False)
+    to_delete = TaskList.objects.create(gestionnaire=user, task="Delete")
+    foreign = TaskList.objects.create(gestionnaire=other, task="Not mine")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.post(reverse("tasks-bulk"), {"operations": [
+        {"op": "create", "task": "New"},
+        {"op": "update", "id": to_update.id, "task": "Renamed"},
+        {"op": "toggle", "id": to_toggle.id},
+        {"op": "delete", "id": to_delete.id},
+        {"op": "delete", "id": foreign.id},
+    ]}, format="json")
+
+    assert response.status_code == 200
+    statuses = [r["status"] for r in response.data["results"]]
+    assert statuses == ["created", "updated", "toggled", "deleted", "not_found"]
+    assert TaskList.objects.filter(gestionnaire=user, task="New").exists()
+    to_update.refresh_from_db()
+    to_toggle.refresh_from_db()
+    assert to_update.task == "Renamed"
+    assert to_toggle.done is True
+    assert not TaskList.objects.filter(id=to_delete.id).exists()
+    assert TaskList.objects.filter(id=foreign.id).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_delete_is_published_once(monkeypatch):
+    from todolist_app import events
+
+    user = User.objects.create_user(username="ines", password="pwd123")
+    tasks = [TaskList.objects.create(gestionnaire=user, task=f"T{i}") for i in range(2)]
+    published = []
+    monkeypatch.setattr(events, "publish", lambda owner_id, event: published.append(event))
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    client.post(reverse("tasks-bulk"), {"operations": [{"op": "delete", "id": task.id} for task in tasks]}, format="json")
+
+    assert sorted(task_id for event in published if event["type"] == "delete" for task_id in event["ids"]) == [
+        task.id for task in tasks
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_rejects_invalid_batch():
+    user = User.objects.create_user(username="hugo", password="pwd123")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.post(reverse("tasks-bulk"), [
+        {"op": "create", "task": "Valid"},
+        {"op": "update"},
+    ], format="json")
+
+    assert response.status_code == 400
+    assert not TaskList.objects.exists()
+
+
+@pytest.mark.django_db
+def test_search_tasks_is_scoped_and_ranked():
+    user = User.objects.create_user(username="nina", password="pwd123")
+    other = User.objects.create_user(username="omar", password="pwd123")
+    TaskList.objects.create(gestionnaire=user, task="Acheter du lait")
+    TaskList.objects.create(gestionnaire=user, task="Lait lait et café")
+    TaskList.objects.create(gestionnaire=user, task="Lire un livre")
+    TaskList.objects.create(gestionnaire=other, task="Lait pour Omar")
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.get(reverse("tasks-list"), {"q": "lai"})
+
+    assert [t["task"] for t in response.data["results"]] == ["Lait lait et café", "Acheter du lait"]
+
+    renamed = TaskList.objects.get(task="Lire un livre")
+    renamed.task = "Lait de coco"
+    renamed.save()
+    assert client.get(reverse("tasks-list"), {"q": "coco"}).data["count"] == 1
+
+    # Le classement par pertinence n'existe pas en pagination par curseur
+    cursor = client.get(reverse("tasks-list"), {"q": "lait", "pagination": "cursor"})
+    assert cursor.status_code == 400 and "error" in cursor.data
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_task_endpoints():
+    import asyncio
+    from django.test import AsyncClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    user = User.objects.create_user(username="sam", password="pwd123")
+    other = User.objects.create_user(username="tom", password="pwd123")
+    foreign = TaskList.objects.create(gestionnaire=other, task="Not mine")
+    client = AsyncClient()
+    auth = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    async def scenario():
+        created = await client.post(
+            reverse("async-tasks-list"), {"task": "Async"}, content_type="application/json", headers=auth
+        )
+        assert created.status_code == 201
+        task_id = created.json()["id"]
+
+        listing = (await client.get(reverse("async-tasks-list"), headers=auth)).json()
+        assert listing["count"] == 1
+        assert listing["results"][0]["gestionnaire"] == "sam"
+
+        done = await client.post(reverse("async-tasks-mark-complete", args=[task_id]), headers=auth)
+        assert done.json() == {"status": "Tâche terminée", "changed": True}
+        again = await client.post(
+            reverse("async-tasks-mark-complete", args=[task_id]), headers={**auth, "If-Match": done["ETag"]}
+        )
+        assert again.json()["changed"] is False
+        stale = await client.post(
+            reverse("async-tasks-mark-pending", args=[task_id]), headers={**auth, "If-Match": '"0-0"'}
+        )
+        assert stale.status_code == 412 and stale["ETag"] == done["ETag"]
+        missing = await client.post(reverse("async-tasks-mark-complete", args=[foreign.id]), headers=auth)
+        assert missing.status_code == 404
+        assert (await client.get(reverse("async-tasks-detail", args=[foreign.id]), headers=auth)).status_code == 404
+        assert (await AsyncClient().get(reverse("async-tasks-list"))).status_code == 401
+
+    asyncio.run(scenario())
+    assert TaskList.objects.get(task="Async").done is True
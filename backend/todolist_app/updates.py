@@ -0,0 +1,57 @@
+"""
+Écriture conditionnelle d'une tâche (mark_complete, mark_pending, PATCH).
+
+Un seul UPDATE ... WHERE id = ? [AND gestionnaire_id = ?] [AND updated_at IN (If-Match)]
+AND NOT (valeurs déjà en place), sans SELECT préalable. Si aucune ligne
+n'est modifiée, une lecture distingue tâche absente, version périmée (412)
+et tâche déjà à jour (aucune écriture). update() n'émettant pas de signal,
+compteurs, flux d'événements et cache des réponses sont tenus à jour ici.
+"""
+from django.utils import timezone
+
+from .events import publish_update
+from .models import TaskList
+from .response_cache import bump_versions
+from .stats import adjust_stats, invalidate_stats
+
+
+STALE_TASK_MESSAGE = "La tâche a été modifiée entre-temps."
+
+
+class PreconditionFailed(Exception):
+    """If-Match ne correspond plus à la version en base"""
+    def __init__(self, updated_at):
+        super().__init__(updated_at)
+        self.updated_at = updated_at
+
+
+def update_task(user, pk, changes, versions=None):
+    """
+    Applique `changes` à la tâche `pk` visible par `user`.
+    `versions` : valeurs de updated_at acceptées (If-Match), None pour ne pas vérifier.
+    Retourne (modifiée, updated_at). Lève TaskList.DoesNotExist ou PreconditionFailed.
+    """
+    target = TaskList.objects.visible_to(user).filter(pk=pk)
+    conditional = target if versions is None else target.filter(updated_at__in=versions)
+    now = timezone.now()
+
+    updated = conditional.exclude(**changes).update(**changes, updated_at=now) if changes else 0
+    if not updated:
+        current = target.values_list('updated_at', flat=True).first()
+        if current is None:
+            raise TaskList.DoesNotExist
+        if versions is not None and current not in versions:
+            raise PreconditionFailed(current)
+        return False, current
+
+    # Les non-admins ne voient que leurs tâches : pas de lecture pour le gestionnaire
+    owner_id = target.values_list('gestionnaire_id', flat=True).get() if user.is_staff else user.pk
+    if set(changes) == {'done'}:
+        # La condition garantit que done a changé
+        delta = 1 if changes['done'] else -1
+        adjust_stats(owner_id, done=delta, pending=-delta)
+    elif 'done' in changes:
+        invalidate_stats(owner_id)
+    bump_versions(owner_id)
+    publish_update(owner_id, [pk], **changes, updated_at=now)
+    return True, now
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import TaskViewSet, ContactView
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet, basename='tasks')
@@ -8,4 +9,11 @@ router.register(r'tasks', TaskViewSet, basename='tasks')
 urlpatterns = [
     path('', include(router.urls)),  # tasks endpoints will be /api/tasks/ now
     path('contact/', ContactView.as_view(), name='contact'),  # contact form will be /api/contact/
+
+    # Variantes async (ASGI) des endpoints de tâches
+    path('async/tasks/', async_views.task_list, name='async-tasks-list'),
+    path('async/tasks/<int:pk>/', async_views.task_detail, name='async-tasks-detail'),
+    path('async/tasks/<int:pk>/mark_complete/', async_views.task_mark_complete, name='async-tasks-mark-complete'),
+    path('async/tasks/<int:pk>/mark_pending/', async_views.task_mark_pending, name='async-tasks-mark-pending'),
+    path('async/tasks/events/', async_views.task_events, name='async-tasks-events'),
 ]
@@ -1,46 +1,344 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.views import APIView
-from django.core.mail import send_mail
 from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
 
-from .models import TaskList
-from .serializers import TaskSerializer, ContactSerializer  # <-- make sure ContactSerializer exists
+from complice_taches.db_routing import ReplicaReadMixin
 
+from .models import ArchivedTask, TaskList, TaskImport
+from .serializers import (  # <-- make sure ContactSerializer exists
+    TaskSerializer, ArchivedTaskSerializer, ContactSerializer, BulkTaskOperationSerializer, TaskImportSerializer,
+)
+from .archive import load_page, search_archived, with_archive
+from .pagination import get_pagination_class
+from .agenda import AGENDA_DAYS, AGENDA_LIMIT, AGENDA_MAX_DAYS, agenda_buckets
+from . import response_cache
+from .bulk import apply_bulk_operations, BULK_MAX_OPERATIONS
+from .outbox import enqueue_email
+from .export import STREAMS, CSVRenderer, NDJSONRenderer, ExportFilterError, export_rows, filter_export
+from .importer import IMPORT_BATCH_SIZE, IMPORT_MAX_BATCH_SIZE, ImportFormatError, import_tasks
+from .search import search_tasks
+from .stats import get_stats
+from .sync import (
+    InvalidSyncToken, TOMBSTONE_RETENTION, collect_changes, decode_sync_token, detail_validators,
+    if_match_versions, list_validators, not_modified_response, set_validators, task_etag,
+)
+from .updates import STALE_TASK_MESSAGE, PreconditionFailed, update_task
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+def cached_response(request, data, etag, last_modified):
+    """Réponse servie depuis le cache, avec le même traitement conditionnel (304)"""
+    not_modified = not_modified_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    return set_validators(Response(data), etag, last_modified)
+
+
+class TaskViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     Gestion des tâches pour les utilisateurs et admin.
     Les admins voient toutes les tâches, les utilisateurs seulement les leurs.
+    Pagination par numéro de page par défaut, ?pagination=cursor pour le mode curseur.
+    ?q= : recherche plein texte, résultats classés par pertinence ; pagination par page uniquement.
+    ?priority= : filtre par priorité (1 basse, 2 normale, 3 haute).
+    ?include_archived=1 : list et retrieve lisent aussi les tâches archivées
+    (voir archive.py), qui portent en plus archived_at ; pagination par page uniquement.
+    Les réponses de list et retrieve sont mises en cache (voir response_cache).
     """
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    replica_read_actions = {'list', 'retrieve', 'export', 'agenda'}
+    # Tâches par catégorie de /agenda/
+    agenda_limit = AGENDA_LIMIT
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = get_pagination_class(self.request, self.pagination_class)
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_staff:
-            return TaskList.objects.all().order_by('-created_at')
-        return TaskList.objects.filter(gestionnaire=user).order_by('-created_at')
+        # select_related : le nom du gestionnaire est lu dans la même requête (pas de N+1)
+        return (
+            TaskList.objects.visible_to(self.request.user)
+            .select_related('gestionnaire')
+            .order_by('-created_at', '-id')
+        )
+
+    def include_archived(self):
+        return self.request.query_params.get('include_archived') in ('1', 'true')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+        return self.filter_list(queryset, search_tasks)
+
+    def filter_list(self, queryset, search):
+        """Filtres de la liste (?priority=, ?q=), communs aux tâches et aux tâches archivées"""
+        priority = self.request.query_params.get('priority')
+        if priority is not None:
+            if priority not in {str(value) for value, _ in TaskList.PRIORITY_CHOICES}:
+                raise ValidationError({"error": "Priorité invalide."})
+            queryset = queryset.filter(priority=priority)
+        query = self.request.query_params.get('q', '').strip()
+        if query:
+            queryset = search(queryset, query)
+        return queryset
+
+    def serialize(self, task):
+        serializer_class = ArchivedTaskSerializer if isinstance(task, ArchivedTask) else self.get_serializer_class()
+        return serializer_class(task, context=self.get_serializer_context()).data
+
+    def cursor_conflict(self):
+        """Paramètres incompatibles avec la pagination par curseur (ordre fixe -created_at, -id)"""
+        if not isinstance(self.paginator, CursorPagination):
+            return None
+        if self.include_archived():
+            return "include_archived n'est pas disponible avec la pagination par curseur."
+        if self.request.query_params.get('q', '').strip():
+            return "La recherche (?q=), classée par pertinence, n'est pas disponible avec la pagination par curseur."
+        return None
+
+    def list(self, request, *args, **kwargs):
+        conflict = self.cursor_conflict()
+        if conflict:
+            return Response({"error": conflict}, status=status.HTTP_400_BAD_REQUEST)
+        key = response_cache.response_key(request, 'list')
+        cached = response_cache.get_response(key, 'list')
+        if cached is not None:
+            return cached_response(request, *cached)
+
+        tasks, page = self.list_page(self.filter_queryset(self.get_queryset()))
+        # Total déjà calculé par la pagination par page ; pas de COUNT en mode curseur
+        paginated = page is not None and isinstance(self.paginator, PageNumberPagination)
+        total = self.paginator.page.paginator.count if paginated else None
+        etag = list_validators(tasks, request, total)
+        not_modified = not_modified_response(request, etag, None)
+        if not_modified is not None:
+            return not_modified
+
+        data = [self.serialize(task) for task in tasks]
+        response = Response(data) if page is None else self.get_paginated_response(data)
+        response_cache.set_response(key, response.data, etag, None)
+        return set_validators(response, etag, None)
+
+    def list_page(self, queryset):
+        """
+        (tâches de la page, page) sans sérialisation, pour l'ETag. Avec
+        ?include_archived=1, pagination sur l'UNION (id, created_at) des deux
+        tables, puis chargement des seules lignes de la page.
+        """
+        if self.include_archived():
+            archived = self.filter_list(ArchivedTask.objects.visible_to(self.request.user), search_archived)
+            queryset = with_archive(queryset, archived)
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset if page is None else page)
+        return (load_page(rows) if self.include_archived() else rows), page
+
+    def retrieve(self, request, *args, **kwargs):
+        key = response_cache.response_key(request, 'retrieve')
+        cached = response_cache.get_response(key, 'retrieve')
+        if cached is not None:
+            return cached_response(request, *cached)
+
+        try:
+            task = self.get_object()
+        except Http404:
+            if not self.include_archived():
+                raise
+            archived = ArchivedTask.objects.visible_to(request.user).select_related('gestionnaire')
+            task = get_object_or_404(archived, pk=self.kwargs['pk'])
+        etag, last_modified = detail_validators(task)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        data = self.serialize(task)
+        response_cache.set_response(key, data, etag, last_modified)
+        return set_validators(Response(data), etag, last_modified)
 
     def perform_create(self, serializer):
         serializer.save(gestionnaire=self.request.user)
 
+    def handle_exception(self, exc):
+        # Erreurs de update_task (PATCH, mark_complete, mark_pending)
+        if isinstance(exc, TaskList.DoesNotExist):
+            exc = Http404()
+        if isinstance(exc, PreconditionFailed):
+            response = Response(
+                {"error": STALE_TASK_MESSAGE}, status=status.HTTP_412_PRECONDITION_FAILED
+            )
+            return set_validators(response, task_etag(self.kwargs['pk'], exc.updated_at), exc.updated_at)
+        return super().handle_exception(exc)
+
+    def update_fields(self, request, changes):
+        """UPDATE conditionnel de la tâche de l'URL (voir updates.update_task), If-Match optionnel"""
+        pk = self.kwargs['pk']
+        if not str(pk).isdigit():
+            raise Http404
+        return update_task(request.user, int(pk), changes, if_match_versions(request, pk))
+
+    def partial_update(self, request, *args, **kwargs):
+        """PATCH : un seul UPDATE des champs envoyés, rien n'est écrit s'ils ont déjà ces valeurs"""
+        serializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        self.update_fields(request, serializer.validated_data)
+        task = self.get_object()
+        etag, last_modified = detail_validators(task)
+        return set_validators(Response(self.get_serializer(task).data), etag, last_modified)
+
+    def mark_done(self, request, done, label):
+        changed, updated_at = self.update_fields(request, {'done': done})
+        response = Response({'status': label, 'changed': changed})
+        return set_validators(response, task_etag(self.kwargs['pk'], updated_at), updated_at)
+
     @action(detail=True, methods=['post'])
     def mark_complete(self, request, pk=None):
-        """Marquer une tâche comme terminée"""
-        task = self.get_object()
-        task.done = True
-        task.save()
-        return Response({'status': 'Tâche terminée'})
+        """Marquer une tâche comme terminée (changed=false si elle l'était déjà)"""
+        return self.mark_done(request, True, 'Tâche terminée')
 
     @action(detail=True, methods=['post'])
     def mark_pending(self, request, pk=None):
-        """Marquer une tâche comme en attente"""
-        task = self.get_object()
-        task.done = False
-        task.save()
-        return Response({'status': 'Tâche en attente'})
+        """Marquer une tâche comme en attente (changed=false si elle l'était déjà)"""
+        return self.mark_done(request, False, 'Tâche en attente')
+
+    @action(detail=False, methods=['get'])
+    def agenda(self, request):
+        """Mes tâches en attente à échéance : en retard, aujourd'hui, à venir (?days=, 7 par défaut)"""
+        days = request.query_params.get('days', str(AGENDA_DAYS))
+        if not days.isdigit() or not 1 <= int(days) <= AGENDA_MAX_DAYS:
+            return Response(
+                {"error": f"days doit être compris entre 1 et {AGENDA_MAX_DAYS}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Même pour un admin : l'agenda est personnel
+        queryset = TaskList.objects.filter(gestionnaire=request.user).select_related('gestionnaire')
+        buckets = agenda_buckets(queryset, days=int(days), limit=self.agenda_limit)
+        return Response({
+            name: {'results': self.get_serializer(tasks, many=True).data, 'has_more': has_more}
+            for name, (tasks, has_more) in buckets.items()
+        })
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Statistiques des tâches de l'utilisateur (?scope=all : toutes les tâches, admin)"""
+        if request.query_params.get('scope') == 'all':
+            if not request.user.is_staff:
+                return Response({"error": "Réservé aux administrateurs."}, status=status.HTTP_403_FORBIDDEN)
+            return Response(get_stats())
+        return Response(get_stats(request.user.pk))
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """Tâches créées, modifiées ou supprimées depuis le jeton ?since="""
+        token = request.query_params.get('since')
+        try:
+            since, last_id = decode_sync_token(token or '0')
+        except InvalidSyncToken:
+            return Response({"error": "Jeton de synchronisation invalide."}, status=status.HTTP_400_BAD_REQUEST)
+        if token and since < timezone.now() - TOMBSTONE_RETENTION:
+            return Response(
+                {"error": "Jeton expiré, une synchronisation complète est nécessaire."},
+                status=status.HTTP_410_GONE
+            )
+
+        changed, deleted, next_token, has_more = collect_changes(self.get_queryset(), request.user, since, last_id)
+        return Response({
+            'changed': self.get_serializer(changed, many=True).data,
+            'deleted': deleted,
+            'token': next_token,
+            'has_more': has_more,
+        })
+
+    @action(detail=False, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """Export en streaming (?format=csv|ndjson), filtres done, created_after, created_before"""
+        try:
+            queryset = filter_export(self.get_queryset(), request.query_params)
+        except ExportFilterError as e:
+            return Response({"error": f"Filtre invalide : {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        export_format = request.accepted_renderer.format
+        # Base choisie maintenant : le flux est lu après la fin de la vue (routage réplique)
+        rows = export_rows(queryset.using(queryset.db))
+        response = StreamingHttpResponse(STREAMS[export_format](rows), content_type=request.accepted_media_type)
+        response['Content-Disposition'] = f'attachment; filename="tasks.{export_format}"'
+        return response
+
+    IMPORT_CONTENT_TYPES = {
+        'text/csv': 'csv',
+        'application/x-ndjson': 'ndjson',
+        'application/ndjson': 'ndjson',
+    }
+
+    @action(detail=False, methods=['post'], url_path='import', url_name='import', parser_classes=[])
+    def import_tasks(self, request):
+        """Import en streaming (CSV ou NDJSON selon Content-Type), par lots ; ?import_id= pour reprendre"""
+        import_format = self.IMPORT_CONTENT_TYPES.get(request.content_type.split(';')[0].strip())
+        if import_format is None:
+            return Response(
+                {"error": "Content-Type attendu : text/csv ou application/x-ndjson."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        try:
+            batch_size = min(int(request.query_params.get('batch_size', IMPORT_BATCH_SIZE)), IMPORT_MAX_BATCH_SIZE)
+        except ValueError:
+            batch_size = 0
+        if batch_size < 1:
+            return Response({"error": "batch_size invalide."}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = None
+        import_id = request.query_params.get('import_id')
+        if import_id:
+            job = TaskImport.objects.filter(pk=import_id, gestionnaire=request.user).first()
+            if job is None:
+                return Response({"error": "Import introuvable."}, status=status.HTTP_404_NOT_FOUND)
+            if job.format != import_format:
+                return Response({"error": "Le format ne correspond pas à l'import."}, status=status.HTTP_400_BAD_REQUEST)
+            if job.status == TaskImport.STATUS_COMPLETED:
+                return Response(TaskImportSerializer(job).data)
+
+        try:
+            job = import_tasks(request.stream or [], import_format, request.user, batch_size, job)
+        except ImportFormatError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(TaskImportSerializer(job).data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Appliquer un lot d'opérations (create, update, delete, toggle) en une transaction"""
+        operations = request.data.get('operations') if isinstance(request.data, dict) else request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"error": "Une liste d'opérations non vide est attendue."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > BULK_MAX_OPERATIONS:
+            return Response(
+                {"error": f"Maximum {BULK_MAX_OPERATIONS} opérations par lot."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = BulkTaskOperationSerializer(data=operations, many=True)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        ids = [op['id'] for op in serializer.validated_data if 'id' in op]
+        if len(ids) != len(set(ids)):
+            return Response(
+                {"error": "Une même tâche ne peut apparaître qu'une fois par lot."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = apply_bulk_operations(self.get_queryset(), request.user, serializer.validated_data)
+        return Response({'results': results})
 
 
 # ---------------- CONTACT FORM VIEW ----------------
@@ -57,16 +355,14 @@ class ContactView(APIView):
             subject = serializer.validated_data['subject']
             message = serializer.validated_data['message']
 
-            try:
-                send_mail(
-                    f"Contact Form: {subject}",
-                    f"From: {name} <{email}>\n\nMessage:\n{message}",
-                    settings.DEFAULT_FROM_EMAIL,
-                    [settings.DEFAULT_FROM_EMAIL],  # admin email
-                    fail_silently=False,
-                )
-                return Response({"success": "Message envoyé avec succès!"}, status=status.HTTP_200_OK)
-            except Exception as e:
-                return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            enqueue_email(
+                f"Contact Form: {subject}",
+                f"From: {name} <{email}>\n\nMessage:\n{message}",
+                settings.DEFAULT_FROM_EMAIL,
+                [settings.DEFAULT_FROM_EMAIL],  # admin email
+                reply_to=email,
+            )
+            # L'envoi est fait par le worker `manage.py send_outbox`
+            return Response({"success": "Message envoyé avec succès!"}, status=status.HTTP_202_ACCEPTED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
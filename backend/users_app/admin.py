@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import UserDeletion
+
+
+@admin.register(UserDeletion)
+class UserDeletionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'username', 'status', 'tasks_deleted', 'batches', 'updated_at', 'completed_at')
+    list_filter = ('status',)
+    search_fields = ('username',)
+    ordering = ('-id',)
+    readonly_fields = [field.name for field in UserDeletion._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
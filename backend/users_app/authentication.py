@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import HTTP_HEADER_ENCODING
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def _version_key(user_id):
+    return f"auth:user:{user_id}:version"
+
+
+def _user_key(user_id, version):
+    return f"auth:user:{user_id}:{version}"
+
+
+def get_cached_user(user_id):
+    """Retourne (utilisateur en cache ou None, version courante)"""
+    version = cache.get(_version_key(user_id), 0)
+    return cache.get(_user_key(user_id, version)), version
+
+
+def cache_user(user, version):
+    cache.set(_user_key(user.pk, version), user, settings.AUTH_USER_CACHE_TTL)
+
+
+async def aget_cached_user(user_id):
+    version = await cache.aget(_version_key(user_id), 0)
+    return await cache.aget(_user_key(user_id, version)), version
+
+
+async def acache_user(user, version):
+    await cache.aset(_user_key(user.pk, version), user, settings.AUTH_USER_CACHE_TTL)
+
+
+def invalidate_cached_user(user_id):
+    """
+    Change la version de l'utilisateur : les entrées existantes deviennent
+    inaccessibles, y compris celles écrites par une requête concurrente qui
+    aurait lu l'ancienne ligne en base.
+    """
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.set(_version_key(user_id), 1, None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication qui sert l'utilisateur depuis le cache (TTL court,
+    AUTH_USER_CACHE_TTL) au lieu de relire la table User à chaque requête.
+    Le cache est invalidé quand l'utilisateur est modifié ou supprimé
+    (voir users_app.signals).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user, version = get_cached_user(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache_user(user, version)
+            return user
+        return self.check_user(user, validated_token)
+
+    def check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        Variante asynchrone pour les vues async (ASGI) : la vérification du jeton
+        ne fait aucune E/S, l'utilisateur vient du cache ou de User.objects.aget.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user, version = await aget_cached_user(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            self.check_user(user, validated_token)
+            await acache_user(user, version)
+            return user
+        return self.check_user(user, validated_token)
+
+
+class QueryTokenJWTAuthentication(CachedJWTAuthentication):
+    """
+    Accepte aussi le jeton d'accès dans ?access_token= : EventSource (flux
+    server-sent events) ne permet pas d'envoyer d'en-tête Authorization.
+    """
+    query_param = 'access_token'
+
+    def get_header(self, request):
+        header = super().get_header(request)
+        token = request.GET.get(self.query_param)
+        if header is None and token:
+            header = f"{api_settings.AUTH_HEADER_TYPES[0]} {token}".encode(HTTP_HEADER_ENCODING)
+        return header
@@ -0,0 +1,152 @@
+"""
+Vérification rapide de la liste noire des refresh tokens (token_blacklist).
+
+simplejwt interroge BlacklistedToken (jointure sur OutstandingToken) à chaque
+/api/token/refresh/. Ici, chaque processus garde un filtre de Bloom des JTI
+en liste noire : un JTI absent du filtre n'est pas en liste noire, sans
+requête SQL. Un JTI présent (ou un faux positif, ~1 %) est confirmé en base.
+
+Fraîcheur entre workers : chaque mise en liste noire (signal post_save)
+écrit le JTI dans le cache partagé et change une version globale. Avant de
+répondre, le filtre lit les deux en un seul get_many et, si la version a
+changé, relit les lignes récentes (par id croissant).
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+VERSION_KEY = 'auth:blacklist:version'
+# Lignes relues à chaque synchronisation : une transaction validée après une
+# autre peut porter un id plus petit (l'écart reste de l'ordre du nombre
+# d'écritures concurrentes ; la clé JTI en cache couvre le reste)
+SYNC_OVERLAP = 50
+BLOOM_ERROR_RATE = 0.01
+BLOOM_MIN_CAPACITY = 10_000
+PURGE_BATCH_SIZE = 1000
+
+
+def _jti_key(jti):
+    return f"auth:blacklist:jti:{jti}"
+
+
+def _initial_version():
+    # Si la version a été évincée du cache, on repart d'une valeur jamais utilisée
+    return time.time_ns() // 1000
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BlacklistFilter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.last_id = 0
+        self.version = None
+
+    def _load(self, rows):
+        for row_id, jti in rows:
+            self.bloom.add(jti)
+            self.last_id = max(self.last_id, row_id)
+
+    def rebuild(self):
+        total = BlacklistedToken.objects.count()
+        self.bloom = BloomFilter(max(BLOOM_MIN_CAPACITY, total * 2))
+        self.last_id = 0
+        self._load(BlacklistedToken.objects.order_by('id').values_list('id', 'token__jti').iterator(chunk_size=5000))
+
+    def sync(self, version):
+        with self.lock:
+            if self.bloom is not None and version is not None and version == self.version:
+                return
+            if self.bloom is None or self.bloom.count >= self.bloom.capacity:
+                self.rebuild()
+            else:
+                self._load(
+                    BlacklistedToken.objects.filter(id__gt=self.last_id - SYNC_OVERLAP)
+                    .order_by('id').values_list('id', 'token__jti')
+                )
+            self.version = version
+
+    def is_blacklisted(self, jti):
+        cached = cache.get_many([VERSION_KEY, _jti_key(jti)])
+        if cached.get(_jti_key(jti)):
+            return True
+        version = cached.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, _initial_version(), None)
+            version = cache.get(VERSION_KEY)
+        self.sync(version)
+        if jti not in self.bloom:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def reset(self):
+        with self.lock:
+            self.bloom = None
+            self.last_id = 0
+            self.version = None
+
+
+blacklist_filter = BlacklistFilter()
+
+
+def record_blacklisted(jti, expires_at):
+    """Publie un JTI mis en liste noire aux autres workers, une fois la transaction validée"""
+    def publish():
+        ttl = int((expires_at - timezone.now()).total_seconds())
+        if ttl > 0:
+            cache.set(_jti_key(jti), True, ttl)
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, _initial_version(), None)
+    transaction.on_commit(publish)
+
+
+def purge_expired_tokens(batch_size=PURGE_BATCH_SIZE):
+    """
+    Supprime les jetons expirés (OutstandingToken et BlacklistedToken) par lots,
+    chacun dans sa transaction : ni verrou long, ni chargement de toute la table.
+    Retourne le nombre de jetons supprimés.
+    """
+    now = timezone.now()
+    deleted = 0
+    while True:
+        # Les jetons expirés sont les plus anciens : le parcours par id s'arrête vite
+        ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=now)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
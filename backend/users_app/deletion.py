@@ -0,0 +1,116 @@
+"""
+Suppression des comptes en arrière-plan.
+
+DELETE /api/user/users/<pk>/ désactive le compte sur-le-champ et crée un
+UserDeletion. `manage.py delete_users` supprime ensuite ses tâches par lots
+d'ids, chaque lot dans sa propre transaction avec la progression du job,
+puis le compte lui-même. Un worker interrompu laisse expirer son bail : le
+job est repris par un autre worker, qui relit simplement les tâches restantes.
+"""
+import logging
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from todolist_app.events import publish_delete
+from todolist_app.models import ArchivedTask, TaskList
+from todolist_app.response_cache import bump_versions
+from todolist_app.stats import invalidate_stats
+
+from .models import UserDeletion
+
+logger = logging.getLogger(__name__)
+
+DELETION_BATCH_SIZE = 1000
+# Bail d'un worker sur un job, prolongé à chaque lot
+DELETION_LEASE = timedelta(minutes=5)
+
+
+def schedule_user_deletion(user):
+    """Désactive le compte et programme sa suppression ; un job en cours est réutilisé"""
+    with transaction.atomic():
+        if user.is_active:
+            user.is_active = False
+            user.save(update_fields=['is_active'])
+        job = (
+            UserDeletion.objects.filter(user_id=user.pk)
+            .exclude(status=UserDeletion.STATUS_COMPLETED).first()
+        )
+        if job is None:
+            job = UserDeletion.objects.create(user_id=user.pk, username=user.username)
+    return job
+
+
+def claim_deletion(lease=DELETION_LEASE):
+    """Réserve un job à traiter (SKIP LOCKED : plusieurs workers possibles)"""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            UserDeletion.objects.select_for_update(skip_locked=True)
+            .filter(status__in=[UserDeletion.STATUS_PENDING, UserDeletion.STATUS_RUNNING], locked_until__lte=now)
+            .order_by('locked_until', 'id').first()
+        )
+        if job is None:
+            return None
+        job.status = UserDeletion.STATUS_RUNNING
+        job.locked_until = now + lease
+        job.save(update_fields=['status', 'locked_until', 'updated_at'])
+    return job
+
+
+def delete_user_tasks(job, batch_size=DELETION_BATCH_SIZE, lease=DELETION_LEASE):
+    """Supprime les tâches du compte (archivées comprises) par lots ; au plus `batch_size` ids en mémoire"""
+    for model in (TaskList, ArchivedTask):
+        remaining = model.objects.filter(gestionnaire_id=job.user_id).order_by('pk')
+        while True:
+            ids = list(remaining.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            with transaction.atomic():
+                # Pas de delete() : il chargerait chaque tâche pour les signaux post_delete,
+                # dont les tombstones, inutiles pour un compte supprimé
+                tasks = model.objects.filter(pk__in=ids)
+                job.tasks_deleted += tasks._raw_delete(tasks.db)
+                job.batches += 1
+                job.locked_until = timezone.now() + lease
+                job.save(update_fields=['tasks_deleted', 'batches', 'locked_until', 'updated_at'])
+                invalidate_stats(job.user_id)
+                bump_versions(job.user_id)
+                if model is TaskList:
+                    # Les tâches archivées ont déjà été signalées comme retirées
+                    publish_delete(job.user_id, ids)
+            logger.info("Suppression de %s : %s tâche(s) supprimée(s)", job.username, job.tasks_deleted)
+
+
+def run_user_deletion(job, batch_size=DELETION_BATCH_SIZE, lease=DELETION_LEASE):
+    """Traite un job réservé : tâches par lots, puis le compte. Un échec est retenté à l'expiration du bail."""
+    try:
+        delete_user_tasks(job, batch_size, lease)
+        with transaction.atomic():
+            # Plus de tâches : la cascade restante (tombstones, imports) est légère
+            User.objects.filter(pk=job.user_id).delete()
+            job.status = UserDeletion.STATUS_COMPLETED
+            job.completed_at = timezone.now()
+            job.last_error = ''
+            job.save(update_fields=['status', 'completed_at', 'last_error', 'updated_at'])
+    except Exception as e:
+        logger.exception("Échec de la suppression de %s", job.username)
+        job.last_error = str(e)
+        job.save(update_fields=['last_error', 'updated_at'])
+    return job
+
+
+def process_user_deletions(batch_size=DELETION_BATCH_SIZE, lease=DELETION_LEASE, max_jobs=None):
+    """Traite les jobs en attente ; retourne le nombre de comptes supprimés"""
+    processed = completed = 0
+    # Un job en échec garde son bail : il n'est pas repris dans la même boucle
+    while max_jobs is None or processed < max_jobs:
+        job = claim_deletion(lease)
+        if job is None:
+            break
+        processed += 1
+        if run_user_deletion(job, batch_size, lease).status == UserDeletion.STATUS_COMPLETED:
+            completed += 1
+    return completed
@@ -0,0 +1,47 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+BOOLEAN_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class UserFilterError(ValueError):
+    pass
+
+
+def _parse_boolean(value):
+    try:
+        return BOOLEAN_VALUES[value.lower()]
+    except KeyError:
+        raise UserFilterError(value)
+
+
+def _parse_bound(value, end_of_day=False):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise UserFilterError(value)
+        moment = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_users(queryset, params):
+    """
+    Filtres optionnels : is_active, is_staff (true|false), username (préfixe,
+    sensible à la casse pour rester dans l'index), joined_after, joined_before
+    (date ou date-heure ISO)
+    """
+    for field in ('is_active', 'is_staff'):
+        if params.get(field) is not None:
+            queryset = queryset.filter(**{field: _parse_boolean(params[field])})
+    if params.get('username'):
+        queryset = queryset.filter(username__startswith=params['username'])
+    if params.get('joined_after'):
+        queryset = queryset.filter(date_joined__gte=_parse_bound(params['joined_after']))
+    if params.get('joined_before'):
+        queryset = queryset.filter(date_joined__lte=_parse_bound(params['joined_before'], end_of_day=True))
+    return queryset
@@ -0,0 +1,30 @@
+"""
+Hachages de mots de passe dont le coût se règle par variables d'environnement
+(voir PASSWORD_HASHER et PASSWORD_* dans les réglages).
+
+Les paramètres sont lus à chaque appel : quand ils changent, must_update()
+signale les anciens hachages et Django les recalcule à la connexion suivante
+(User.check_password), sans forcer de réinitialisation.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
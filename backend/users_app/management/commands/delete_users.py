@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users_app.deletion import DELETION_BATCH_SIZE, process_user_deletions
+
+
+class Command(BaseCommand):
+    help = "Supprime les comptes désactivés par DELETE /api/user/users/<pk>/ (tâches par lots, puis le compte)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETION_BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Tourner en continu (worker)")
+        parser.add_argument('--interval', type=float, default=5.0, help="Pause en secondes quand il n'y a rien à supprimer")
+
+    def handle(self, *args, **options):
+        while True:
+            completed = process_user_deletions(options['batch_size'])
+            if completed:
+                self.stdout.write(f"{completed} compte(s) supprimé(s).")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users_app.blacklist import PURGE_BATCH_SIZE, purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Supprime par lots les refresh tokens expirés et leurs entrées de liste noire"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(options['batch_size'])
+        self.stdout.write(f"{deleted} jeton(s) expiré(s) supprimé(s).")
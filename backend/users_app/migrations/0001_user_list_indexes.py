@@ -0,0 +1,19 @@
+from django.db import migrations
+
+# auth_user appartient à django.contrib.auth : son état de migration ne peut
+# pas porter l'index depuis cette app, d'où un SQL idempotent (PostgreSQL, SQLite)
+# qui supporte une réapplication ou un squash sans erreur d'index dupliqué.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS user_date_joined_idx ON auth_user (date_joined, id)',
+            reverse_sql='DROP INDEX IF EXISTS user_date_joined_idx',
+        ),
+    ]
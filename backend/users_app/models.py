@@ -1,3 +1,40 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class UserDeletion(models.Model):
+    """
+    Suppression différée d'un compte (DELETE /api/user/users/<pk>/), traitée
+    par `manage.py delete_users` : les tâches partent par lots, puis le compte.
+    user_id n'est pas une clé étrangère : la trace survit à l'utilisateur.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_RUNNING, 'En cours'),
+        (STATUS_COMPLETED, 'Terminée'),
+    ]
+
+    user_id = models.IntegerField()
+    username = models.CharField(max_length=150)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    tasks_deleted = models.PositiveIntegerField(default=0)
+    batches = models.PositiveIntegerField(default=0)
+    # Bail du worker en cours : à son expiration, un autre worker reprend le job
+    locked_until = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'locked_until'], name='user_deletion_due_idx'),
+            models.Index(fields=['user_id'], name='user_deletion_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Suppression de {self.username} - {self.get_status_display()}"
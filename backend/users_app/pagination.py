@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Pagination par curseur des utilisateurs, dans l'index (date_joined, id) :
+    ni COUNT(*) ni OFFSET sur la table auth_user.
+    """
+    ordering = ('-date_joined', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
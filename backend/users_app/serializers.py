@@ -1,5 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+
+from .models import UserDeletion
+from .tokens import RefreshToken
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, style={'input_type': 'password'})
@@ -26,3 +30,26 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_active']
 
+
+class UserListSerializer(UserSerializer):
+    """Liste admin : compteurs de tâches annotés par la requête (voir UserListView)"""
+    task_count = serializers.IntegerField(read_only=True)
+    done_count = serializers.IntegerField(read_only=True)
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['date_joined', 'task_count', 'done_count']
+
+
+class UserDeletionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UserDeletion
+        fields = [
+            'id', 'user_id', 'username', 'status', 'tasks_deleted', 'batches',
+            'last_error', 'created_at', 'updated_at', 'completed_at',
+        ]
+        read_only_fields = fields
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Rotation des refresh tokens avec la liste noire rapide (users_app.tokens)"""
+    token_class = RefreshToken
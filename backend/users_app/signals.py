@@ -0,0 +1,21 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .authentication import invalidate_cached_user
+from .blacklist import record_blacklisted
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Toute modification (UserDetailView, admin, mot de passe) vide le cache d'authentification"""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def publish_blacklisted_token(sender, instance, created, **kwargs):
+    """Prévient les filtres des autres workers (voir users_app.blacklist)"""
+    if created:
+        record_blacklisted(instance.token.jti, instance.token.expires_at)
@@ -1,3 +1,320 @@
-from django.test import TestCase
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+
+def _client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+@pytest.mark.django_db
+def test_me_served_from_cache_without_queries():
+    user = User.objects.create_user(username="ivan", password="pwd123", email="ivan@example.com")
+    client = _client_for(user)
+
+    assert client.get(reverse("me")).status_code == 200
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(reverse("me"))
+
+    assert response.data["nom_utilisateur"] == "ivan"
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_user_update_invalidates_cached_user():
+    admin = User.objects.create_user(username="root", password="pwd123", is_staff=True)
+    user = User.objects.create_user(username="jane", password="pwd123")
+    client = _client_for(user)
+    assert client.get(reverse("me")).status_code == 200
+
+    admin_client = APIClient()
+    admin_client.force_authenticate(user=admin)
+    response = admin_client.patch(reverse("user-detail", args=[user.id]), {"is_active": False})
+    assert response.status_code == 200
+
+    assert client.get(reverse("me")).status_code == 401
+
+
+def _throttle_rates(settings, **rates):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+
+
+@pytest.mark.django_db
+def test_login_throttled_per_username_before_hashing(settings):
+    from unittest import mock
+
+    _throttle_rates(settings, login_ip="100/min", login_user="2/min")
+    User.objects.create_user(username="kate", password="pwd123")
+    client = APIClient()
+
+    for _ in range(2):
+        assert client.post(reverse("token_obtain_pair"), {"username": "kate", "password": "bad"}).status_code == 401
+    with mock.patch.object(User, "check_password") as check_password:
+        response = client.post(reverse("token_obtain_pair"), {"username": "Kate ", "password": "pwd123"})
+    assert response.status_code == 429
+    check_password.assert_not_called()
+    assert client.post(reverse("token_obtain_pair"), {"username": "other", "password": "x"}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_register_throttled_per_ip(settings):
+    _throttle_rates(settings, register_ip="1/min", register_user="100/min")
+    client = APIClient()
+    data = {"first_name": "A", "last_name": "B", "email": "a@example.com", "password": "pwd123", "consentement_rgpd": True}
+
+    assert client.post(reverse("register"), {**data, "username": "lou"}).status_code == 201
+    assert client.post(reverse("register"), {**data, "username": "max"}, REMOTE_ADDR="10.0.0.2").status_code == 201
+    assert client.post(reverse("register"), {**data, "username": "ned"}).status_code == 429
+
+
+@pytest.mark.django_db
+def test_register_ip_throttle_ignores_client_forwarded_for(settings):
+    _throttle_rates(settings, register_ip="1/min", register_user="100/min")
+    client = APIClient()
+    data = {"first_name": "A", "last_name": "B", "email": "a@example.com", "password": "pwd123", "consentement_rgpd": True}
+
+    statuses = [
+        client.post(reverse("register"), {**data, "username": f"user{i}"}, HTTP_X_FORWARDED_FOR=f"203.0.113.{i}").status_code
+        for i in range(5)
+    ]
+    assert statuses == [201, 429, 429, 429, 429]
+
+    # Derrière un proxy déclaré, l'IP est la dernière entrée ajoutée par ce proxy
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+    forwarded = {"HTTP_X_FORWARDED_FOR": "203.0.113.9, 198.51.100.7"}
+    assert client.post(reverse("register"), {**data, "username": "proxied"}, **forwarded).status_code == 201
+
+
+@pytest.mark.django_db
+def test_password_rehashed_on_login_when_hasher_settings_change(settings):
+    settings.PASSWORD_PBKDF2_ITERATIONS = 1000
+    user = User.objects.create_user(username="mia", password="pwd123")
+    assert user.password.startswith("pbkdf2_sha256$1000$")
+
+    settings.PASSWORD_PBKDF2_ITERATIONS = 2000
+    assert APIClient().post(reverse("token_obtain_pair"), {"username": "mia", "password": "pwd123"}).status_code == 200
+    user.refresh_from_db()
+    assert user.password.startswith("pbkdf2_sha256$2000$")
+
+    settings.PASSWORD_ARGON2_MEMORY_COST = 1024
+    settings.PASSWORD_HASHERS = list(reversed(settings.PASSWORD_HASHERS[:2])) + settings.PASSWORD_HASHERS[2:]
+    assert APIClient().post(reverse("token_obtain_pair"), {"username": "mia", "password": "pwd123"}).status_code == 200
+    user.refresh_from_db()
+    assert user.password.startswith("argon2$argon2id$v=19$m=1024,t=2,p=8$")
+
+
+@pytest.fixture
+def blacklist_filter():
+    from users_app.blacklist import blacklist_filter
+
+    blacklist_filter.reset()
+    yield blacklist_filter
+    blacklist_filter.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rotated_refresh_token_is_blacklisted(blacklist_filter):
+    User.objects.create_user(username="nora", password="pwd123")
+    client = APIClient()
+    tokens = client.post(reverse("token_obtain_pair"), {"username": "nora", "password": "pwd123"}).data
+
+    rotated = client.post(reverse("token_refresh"), {"refresh": tokens["refresh"]})
+    assert rotated.status_code == 200
+    reused = client.post(reverse("token_refresh"), {"refresh": tokens["refresh"]})
+    assert reused.status_code == 401
+    assert client.post(reverse("token_refresh"), {"refresh": rotated.data["refresh"]}).status_code == 200
+
+    # Autre worker : filtre vide, reconstruit depuis la base
+    blacklist_filter.reset()
+    from django.core.cache import cache
+    cache.clear()
+    assert client.post(reverse("token_refresh"), {"refresh": tokens["refresh"]}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_blacklist_lookup_skips_database_for_unknown_jti(blacklist_filter, django_assert_num_queries):
+    from users_app.tokens import RefreshToken
+
+    user = User.objects.create_user(username="omar", password="pwd123")
+    for _ in range(3):
+        RefreshToken.for_user(user).blacklist()
+    blacklist_filter.is_blacklisted("warm-up")
+
+    fresh = RefreshToken.for_user(user)
+    with django_assert_num_queries(0):
+        assert not blacklist_filter.is_blacklisted(fresh["jti"])
+    blacklisted = RefreshToken.for_user(user)
+    blacklisted.blacklist()
+    blacklist_filter.reset()
+    assert blacklist_filter.is_blacklisted(blacklisted["jti"])
+
+
+@pytest.mark.django_db
+def test_purge_expired_tokens_in_batches(blacklist_filter):
+    from datetime import timedelta
+    from io import StringIO
+    from django.core.management import call_command
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    now = timezone.now()
+    tokens = OutstandingToken.objects.bulk_create(
+        [OutstandingToken(jti=f"old-{i}", token="x", expires_at=now - timedelta(hours=1)) for i in range(5)]
+        + [OutstandingToken(jti="live", token="x", expires_at=now + timedelta(hours=1))]
+    )
+    BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens[::2]])
+
+    out = StringIO()
+    call_command("purge_expired_tokens", "--batch-size", "2", stdout=out)
+
+    assert "5 jeton(s)" in out.getvalue()
+    assert list(OutstandingToken.objects.values_list("jti", flat=True)) == ["live"]
+    assert BlacklistedToken.objects.count() == 0
+
+
+@pytest.fixture
+def staff_client():
+    return _client_for(User.objects.create_user(username="root", password="pwd123", is_staff=True))
+
+
+@pytest.mark.django_db
+def test_user_list_annotates_task_counts_in_one_query(staff_client, django_assert_num_queries):
+    from todolist_app.models import TaskList
+
+    for i in range(5):
+        user = User.objects.create_user(username=f"user-{i}")
+        TaskList.objects.bulk_create([TaskList(gestionnaire=user, task="T", done=n < i) for n in range(i + 1)])
+
+    with django_assert_num_queries(2):
+        response = staff_client.get(reverse("user-list"), {"pagination": "cursor", "username": "user-"})
+
+    rows = response.data["results"]
+    assert [row["username"] for row in rows] == [f"user-{i}" for i in reversed(range(5))]
+    assert [(row["task_count"], row["done_count"]) for row in rows] == [(i + 1, i) for i in reversed(range(5))]
+
+
+@pytest.mark.django_db
+def test_user_list_filters(staff_client):
+    from datetime import timedelta
+    from django.utils import timezone
+
+    now = timezone.now()
+    User.objects.create_user(username="alice", is_active=False)
+    User.objects.create_user(username="albert", date_joined=now - timedelta(days=10))
+    User.objects.create_user(username="bob")
+
+    def usernames(**params):
+        response = staff_client.get(reverse("user-list"), params)
+        assert response.status_code == 200
+        return sorted(row["username"] for row in response.data["results"])
+
+    assert usernames(username="al") == ["albert", "alice"]
+    assert usernames(is_active="false") == ["alice"]
+    assert usernames(is_staff="1") == ["root"]
+    assert usernames(joined_before=(now - timedelta(days=1)).date().isoformat()) == ["albert"]
+    assert usernames(joined_after=(now - timedelta(days=1)).isoformat(), username="al") == ["alice"]
+
+    response = staff_client.get(reverse("user-list"), {"is_staff": "maybe"})
+    assert response.status_code == 400
+    assert response.data == {"error": "Filtre invalide : maybe"}
+
+
+@pytest.mark.django_db
+def test_user_list_cursor_pagination_walks_every_user(staff_client):
+    User.objects.bulk_create([User(username=f"user-{i:02}") for i in range(25)])
+
+    seen, url, params = [], reverse("user-list"), {"pagination": "cursor", "page_size": 10}
+    while url:
+        response = staff_client.get(url, params)
+        assert "count" not in response.data
+        seen += [row["id"] for row in response.data["results"]]
+        url, params = response.data["next"], None
+
+    assert sorted(seen) == sorted(User.objects.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+def test_user_delete_deactivates_and_schedules_deletion(staff_client):
+    from todolist_app.models import TaskList
+    from users_app.models import UserDeletion
+
+    user = User.objects.create_user(username="leaving", password="pwd123")
+    TaskList.objects.bulk_create([TaskList(gestionnaire=user, task="T") for _ in range(3)])
+    user_client = _client_for(user)
+
+    response = staff_client.delete(reverse("user-detail", args=[user.id]))
+    assert response.status_code == 202
+    assert response.data["status"] == UserDeletion.STATUS_PENDING
+    assert staff_client.delete(reverse("user-detail", args=[user.id])).data["id"] == response.data["id"]
+
+    user.refresh_from_db()
+    assert not user.is_active
+    assert TaskList.objects.filter(gestionnaire=user).count() == 3
+    assert user_client.get(reverse("tasks-list")).status_code == 401
+
+
+@pytest.mark.django_db
+def test_user_deletion_job_runs_in_batches_and_resumes(staff_client, monkeypatch, django_capture_on_commit_callbacks):
+    from io import StringIO
+    from django.core.management import call_command
+    from django.utils import timezone
+    from todolist_app.models import TaskList
+    from todolist_app.stats import compute_stats, get_stats
+    from users_app import deletion
+
+    user = User.objects.create_user(username="leaving")
+    TaskList.objects.bulk_create([TaskList(gestionnaire=user, task="T") for _ in range(5)])
+    TaskList.objects.create(gestionnaire=User.objects.get(username="root"), task="Reste")
+    job_id = staff_client.delete(reverse("user-detail", args=[user.id])).data["id"]
+
+    # Le worker s'arrête après le premier lot
+    publish_delete = deletion.publish_delete
+    calls = []
+    def flaky_publish(owner_id, ids):
+        calls.append(ids)
+        if len(calls) == 2:
+            raise RuntimeError("worker arrêté")
+        publish_delete(owner_id, ids)
+    monkeypatch.setattr(deletion, "publish_delete", flaky_publish)
+    assert deletion.process_user_deletions(batch_size=2) == 0
+
+    job = staff_client.get(reverse("user-deletion-detail", args=[job_id])).data
+    assert (job["status"], job["tasks_deleted"], job["last_error"]) == ("running", 2, "worker arrêté")
+    assert deletion.process_user_deletions(batch_size=2) == 0  # bail encore valide
+
+    deletion.UserDeletion.objects.filter(pk=job_id).update(locked_until=timezone.now())
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("delete_users", "--batch-size", "2", stdout=StringIO())
+
+    job = staff_client.get(reverse("user-deletion-detail", args=[job_id])).data
+    assert (job["status"], job["tasks_deleted"], job["batches"], job["last_error"]) == ("completed", 5, 3, "")
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert list(TaskList.objects.values_list("task", flat=True)) == ["Reste"]
+    assert get_stats() == compute_stats()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_deletion_memory_is_bounded_by_batch_size():
+    import tracemalloc
+    from todolist_app.models import TaskList
+    from users_app.deletion import process_user_deletions, schedule_user_deletion
+
+    user = User.objects.create_user(username="heavy")
+    TaskList.objects.bulk_create((TaskList(gestionnaire=user, task=f"Tâche {i}") for i in range(100_000)), batch_size=5000)
+    schedule_user_deletion(user)
+
+    tracemalloc.start()
+    try:
+        assert process_user_deletions(batch_size=1000) == 1
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert not TaskList.objects.exists()
+    assert peak < 5 * 1024 * 1024
@@ -0,0 +1,57 @@
+"""
+Limitation de débit des endpoints qui vérifient ou hachent un mot de passe
+(/api/token/, /api/user/register/), par IP et par nom d'utilisateur.
+
+Les throttles DRF s'exécutent dans APIView.initial(), avant le serializer :
+une requête refusée (429) ne coûte aucun hachage. Les compteurs vivent dans
+le cache par défaut (partagé entre workers avec Redis ou Memcached).
+
+La vue fixe `throttle_scope` ; les débits sont lus dans
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] sous '<scope>_ip' et '<scope>_user'.
+"""
+import hashlib
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class ScopedCredentialThrottle(SimpleRateThrottle):
+    suffix = None
+
+    def __init__(self):
+        # Débit résolu dans allow_request, une fois la vue connue
+        pass
+
+    def get_rate(self):
+        # Lu à chaque requête (et non figé à l'import comme THROTTLE_RATES)
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+        self.scope = f"{scope}_{self.suffix}"
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+
+class IPRateThrottle(ScopedCredentialThrottle):
+    """Requêtes par adresse IP (X-Forwarded-For selon NUM_PROXIES)"""
+    suffix = 'ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class UsernameRateThrottle(ScopedCredentialThrottle):
+    """Tentatives par nom d'utilisateur visé, quelle que soit l'IP"""
+    suffix = 'user'
+
+    def get_cache_key(self, request, view):
+        data = request.data if hasattr(request.data, 'get') else {}
+        username = data.get('username')
+        if not isinstance(username, str) or not username.strip():
+            return None
+        ident = hashlib.sha256(username.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -0,0 +1,36 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token dont la liste noire est vérifiée par le filtre de
+    users_app.blacklist (sans requête SQL dans le cas courant). Les lignes
+    OutstandingToken sont créées avec user_id, sans relire l'utilisateur
+    (déjà chargé par TokenRefreshSerializer).
+    """
+
+    def check_blacklist(self):
+        from .blacklist import blacklist_filter
+
+        if blacklist_filter.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def outstand(self):
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                'user_id': self.payload.get(api_settings.USER_ID_CLAIM),
+                'created_at': self.current_time,
+                'token': str(self),
+                'expires_at': datetime_from_epoch(self.payload['exp']),
+            },
+        )
+
+    def blacklist(self):
+        token, _ = self.outstand()
+        return BlacklistedToken.objects.get_or_create(token=token)
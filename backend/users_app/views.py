@@ -1,7 +1,19 @@
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from .serializers import RegisterSerializer, UserSerializer
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework_simplejwt.views import TokenObtainPairView
+from complice_taches.db_routing import ReplicaReadMixin, pin_to_primary, replica_configured
+from todolist_app.models import TaskList
+from todolist_app.pagination import get_pagination_class
+
+from .deletion import schedule_user_deletion
+from .filters import UserFilterError, filter_users
+from .models import UserDeletion
+from .pagination import UserCursorPagination
+from .serializers import RegisterSerializer, UserDeletionSerializer, UserListSerializer, UserSerializer
+from .throttling import IPRateThrottle, UsernameRateThrottle
 
 # ---------- INSCRIPTION ----------
 class RegisterView(generics.CreateAPIView):
@@ -12,6 +24,8 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = RegisterSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'register'
 
     def create(self, request, *args, **kwargs):
         if not request.data.get("consentement_rgpd", False):
@@ -21,8 +35,23 @@ class RegisterView(generics.CreateAPIView):
             )
         return super().create(request, *args, **kwargs)
 
+    def perform_create(self, serializer):
+        user = serializer.save()
+        # Requête anonyme : PrimaryPinMiddleware ne peut pas épingler le nouveau compte
+        if replica_configured():
+            pin_to_primary(user.pk)
+
+# ---------- CONNEXION (JWT) ----------
+class LoginView(TokenObtainPairView):
+    """
+    Obtention des jetons JWT, limitée par IP et par nom d'utilisateur :
+    au-delà, 429 avant toute vérification du mot de passe.
+    """
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'login'
+
 # ---------- UTILISATEUR ACTUEL ----------
-class MeView(generics.RetrieveAPIView):
+class MeView(ReplicaReadMixin, generics.RetrieveAPIView):
     """Retourne les informations de l'utilisateur connecté"""
     permission_classes = [permissions.IsAuthenticated]
 
@@ -37,12 +66,66 @@ class MeView(generics.RetrieveAPIView):
         })
 
 # ---------- CRUD UTILISATEURS (Admin uniquement) ----------
-class UserListView(generics.ListCreateAPIView):
-    queryset = User.objects.all()
+def _task_count(**filters):
+    # Sous-requête corrélée : évaluée pour les seules lignes de la page,
+    # via l'index (gestionnaire, ...) des tâches
+    tasks = (
+        TaskList.objects.filter(gestionnaire=OuterRef('pk'), **filters)
+        .order_by().values('gestionnaire').annotate(count=Count('id')).values('count')
+    )
+    return Coalesce(Subquery(tasks, output_field=IntegerField()), 0)
+
+
+class UserListView(ReplicaReadMixin, generics.ListCreateAPIView):
+    """
+    Liste des utilisateurs, du plus récent au plus ancien, avec task_count et
+    done_count calculés dans la même requête.
+    Filtres : is_active, is_staff, username (préfixe), joined_after, joined_before.
+    Pagination par numéro de page par défaut, ?pagination=cursor pour le mode curseur.
+    """
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
 
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            pagination_class = get_pagination_class(self.request, self.pagination_class, UserCursorPagination)
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    def get_queryset(self):
+        return User.objects.order_by('-date_joined', '-id')
+
+    def get_serializer_class(self):
+        return UserListSerializer if self.request.method == 'GET' else UserSerializer
+
+    def list(self, request, *args, **kwargs):
+        try:
+            queryset = filter_users(self.get_queryset(), request.query_params)
+        except UserFilterError as e:
+            return Response({"error": f"Filtre invalide : {e}"}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.annotate(task_count=_task_count(), done_count=_task_count(done=True))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
+
+    def destroy(self, request, *args, **kwargs):
+        """
+        Désactive le compte immédiatement (202) ; ses tâches puis le compte sont
+        supprimés en arrière-plan par `manage.py delete_users`.
+        """
+        job = schedule_user_deletion(self.get_object())
+        return Response(UserDeletionSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+class UserDeletionDetailView(generics.RetrieveAPIView):
+    """Suivi d'une suppression de compte"""
+    queryset = UserDeletion.objects.all()
+    serializer_class = UserDeletionSerializer
+    permission_classes = [permissions.IsAdminUser]
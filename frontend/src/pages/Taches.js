@@ -1,6 +1,8 @@
-import React, { useEffect, useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import axiosInstance from "../axiosInstance";
 
+const MAX_STREAM_FAILURES = 5;
+
 function Taches({ isAdmin = false }) {
   const [tasks, setTasks] = useState([]);
   const [newTask, setNewTask] = useState("");
@@ -18,8 +20,14 @@ function Taches({ isAdmin = false }) {
 
   const token = localStorage.getItem("access");
 
+  // Page affichée, relue quand le flux d'événements demande un rechargement
+  const currentUrl = useRef("tasks/");
+  // Flux d'événements connecté : les modifications arrivent sans recharger
+  const live = useRef(false);
+
   const fetchTasks = async (url = "tasks/") => {
     if (!token) return;
+    currentUrl.current = url;
     try {
       setLoading(true);
       setError("");
@@ -40,13 +48,91 @@ function Taches({ isAdmin = false }) {
     if (token) fetchTasks();
   }, [token]);
 
+  // Applique un diff du flux /api/async/tasks/events/ à la page affichée
+  const applyEvent = (event) => {
+    if (event.type === "upsert") {
+      setTasks((current) => {
+        let next = current;
+        event.tasks.forEach((task) => {
+          if (next.some((t) => t.id === task.id)) {
+            next = next.map((t) => (t.id === task.id ? task : t));
+          } else if (!/[?&]page=/.test(currentUrl.current) && (!next.length || task.created_at > next[0].created_at)) {
+            // Nouvelle tâche : elle s'affiche en tête de la première page
+            next = [task, ...next];
+            setCount((c) => c + 1);
+          }
+        });
+        return next;
+      });
+    } else if (event.type === "update") {
+      setTasks((current) =>
+        current.map((t) => (event.ids.includes(t.id) ? { ...t, ...event.changes } : t))
+      );
+    } else if (event.type === "delete") {
+      setTasks((current) => current.filter((t) => !event.ids.includes(t.id)));
+      setCount((c) => Math.max(0, c - event.ids.length));
+    } else if (event.type === "refresh") {
+      fetchTasks(currentUrl.current);
+    }
+  };
+
+  useEffect(() => {
+    if (!token) return undefined;
+    let source = null;
+    let retry = null;
+    let connected = false;
+    let delay = 3000;
+    // Échecs consécutifs : au-delà, le flux est considéré indisponible (serveur WSGI, 503...)
+    // et on cesse de renvoyer le jeton dans l'URL
+    let failures = 0;
+
+    const connect = () => {
+      // EventSource n'envoie pas d'en-tête : le jeton passe dans l'URL,
+      // relu à chaque connexion pour suivre son rafraîchissement
+      const access = localStorage.getItem("access");
+      const url = new URL("async/tasks/events/", axiosInstance.defaults.baseURL);
+      url.searchParams.set("access_token", access);
+      source = new EventSource(url);
+      source.onmessage = (message) => {
+        const event = JSON.parse(message.data);
+        if (event.type === "ready") {
+          // Après une coupure, des événements ont pu être manqués
+          if (connected) fetchTasks(currentUrl.current);
+          connected = true;
+          live.current = true;
+          delay = 3000;
+          failures = 0;
+        } else {
+          applyEvent(event);
+        }
+      };
+      source.onerror = () => {
+        source.close();
+        // Des événements ont pu être perdus pendant la coupure
+        if (live.current) fetchTasks(currentUrl.current);
+        live.current = false;
+        failures += 1;
+        if (failures >= MAX_STREAM_FAILURES) return;
+        retry = setTimeout(connect, delay);
+        delay = Math.min(delay * 2, 60000);
+      };
+    };
+
+    connect();
+    return () => {
+      clearTimeout(retry);
+      live.current = false;
+      if (source) source.close();
+    };
+  }, [token]);
+
   const addTask = async (e) => {
     e.preventDefault();
     if (!newTask.trim()) return;
     try {
       await axiosInstance.post("tasks/", { task: newTask });
       setNewTask("");
-      fetchTasks();
+      if (!live.current) fetchTasks(currentUrl.current);
     } catch (err) {
       console.error(err);
       setError("Erreur lors de l'ajout.");
@@ -57,7 +143,7 @@ function Taches({ isAdmin = false }) {
     if (!window.confirm("Voulez-vous vraiment supprimer cette tâche ?")) return;
     try {
       await axiosInstance.delete(`tasks/${id}/`);
-      fetchTasks();
+      if (!live.current) fetchTasks(currentUrl.current);
     } catch (err) {
       console.error(err);
       setError("Erreur lors de la suppression.");
@@ -82,7 +168,7 @@ function Taches({ isAdmin = false }) {
         done: editingTask.done,
       });
       cancelEditing();
-      fetchTasks();
+      if (!live.current) fetchTasks(currentUrl.current);
     } catch (err) {
       console.error(err);
       setError("Erreur lors de la modification.");
@@ -91,8 +177,9 @@ function Taches({ isAdmin = false }) {
 
   const toggleDone = async (task) => {
     try {
-      await axiosInstance.patch(`tasks/${task.id}/`, { done: !task.done });
-      fetchTasks();
+      // Un seul UPDATE conditionnel côté serveur (pas de relecture de la tâche)
+      await axiosInstance.post(`tasks/${task.id}/${task.done ? "mark_pending" : "mark_complete"}/`);
+      if (!live.current) fetchTasks(currentUrl.current);
     } catch (err) {
       console.error(err);
       setError("Erreur lors de la mise à jour du statut.");
@@ -258,4 +345,4 @@ function Taches({ isAdmin = false }) {
   );
 }
 
-export default Taches;
\ No newline at end of file
+export default Taches;
\ No newline at end of file